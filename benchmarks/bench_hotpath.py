@@ -0,0 +1,291 @@
+"""
+Microbenchmarks for the quote hot path.
+
+Runs offline: the longport SDK is replaced by mocks before anything from src is
+imported, and alerts go to a counting stub instead of the webhooks.
+
+    python -m benchmarks.bench_hotpath                      # run, write benchmarks/results/<commit>.json
+    python -m benchmarks.bench_hotpath --baseline old.json  # run and compare against a previous result
+    python -m benchmarks.bench_hotpath --compare old.json new.json
+"""
+import sys
+from unittest.mock import MagicMock
+
+# Mock longport modules BEFORE importing src
+for _name in ("longport", "longport.quote", "longport.openapi"):
+    sys.modules[_name] = MagicMock()
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+import numpy as np
+
+from config.settings import Settings
+
+# The handler and rule modules read settings when imported
+Settings.load()
+
+from src.analysis.strategy import Strategy, StrategySignal
+from src.analysis.indicators import IndicatorStore
+from src.analysis.coalescer import AlertCoalescer
+from src.api.longport.push.handler import PushHandler
+from benchmarks.generator import SyntheticQuoteStream
+
+SCHEMA_VERSION = 1
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+PERCENTILES = (50, 90, 99, 99.9)
+
+class StubNotifier:
+    """Counts alerts instead of sending them"""
+
+    def __init__(self):
+        self.alerts = 0
+
+    def submit(self, title: str, content: str, origin: float = None) -> bool:
+        self.alerts += 1
+        return True
+
+def _timed(fn, items: list, warmup: list) -> tuple[np.ndarray, float]:
+    """Call fn(*item) for every item, timing each call; returns (latencies_ns, total_seconds)"""
+    for item in warmup:
+        fn(*item)
+
+    timer = time.perf_counter_ns
+    latencies = np.empty(len(items), dtype=np.int64)
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = timer()
+        for i, item in enumerate(items):
+            t0 = timer()
+            fn(*item)
+            latencies[i] = timer() - t0
+        total = (timer() - start) / 1e9
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return latencies, total
+
+def _summarize(latencies: np.ndarray, total: float, ticks: int, **extra) -> dict:
+    values = np.percentile(latencies, PERCENTILES)
+    result = {
+        "ticks": ticks,
+        "ticks_per_sec": round(ticks / total, 1) if total > 0 else 0.0,
+        "latency_ns": {f"p{p:g}".replace(".", ""): int(v) for p, v in zip(PERCENTILES, values)},
+    }
+    result["latency_ns"]["mean"] = int(latencies.mean())
+    result["latency_ns"]["max"] = int(latencies.max())
+    result.update(extra)
+    return result
+
+def _timer_overhead_ns(samples: int = 100000) -> int:
+    """Median cost of one timing pair, included in every per-call latency"""
+    timer = time.perf_counter_ns
+    costs = np.empty(samples, dtype=np.int64)
+    for i in range(samples):
+        t0 = timer()
+        costs[i] = timer() - t0
+    return int(np.median(costs))
+
+def bench_strategy_analyze(ticks: list, warmup: list) -> dict:
+    """Strategy.analyze on every tick, with the rolling-window store enabled"""
+    strategy = Strategy(indicators=IndicatorStore())
+    signals = 0
+
+    def run(symbol, quote):
+        nonlocal signals
+        signals += len(strategy.analyze(quote, symbol))
+
+    latencies, total = _timed(run, ticks, warmup)
+    return _summarize(latencies, total, len(ticks), signals=signals)
+
+def _stub_handler() -> tuple[PushHandler, StubNotifier]:
+    notifier = StubNotifier()
+    config = dict(Settings.SYMBOLS_CONFIG.get('alerts') or {})
+    # Flush inline so no flusher thread competes with the measurement
+    config['digest_window'] = 0
+    coalescer = AlertCoalescer(sink=notifier.submit, config=config)
+    return PushHandler(notifier=notifier, coalescer=coalescer), notifier
+
+def bench_push_handler_on_quote(ticks: list, warmup: list) -> dict:
+    """PushHandler.on_quote end to end: analysis, dispatch, coalescing; webhooks stubbed"""
+    handler, notifier = _stub_handler()
+    latencies, total = _timed(handler.on_quote, ticks, warmup)
+    return _summarize(latencies, total, len(ticks), alerts=notifier.alerts,
+                      coalescer=handler.coalescer.stats())
+
+def _conflate(ticks: list, batch_size: int) -> list:
+    """Split ticks into batches holding the latest tick per symbol, like ConflatingIngestor"""
+    batches = []
+    for i in range(0, len(ticks), batch_size):
+        latest = {}
+        for symbol, quote in ticks[i:i + batch_size]:
+            latest[symbol] = quote
+        batches.append((list(latest.items()),))
+    return batches
+
+def bench_push_handler_on_quote_batch(ticks: list, warmup: list, batch_size: int) -> dict:
+    """PushHandler.on_quote_batch over conflated micro-batches (the ingestor's path)"""
+    handler, notifier = _stub_handler()
+    batches = _conflate(ticks, batch_size)
+    latencies, total = _timed(handler.on_quote_batch, batches, _conflate(warmup, batch_size))
+    # ticks/sec counts input ticks; latency percentiles are per batch
+    return _summarize(latencies, total, len(ticks), alerts=notifier.alerts, latency_unit="batch",
+                      batch_size=batch_size, batches=len(batches),
+                      analyzed=sum(len(b[0]) for b in batches))
+
+def bench_signal_construction(ticks: list, warmup: list) -> dict:
+    """Building one StrategySignal the way the rules do (clock read + f-string details)"""
+    threshold = Settings.PRICE_CHANGE_THRESHOLD
+
+    def build(symbol, quote):
+        change_rate = (quote.last_done - quote.prev_close) / quote.prev_close * 100
+        StrategySignal(
+            symbol=symbol,
+            signal_type="PRICE_FLUCTUATION",
+            price=quote.last_done,
+            timestamp=datetime.now(),
+            details=f"Price: {quote.last_done}, Change: {change_rate:.2f}% (Threshold: {threshold}%)",
+            value=change_rate
+        )
+
+    latencies, total = _timed(build, ticks, warmup)
+    return _summarize(latencies, total, len(ticks))
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(["git", *args], capture_output=True, text=True, timeout=10,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+def run_benchmarks(ticks: int = 200000, underlyings: int = 20, options_per_underlying: int = 24,
+                   seed: int = 42, warmup: int = 5000, batch_size: int = 64) -> dict:
+    """Run every scenario on the same synthetic stream and return a JSON-serializable report"""
+    stream = SyntheticQuoteStream(underlyings=underlyings, options_per_underlying=options_per_underlying, seed=seed)
+    data = stream.ticks(warmup + ticks)
+    # Warmup ticks precede the measured ones, so windows and cooldowns are already populated
+    head, measured = data[:warmup], data[warmup:]
+    scenarios = {
+        "strategy.analyze": lambda: bench_strategy_analyze(measured, head),
+        "push_handler.on_quote": lambda: bench_push_handler_on_quote(measured, head),
+        "push_handler.on_quote_batch": lambda: bench_push_handler_on_quote_batch(measured, head, batch_size),
+        "signal.construct": lambda: bench_signal_construction(measured, head),
+    }
+
+    results = {}
+    for name, scenario in scenarios.items():
+        results[name] = scenario()
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "commit": _git("rev-parse", "--short", "HEAD") or "unknown",
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "ticks": ticks, "warmup": warmup, "symbols": len(stream.symbols), "seed": seed,
+            "batch_size": batch_size,
+            "price_change_threshold": Settings.PRICE_CHANGE_THRESHOLD,
+            "spread_threshold": Settings.SPREAD_THRESHOLD,
+            "instant_move_threshold": Settings.INSTANT_MOVE_THRESHOLD,
+        },
+        "timer_overhead_ns": _timer_overhead_ns(),
+        "results": results,
+    }
+
+def compare(baseline: dict, current: dict, tolerance: float = 10.0) -> tuple[list[str], bool]:
+    """
+    Compare two reports scenario by scenario.
+    :param tolerance: Allowed throughput drop / p99 increase in percent before flagging a regression
+    :return: (report lines, regressed)
+    """
+    lines = [f"baseline {baseline.get('commit')} ({baseline.get('created_at')}) -> "
+             f"current {current.get('commit')} ({current.get('created_at')})"]
+    if baseline.get("params") != current.get("params"):
+        lines.append("warning: benchmark parameters differ, numbers may not be comparable")
+
+    regressed = False
+    header = f"{'scenario':<30}{'ticks/s':>14}{'delta':>9}{'p50 ns':>10}{'p99 ns':>10}{'delta':>9}"
+    lines.append(header)
+    for name, cur in current.get("results", {}).items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            lines.append(f"{name:<30}{cur['ticks_per_sec']:>14,.0f}{'new':>9}")
+            continue
+        tput = (cur["ticks_per_sec"] / base["ticks_per_sec"] - 1) * 100 if base["ticks_per_sec"] else 0.0
+        p99 = (cur["latency_ns"]["p99"] / base["latency_ns"]["p99"] - 1) * 100 if base["latency_ns"]["p99"] else 0.0
+        flag = ""
+        if tput < -tolerance or p99 > tolerance:
+            regressed = True
+            flag = "  REGRESSION"
+        lines.append(f"{name:<30}{cur['ticks_per_sec']:>14,.0f}{tput:>+8.1f}%"
+                     f"{cur['latency_ns']['p50']:>10}{cur['latency_ns']['p99']:>10}{p99:>+8.1f}%{flag}")
+    return lines, regressed
+
+def _load(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    if report.get("schema") != SCHEMA_VERSION:
+        raise SystemExit(f"{path}: unsupported schema {report.get('schema')}")
+    return report
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Quote hot-path microbenchmarks")
+    parser.add_argument("--ticks", type=int, default=200000, help="Measured ticks per scenario")
+    parser.add_argument("--warmup", type=int, default=5000)
+    parser.add_argument("--underlyings", type=int, default=20)
+    parser.add_argument("--options-per-underlying", type=int, default=24)
+    parser.add_argument("--batch-size", type=int, default=64, help="Ticks per on_quote_batch call before conflation")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--baseline", help="Previous result file to compare this run against")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="Compare two result files and exit")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="Regression threshold in percent")
+    parser.add_argument("--log-level", default="WARNING",
+                        help="Application log level during the run (INFO logs every signal to stdout and monitor.log)")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        lines, regressed = compare(_load(args.compare[0]), _load(args.compare[1]), args.tolerance)
+        print("\n".join(lines))
+        return 1 if regressed else 0
+
+    logging.getLogger().setLevel(args.log_level)
+    logging.getLogger("LongBridgeMonitor").setLevel(args.log_level)
+
+    report = run_benchmarks(ticks=args.ticks, underlyings=args.underlyings,
+                            options_per_underlying=args.options_per_underlying,
+                            seed=args.seed, warmup=args.warmup, batch_size=args.batch_size)
+
+    output = args.output
+    if output is None:
+        suffix = "-dirty" if report["dirty"] else ""
+        output = os.path.join(RESULTS_DIR, f"{report['commit']}{suffix}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'scenario':<30}{'ticks/s':>14}{'p50 ns':>10}{'p90 ns':>10}{'p99 ns':>10}{'p999 ns':>10}")
+    for name, res in report["results"].items():
+        lat = res["latency_ns"]
+        unit = " (per batch)" if res.get("latency_unit") == "batch" else ""
+        print(f"{name:<30}{res['ticks_per_sec']:>14,.0f}{lat['p50']:>10}{lat['p90']:>10}"
+              f"{lat['p99']:>10}{lat['p999']:>10}{unit}")
+    print(f"Timer overhead per call: ~{report['timer_overhead_ns']} ns. Results written to {output}")
+
+    if args.baseline:
+        lines, regressed = compare(_load(args.baseline), report, args.tolerance)
+        print("\n".join(lines))
+        return 1 if regressed else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+import math
+import random
+from datetime import datetime, timedelta
+
+# Liquid US underlyings; option contracts are derived from these
+UNDERLYINGS = [
+    "AAPL", "NVDA", "TSLA", "MSFT", "AMZN", "META", "GOOGL", "AMD", "SPY", "QQQ",
+    "IWM", "NFLX", "AVGO", "COIN", "PLTR", "SMCI", "BABA", "INTC", "MU", "UBER",
+]
+
+_TICK = 0.01
+
+class SyntheticQuote:
+    """Quote object with the attributes Strategy reads from a LongPort quote"""
+    __slots__ = ("symbol", "timestamp", "last_done", "open", "high", "low", "prev_close",
+                 "volume", "turnover", "bid_price", "ask_price")
+
+    def __repr__(self):
+        return f"SyntheticQuote(symbol={self.symbol}, last_done={self.last_done})"
+
+class _SymbolState:
+    __slots__ = ("symbol", "prev_close", "deviation", "sigma", "max_spread_ticks", "lot",
+                 "volume", "turnover", "high", "low")
+
+class SyntheticQuoteStream:
+    """
+    Deterministic quote stream for benchmarks.
+
+    - Universe: `underlyings` stocks plus `options_per_underlying` option contracts
+      each (LongPort option symbols, e.g. AAPL240621C190000.US).
+    - Activity is Zipf-distributed over the universe, so a handful of symbols
+      produce most ticks, as in a live feed.
+    - Prices mean-revert around prev_close with per-tick noise (options are
+      noisier) and rare jumps, which keeps the signal rate realistic instead of
+      firing on every tick.
+    - Arrivals are Poisson at `rate` ticks/sec in exchange time.
+    """
+
+    def __init__(self, underlyings: int = 20, options_per_underlying: int = 24, seed: int = 42,
+                 rate: float = 5000.0, zipf_s: float = 1.1, jump_prob: float = 0.0005,
+                 with_book: bool = True, with_prev_close: bool = True):
+        self.rng = random.Random(seed)
+        self.rate = rate
+        self.jump_prob = jump_prob
+        self.with_book = with_book
+        self.with_prev_close = with_prev_close
+        self.states = []
+
+        names = [UNDERLYINGS[i % len(UNDERLYINGS)] + (str(i // len(UNDERLYINGS)) if i >= len(UNDERLYINGS) else "")
+                 for i in range(underlyings)]
+        for name in names:
+            spot = round(self.rng.uniform(20, 600), 2)
+            self.states.append(self._state(f"{name}.US", spot, sigma=0.0005, max_spread_ticks=4, lot=100))
+            for j in range(options_per_underlying):
+                right = "C" if j % 2 == 0 else "P"
+                strike = round(spot * (0.8 + 0.4 * (j // 2) / max(1, options_per_underlying // 2 - 1)))
+                price = max(0.05, round(abs(spot - strike) * 0.5 + self.rng.uniform(0.3, 8.0), 2))
+                self.states.append(self._state(f"{name}240621{right}{strike * 1000}.US", price,
+                                               sigma=0.0015, max_spread_ticks=30, lot=1))
+
+        # Shuffle before weighting so the hottest symbols are a mix of stocks and options
+        self.rng.shuffle(self.states)
+        weights = [1.0 / (rank + 1) ** zipf_s for rank in range(len(self.states))]
+        total = 0.0
+        self._cum_weights = []
+        for w in weights:
+            total += w
+            self._cum_weights.append(total)
+
+    @staticmethod
+    def _state(symbol: str, prev_close: float, sigma: float, max_spread_ticks: int, lot: int) -> _SymbolState:
+        state = _SymbolState()
+        state.symbol = symbol
+        state.prev_close = prev_close
+        state.deviation = 0.0
+        state.sigma = sigma
+        state.max_spread_ticks = max_spread_ticks
+        state.lot = lot
+        state.volume = 0
+        state.turnover = 0.0
+        state.high = state.low = prev_close
+        return state
+
+    @property
+    def symbols(self) -> list[str]:
+        return [s.symbol for s in self.states]
+
+    def ticks(self, count: int, start: datetime = None) -> list[tuple]:
+        """
+        Generate `count` ticks up front so generation cost stays out of measurements.
+        :return: List of (symbol, SyntheticQuote)
+        """
+        rng = self.rng
+        now = start or datetime(2024, 6, 3, 14, 30)
+        picks = rng.choices(self.states, cum_weights=self._cum_weights, k=count)
+        out = []
+        for state in picks:
+            now += timedelta(seconds=rng.expovariate(self.rate))
+            # Mean-reverting log deviation from prev_close, plus a rare jump
+            state.deviation = state.deviation * 0.99 + rng.gauss(0.0, state.sigma)
+            if rng.random() < self.jump_prob:
+                state.deviation += rng.choice((-1, 1)) * rng.uniform(0.02, 0.06)
+            last = max(_TICK, round(state.prev_close * math.exp(state.deviation), 2))
+            size = int(rng.paretovariate(1.5)) * state.lot
+
+            state.volume += size
+            state.turnover += size * last
+            state.high = max(state.high, last)
+            state.low = min(state.low, last)
+
+            quote = SyntheticQuote()
+            quote.symbol = state.symbol
+            quote.timestamp = now
+            quote.last_done = last
+            quote.open = state.prev_close
+            quote.high = state.high
+            quote.low = state.low
+            quote.prev_close = state.prev_close if self.with_prev_close else None
+            quote.volume = state.volume
+            quote.turnover = state.turnover
+            if self.with_book:
+                spread = _TICK * rng.randint(1, state.max_spread_ticks)
+                bid = max(_TICK, round(last - spread / 2, 2))
+                quote.bid_price = [bid]
+                quote.ask_price = [round(bid + spread, 2)]
+            else:
+                quote.bid_price = []
+                quote.ask_price = []
+            out.append((state.symbol, quote))
+        return out
@@ -1,81 +1,439 @@
 import os
-import yaml
+import time
+
+def load_env():
+    """
+    Load environment variables from config/.env file
+    Priority: config/.env > .env > system env
+    """
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        # If python-dotenv is not installed, assume environment variables are set manually
+        return
 
-try:
-    from dotenv import load_dotenv
-    # Load environment variables from config/.env file
-    # Priority: config/.env > .env > system env
-    
     # 1. Try loading from config/.env
     # This file is located at config/settings.py, so .env is in the same directory
     config_dir = os.path.dirname(os.path.abspath(__file__))
     config_env_path = os.path.join(config_dir, ".env")
-    
+
     if os.path.exists(config_env_path):
         load_dotenv(config_env_path)
     else:
         # 2. Fallback to default .env in root
         root_env_path = os.path.join(os.path.dirname(config_dir), ".env")
         load_dotenv(root_env_path)
-except ImportError:
-    # If python-dotenv is not installed, assume environment variables are set manually
-    pass
 
-class Settings:
+def _read_settings() -> dict:
+    """Evaluate every setting from the environment and symbols.yaml"""
+    import yaml
+
+    values = {}
     # LongBridge API
-    LONGPORT_APP_KEY = os.getenv("LONGPORT_APP_KEY") or os.getenv("LB_APP_KEY")
-    LONGPORT_APP_SECRET = os.getenv("LONGPORT_APP_SECRET") or os.getenv("LB_APP_SECRET")
-    LONGPORT_ACCESS_TOKEN = os.getenv("LONGPORT_ACCESS_TOKEN") or os.getenv("LB_ACCESS_TOKEN")
-    LONGPORT_WS_URL = os.getenv("LONGPORT_WS_URL", "wss://openapi.longportapp.com/v1/quote/ws")
+    values["LONGPORT_APP_KEY"] = os.getenv("LONGPORT_APP_KEY") or os.getenv("LB_APP_KEY")
+    values["LONGPORT_APP_SECRET"] = os.getenv("LONGPORT_APP_SECRET") or os.getenv("LB_APP_SECRET")
+    values["LONGPORT_ACCESS_TOKEN"] = os.getenv("LONGPORT_ACCESS_TOKEN") or os.getenv("LB_ACCESS_TOKEN")
+    values["LONGPORT_WS_URL"] = os.getenv("LONGPORT_WS_URL", "wss://openapi.longportapp.com/v1/quote/ws")
 
     # Alert Webhooks
-    FEISHU_WEBHOOK = os.getenv("FEISHU_WEBHOOK")
-    DINGTALK_WEBHOOK = os.getenv("DINGTALK_WEBHOOK")
+    values["FEISHU_WEBHOOK"] = os.getenv("FEISHU_WEBHOOK")
+    values["DINGTALK_WEBHOOK"] = os.getenv("DINGTALK_WEBHOOK")
+
+    # Alert Delivery (async notifier)
+    try:
+        values["ALERT_QUEUE_SIZE"] = int(os.getenv("ALERT_QUEUE_SIZE", "1000"))
+    except ValueError:
+        values["ALERT_QUEUE_SIZE"] = 1000
+
+    try:
+        values["ALERT_WORKERS"] = int(os.getenv("ALERT_WORKERS", "4"))
+    except ValueError:
+        values["ALERT_WORKERS"] = 4
+
+    try:
+        values["ALERT_TIMEOUT"] = float(os.getenv("ALERT_TIMEOUT", "3.0"))
+    except ValueError:
+        values["ALERT_TIMEOUT"] = 3.0
 
     # Monitoring
-    _symbols_str = os.getenv("MONITOR_SYMBOLS", "")
-    MONITOR_SYMBOLS = [s.strip() for s in _symbols_str.split(",") if s.strip()]
+    symbols_str = os.getenv("MONITOR_SYMBOLS", "")
+    values["MONITOR_SYMBOLS"] = [s.strip() for s in symbols_str.split(",") if s.strip()]
 
     # Load symbols from yaml if available
-    SYMBOLS_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "symbols.yaml")
-    SYMBOLS_CONFIG = {}
-    if os.path.exists(SYMBOLS_CONFIG_PATH):
+    values["SYMBOLS_CONFIG_PATH"] = os.path.join(os.path.dirname(os.path.abspath(__file__)), "symbols.yaml")
+    values["SYMBOLS_CONFIG"] = {}
+    if os.path.exists(values["SYMBOLS_CONFIG_PATH"]):
         try:
-            with open(SYMBOLS_CONFIG_PATH, 'r', encoding='utf-8') as f:
-                SYMBOLS_CONFIG = yaml.safe_load(f) or {}
+            with open(values["SYMBOLS_CONFIG_PATH"], 'r', encoding='utf-8') as f:
+                values["SYMBOLS_CONFIG"] = yaml.safe_load(f) or {}
                 # Merge yaml symbols if env MONITOR_SYMBOLS is empty
-                if not MONITOR_SYMBOLS and 'symbols' in SYMBOLS_CONFIG:
-                    MONITOR_SYMBOLS = SYMBOLS_CONFIG['symbols']
+                if not values["MONITOR_SYMBOLS"] and 'symbols' in values["SYMBOLS_CONFIG"]:
+                    values["MONITOR_SYMBOLS"] = values["SYMBOLS_CONFIG"]['symbols']
         except Exception as e:
             print(f"Warning: Failed to load symbols.yaml: {e}")
 
     # Strategy Thresholds
     try:
-        PRICE_CHANGE_THRESHOLD = float(os.getenv("PRICE_CHANGE_THRESHOLD", "2.0"))
+        values["PRICE_CHANGE_THRESHOLD"] = float(os.getenv("PRICE_CHANGE_THRESHOLD", "2.0"))
+    except ValueError:
+        values["PRICE_CHANGE_THRESHOLD"] = 2.0
+
+    try:
+        values["SPREAD_THRESHOLD"] = float(os.getenv("SPREAD_THRESHOLD", "0.05"))
+    except ValueError:
+        values["SPREAD_THRESHOLD"] = 0.05
+
+    try:
+        # Seconds between symbols.yaml checks for rule changes (0 = no hot reload)
+        values["RULES_RELOAD_INTERVAL"] = float(os.getenv("RULES_RELOAD_INTERVAL", "5"))
+    except ValueError:
+        values["RULES_RELOAD_INTERVAL"] = 5.0
+
+    # Level-2 depth
+    try:
+        values["DEPTH_LEVELS"] = int(os.getenv("DEPTH_LEVELS", "10"))
+    except ValueError:
+        values["DEPTH_LEVELS"] = 10
+
+    try:
+        # Spread as % of mid; order-book imbalance is only trusted below this
+        values["SPREAD_PCT_THRESHOLD"] = float(os.getenv("SPREAD_PCT_THRESHOLD", "1.0"))
+    except ValueError:
+        values["SPREAD_PCT_THRESHOLD"] = 1.0
+
+    try:
+        # |bid_vol - ask_vol| / (bid_vol + ask_vol) over the top IMBALANCE_LEVELS
+        values["IMBALANCE_THRESHOLD"] = float(os.getenv("IMBALANCE_THRESHOLD", "0.6"))
+    except ValueError:
+        values["IMBALANCE_THRESHOLD"] = 0.6
+
+    try:
+        values["IMBALANCE_LEVELS"] = int(os.getenv("IMBALANCE_LEVELS", "5"))
+    except ValueError:
+        values["IMBALANCE_LEVELS"] = 5
+
+    # Instantaneous move (rolling window indicators)
+    try:
+        values["INSTANT_WINDOW_SECONDS"] = float(os.getenv("INSTANT_WINDOW_SECONDS", "30"))
+    except ValueError:
+        values["INSTANT_WINDOW_SECONDS"] = 30.0
+
+    try:
+        values["INSTANT_MOVE_THRESHOLD"] = float(os.getenv("INSTANT_MOVE_THRESHOLD", "2.0"))
+    except ValueError:
+        values["INSTANT_MOVE_THRESHOLD"] = 2.0
+
+    try:
+        # Ticks kept per symbol; memory is 48 bytes * capacity per symbol
+        values["INDICATOR_CAPACITY"] = int(os.getenv("INDICATOR_CAPACITY", "256"))
+    except ValueError:
+        values["INDICATOR_CAPACITY"] = 256
+
+    # Ingestion (SDK thread -> event loop handoff)
+    try:
+        # Max distinct symbols waiting for analysis at once
+        values["INGEST_MAX_PENDING"] = int(os.getenv("INGEST_MAX_PENDING", "10000"))
+    except ValueError:
+        values["INGEST_MAX_PENDING"] = 10000
+
+    # Sharded analysis (0 = analyze in the SDK callback process)
+    try:
+        values["SHARD_WORKERS"] = int(os.getenv("SHARD_WORKERS", "0"))
+    except ValueError:
+        values["SHARD_WORKERS"] = 0
+
+    try:
+        # Quote records per worker ring buffer (80 bytes each)
+        values["SHARD_RING_CAPACITY"] = int(os.getenv("SHARD_RING_CAPACITY", "65536"))
+    except ValueError:
+        values["SHARD_RING_CAPACITY"] = 65536
+
+    # Alert Coalescing (defaults; per signal type / symbol overrides live under `alerts` in symbols.yaml)
+    try:
+        values["ALERT_COOLDOWN"] = float(os.getenv("ALERT_COOLDOWN", "60"))
+    except ValueError:
+        values["ALERT_COOLDOWN"] = 60.0
+
+    try:
+        values["ALERT_ESCALATION_STEP"] = float(os.getenv("ALERT_ESCALATION_STEP", "1.0"))
+    except ValueError:
+        values["ALERT_ESCALATION_STEP"] = 1.0
+
+    try:
+        values["ALERT_DIGEST_WINDOW"] = float(os.getenv("ALERT_DIGEST_WINDOW", "2.0"))
+    except ValueError:
+        values["ALERT_DIGEST_WINDOW"] = 2.0
+
+    # Pull quotes (ctx.quote / ctx.static_info)
+    try:
+        # Max symbols per request accepted by the quote API
+        values["QUOTE_BATCH_SIZE"] = int(os.getenv("QUOTE_BATCH_SIZE", "500"))
+    except ValueError:
+        values["QUOTE_BATCH_SIZE"] = 500
+
+    try:
+        # Max quote API requests in flight at once
+        values["QUOTE_CONCURRENCY"] = int(os.getenv("QUOTE_CONCURRENCY", "5"))
+    except ValueError:
+        values["QUOTE_CONCURRENCY"] = 5
+
+    try:
+        # get_quote answers from the pushed latest quote when it is at most this old (0 = always ask the API)
+        values["QUOTE_MAX_AGE"] = float(os.getenv("QUOTE_MAX_AGE", "5"))
+    except ValueError:
+        values["QUOTE_MAX_AGE"] = 5.0
+
+    try:
+        # Security names do not change intraday
+        values["STATIC_INFO_TTL"] = float(os.getenv("STATIC_INFO_TTL", "21600"))
+    except ValueError:
+        values["STATIC_INFO_TTL"] = 21600.0
+
+    # Option chain expansion (per-underlying overrides live under `option_chains` in symbols.yaml)
+    values["OPTION_UNDERLYINGS"] = [s.strip() for s in os.getenv("OPTION_UNDERLYINGS", "").split(",") if s.strip()]
+    try:
+        # Nearest expiries to subscribe per underlying
+        values["OPTION_EXPIRIES"] = int(os.getenv("OPTION_EXPIRIES", "2"))
+    except ValueError:
+        values["OPTION_EXPIRIES"] = 2
+
+    try:
+        # Strikes within +/- this % of the underlying price are subscribed
+        values["OPTION_WINDOW_PCT"] = float(os.getenv("OPTION_WINDOW_PCT", "5"))
+    except ValueError:
+        values["OPTION_WINDOW_PCT"] = 5.0
+
+    try:
+        # Underlying move (%) since the last re-centre before the window shifts
+        values["OPTION_RECENTER_PCT"] = float(os.getenv("OPTION_RECENTER_PCT", "0.5"))
+    except ValueError:
+        values["OPTION_RECENTER_PCT"] = 0.5
+
+    try:
+        values["OPTION_REBALANCE_INTERVAL"] = float(os.getenv("OPTION_REBALANCE_INTERVAL", "1"))
+    except ValueError:
+        values["OPTION_REBALANCE_INTERVAL"] = 1.0
+
+    # Connection supervision
+    try:
+        # Seconds without any push before the connection is probed
+        values["HEARTBEAT_TIMEOUT"] = float(os.getenv("HEARTBEAT_TIMEOUT", "15"))
+    except ValueError:
+        values["HEARTBEAT_TIMEOUT"] = 15.0
+
+    try:
+        values["HEARTBEAT_PROBE_TIMEOUT"] = float(os.getenv("HEARTBEAT_PROBE_TIMEOUT", "5"))
+    except ValueError:
+        values["HEARTBEAT_PROBE_TIMEOUT"] = 5.0
+
+    try:
+        values["RECONNECT_BACKOFF_BASE"] = float(os.getenv("RECONNECT_BACKOFF_BASE", "0.5"))
+    except ValueError:
+        values["RECONNECT_BACKOFF_BASE"] = 0.5
+
+    try:
+        values["RECONNECT_BACKOFF_MAX"] = float(os.getenv("RECONNECT_BACKOFF_MAX", "30"))
+    except ValueError:
+        values["RECONNECT_BACKOFF_MAX"] = 30.0
+
+    # Subscription budget (symbols beyond it are pull-polled)
+    try:
+        # Max push-subscribed symbols per connection; 0 = unlimited
+        values["SUBSCRIPTION_BUDGET"] = int(os.getenv("SUBSCRIPTION_BUDGET", "500"))
+    except ValueError:
+        values["SUBSCRIPTION_BUDGET"] = 500
+    # Always kept on push, never demoted to polling
+    values["PINNED_SYMBOLS"] = [s.strip() for s in os.getenv("PINNED_SYMBOLS", "").split(",") if s.strip()]
+    values["PINNED_SYMBOLS"] = list(dict.fromkeys(values["PINNED_SYMBOLS"] + list(values["SYMBOLS_CONFIG"].get('pinned') or [])))
+
+    try:
+        # Seconds between priority re-ranks (promote / demote)
+        values["SCHEDULER_INTERVAL"] = float(os.getenv("SCHEDULER_INTERVAL", "10"))
+    except ValueError:
+        values["SCHEDULER_INTERVAL"] = 10.0
+
+    try:
+        # Half-life (seconds) of the signal / volatility activity scores
+        values["SCHEDULER_HALF_LIFE"] = float(os.getenv("SCHEDULER_HALF_LIFE", "300"))
+    except ValueError:
+        values["SCHEDULER_HALF_LIFE"] = 300.0
+
+    try:
+        # Score bonus for already subscribed symbols (0.2 = +20%), avoids churn on near-ties
+        values["SCHEDULER_HYSTERESIS"] = float(os.getenv("SCHEDULER_HYSTERESIS", "0.2"))
+    except ValueError:
+        values["SCHEDULER_HYSTERESIS"] = 0.2
+
+    try:
+        # One signal counts as this many % of price movement
+        values["SCHEDULER_SIGNAL_WEIGHT"] = float(os.getenv("SCHEDULER_SIGNAL_WEIGHT", "1"))
+    except ValueError:
+        values["SCHEDULER_SIGNAL_WEIGHT"] = 1.0
+
+    try:
+        values["POLL_MIN_INTERVAL"] = float(os.getenv("POLL_MIN_INTERVAL", "2"))
+    except ValueError:
+        values["POLL_MIN_INTERVAL"] = 2.0
+
+    try:
+        values["POLL_MAX_INTERVAL"] = float(os.getenv("POLL_MAX_INTERVAL", "30"))
+    except ValueError:
+        values["POLL_MAX_INTERVAL"] = 30.0
+
+    # Watchlist sync (subscriptions follow the app watchlist)
+    values["WATCHLIST_SYNC_ENABLED"] = os.getenv("WATCHLIST_SYNC_ENABLED", "false").lower() == "true"
+    try:
+        values["WATCHLIST_SYNC_INTERVAL"] = float(os.getenv("WATCHLIST_SYNC_INTERVAL", "30"))
+    except ValueError:
+        values["WATCHLIST_SYNC_INTERVAL"] = 30.0
+    # Comma separated group names; empty follows every group
+    values["WATCHLIST_GROUPS"] = [g.strip() for g in os.getenv("WATCHLIST_GROUPS", "").split(",") if g.strip()]
+
+    # Security metadata store (static_info persisted across restarts)
+    values["METADATA_DB"] = os.getenv("METADATA_DB", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "metadata.db"))
+    try:
+        # Stored static info older than this many days is fetched again
+        values["METADATA_MAX_AGE_DAYS"] = int(os.getenv("METADATA_MAX_AGE_DAYS", "7"))
+    except ValueError:
+        values["METADATA_MAX_AGE_DAYS"] = 7
+
+    # Push stream recording (for replay / threshold tuning)
+    values["RECORD_ENABLED"] = os.getenv("RECORD_ENABLED", "false").lower() == "true"
+    values["RECORD_DIR"] = os.getenv("RECORD_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "recordings"))
+
+    # 1s / 1m OHLCV bars built from trade pushes (subscribes SubType.Trade)
+    values["BARS_ENABLED"] = os.getenv("BARS_ENABLED", "false").lower() == "true"
+    values["BARS_DIR"] = os.getenv("BARS_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "bars"))
+    try:
+        # Seconds between batched writes of completed bars
+        values["BAR_FLUSH_INTERVAL"] = float(os.getenv("BAR_FLUSH_INTERVAL", "10"))
+    except ValueError:
+        values["BAR_FLUSH_INTERVAL"] = 10.0
+
+    try:
+        # A quiet symbol's bar is closed this many seconds after its interval ends
+        values["BAR_CLOSE_GRACE"] = float(os.getenv("BAR_CLOSE_GRACE", "2"))
+    except ValueError:
+        values["BAR_CLOSE_GRACE"] = 2.0
+
+    # Historical candlestick cache (one file per period / symbol / finished day)
+    values["HISTORY_DIR"] = os.getenv("HISTORY_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "history"))
+    try:
+        # Max history requests in flight during a backfill
+        values["HISTORY_CONCURRENCY"] = int(os.getenv("HISTORY_CONCURRENCY", "4"))
+    except ValueError:
+        values["HISTORY_CONCURRENCY"] = 4
+
+    try:
+        # Max history requests per second (the API throttles bursts)
+        values["HISTORY_RATE"] = float(os.getenv("HISTORY_RATE", "10"))
+    except ValueError:
+        values["HISTORY_RATE"] = 10.0
+
+    # Metrics endpoint
+    values["METRICS_ENABLED"] = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    values["METRICS_HOST"] = os.getenv("METRICS_HOST", "127.0.0.1")
+    try:
+        values["METRICS_PORT"] = int(os.getenv("METRICS_PORT", "9108"))
+    except ValueError:
+        values["METRICS_PORT"] = 9108
+
+    # Logging
+    values["LOG_FILE"] = os.getenv("LOG_FILE", "monitor.log")
+    values["LOG_LEVEL"] = os.getenv("LOG_LEVEL", "INFO").upper()
+    # Console / file I/O happens on a background thread behind a queue
+    values["LOG_ASYNC"] = os.getenv("LOG_ASYNC", "true").lower() == "true"
+    # File as JSON lines (ts, level, logger, msg) instead of text
+    values["LOG_JSON"] = os.getenv("LOG_JSON", "false").lower() == "true"
+    try:
+        # Roll the log over beyond this size (it is also rolled daily)
+        values["LOG_MAX_BYTES"] = int(os.getenv("LOG_MAX_BYTES", str(100 * 1024 * 1024)))
     except ValueError:
-        PRICE_CHANGE_THRESHOLD = 2.0
+        values["LOG_MAX_BYTES"] = 100 * 1024 * 1024
 
     try:
-        SPREAD_THRESHOLD = float(os.getenv("SPREAD_THRESHOLD", "0.05"))
+        values["LOG_BACKUP_COUNT"] = int(os.getenv("LOG_BACKUP_COUNT", "30"))
     except ValueError:
-        SPREAD_THRESHOLD = 0.05
+        values["LOG_BACKUP_COUNT"] = 30
+
+    try:
+        # Records beyond this many pending are dropped instead of blocking the caller
+        values["LOG_QUEUE_SIZE"] = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    except ValueError:
+        values["LOG_QUEUE_SIZE"] = 10000
 
     # Trading
-    ENABLE_TRADING = os.getenv("ENABLE_TRADING", "false").lower() == "true"
+    values["ENABLE_TRADING"] = os.getenv("ENABLE_TRADING", "false").lower() == "true"
+
+    try:
+        # Extra room (%) allowed outside the best bid/ask band for limit orders
+        values["PRICE_PROTECTION_TOLERANCE"] = float(os.getenv("PRICE_PROTECTION_TOLERANCE", "0"))
+    except ValueError:
+        values["PRICE_PROTECTION_TOLERANCE"] = 0.0
+
+    try:
+        # Orders are rejected when the cached top-of-book is older than this (seconds, 0 = no limit)
+        values["PRICE_PROTECTION_MAX_AGE"] = float(os.getenv("PRICE_PROTECTION_MAX_AGE", "60"))
+    except ValueError:
+        values["PRICE_PROTECTION_MAX_AGE"] = 60.0
+
+    # Remark prefix on every order this process submits; the order tracker ignores other orders
+    values["ORDER_REMARK_TAG"] = os.getenv("ORDER_REMARK_TAG", "lbad")
 
-    @classmethod
-    def validate(cls):
+    try:
+        # Seconds a filled / cancelled order stays in the order tracker
+        values["ORDER_RETENTION"] = float(os.getenv("ORDER_RETENTION", "3600"))
+    except ValueError:
+        values["ORDER_RETENTION"] = 3600.0
+
+    return values
+
+class _Settings:
+    """
+    Global configuration. Nothing is read at import time: `Settings.load()` reads
+    every value once at startup (main.py calls it first; importing `src` does it
+    otherwise). Reading a setting before that raises AttributeError, and
+    assigning one raises RuntimeError, since load() would silently replace it.
+    """
+
+    def __init__(self):
+        self.__dict__.update(_loaded=False, load_ms=0.0)
+
+    def load(self, reload: bool = False):
+        """Read .env, the environment and symbols.yaml (once unless `reload`)"""
+        if self._loaded and not reload:
+            return self
+        start = time.perf_counter()
+        load_env()
+        self.__dict__.update(_read_settings())
+        self.__dict__.update(_loaded=True, load_ms=(time.perf_counter() - start) * 1000)
+        return self
+
+    def __getattr__(self, name):
+        # Only reached for names that are not set
+        if not self._loaded and not name.startswith('_'):
+            raise AttributeError(f"Settings.{name} read before Settings.load()")
+        raise AttributeError(f"Settings has no attribute '{name}'")
+
+    def __setattr__(self, name, value):
+        if not self._loaded:
+            raise RuntimeError(f"Settings.{name} assigned before Settings.load()")
+        self.__dict__[name] = value
+
+    def validate(self):
         """Validate critical configuration"""
         missing = []
-        if not cls.LONGPORT_APP_KEY: missing.append("LONGPORT_APP_KEY")
-        if not cls.LONGPORT_APP_SECRET: missing.append("LONGPORT_APP_SECRET")
-        if not cls.LONGPORT_ACCESS_TOKEN: missing.append("LONGPORT_ACCESS_TOKEN")
+        if not self.LONGPORT_APP_KEY: missing.append("LONGPORT_APP_KEY")
+        if not self.LONGPORT_APP_SECRET: missing.append("LONGPORT_APP_SECRET")
+        if not self.LONGPORT_ACCESS_TOKEN: missing.append("LONGPORT_ACCESS_TOKEN")
         
         if missing:
             raise ValueError(f"Missing required configuration: {', '.join(missing)}")
         
-        if not cls.MONITOR_SYMBOLS:
+        if not self.MONITOR_SYMBOLS:
             print("Warning: No symbols configured for monitoring (MONITOR_SYMBOLS is empty)")
 
+Settings = _Settings()
+
 # Alias for backward compatibility if needed, but prefer Settings
 Config = Settings
@@ -6,9 +6,12 @@ import json
 # Add project root to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from config.settings import Settings
+
+Settings.load()
+
 from src.api.longport.personalized import get_watchlist
 from src.api.longport.pull import get_quote
-from config.settings import Settings
 
 async def main():
     print("Initializing LongBridge Client...")
@@ -1,10 +1,25 @@
+import time
+_started = time.perf_counter()
+
 import asyncio
 import signal
-from src.monitor.core import Monitor
-from src.utils.logger import logger
-from config.settings import Settings
 
+# Everything else happens in main(): shard workers are spawned, and a spawned child
+# re-imports this file as __mp_main__, which must not load settings or the Monitor stack
 async def main():
+    from config.settings import Settings
+
+    # Read .env / symbols.yaml exactly once, before any module looks at a setting
+    Settings.load()
+
+    from src.monitor.startup import StartupTimer
+
+    timer = StartupTimer(started=_started)
+    timer.record("settings", Settings.load_ms)
+    with timer.phase("imports"):
+        from src.monitor.core import Monitor
+        from src.utils.logger import logger
+
     logger.info("Starting LongBridge Auto Deal System...")
     
     # Validate configuration
@@ -15,7 +30,8 @@ async def main():
         return
 
     # Initialize Monitor
-    monitor = Monitor()
+    with timer.phase("init"):
+        monitor = Monitor()
     
     # Setup signal handlers for graceful shutdown
     loop = asyncio.get_running_loop()
@@ -34,7 +50,7 @@ async def main():
 
     # Start monitoring
     try:
-        await monitor.start()
+        await monitor.start(timer)
         # Keep running until stop signal
         # Note: In a real asyncio app, monitor.start() might be a long-running task 
         # or we wait on the stop_event while the monitor runs in background tasks.
@@ -50,7 +66,7 @@ async def main():
         logger.error(f"Runtime error: {e}")
     finally:
         logger.info("Shutting down...")
-        # Add cleanup logic here if needed
+        await monitor.stop()
 
 if __name__ == "__main__":
     try:
@@ -1,3 +1,4 @@
 from .strategy import StrategyAnalyzer, StrategySignal
+from .batch import BatchStrategy
 
-__all__ = ['StrategyAnalyzer', 'StrategySignal']
+__all__ = ['StrategyAnalyzer', 'StrategySignal', 'BatchStrategy']
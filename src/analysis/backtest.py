@@ -0,0 +1,364 @@
+import argparse
+import glob
+import json
+import os
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import numpy as np
+from src.utils.columnar import concat_bars, read_bar_file
+
+logger = logging.getLogger(__name__)
+
+_US_EASTERN = ZoneInfo("America/New_York")
+
+# Forward-return horizons in seconds
+DEFAULT_HORIZONS = (60, 300, 1800)
+
+def _ffill(values: np.ndarray) -> np.ndarray:
+    """Carry the last non-NaN value forward (leading NaNs stay NaN)"""
+    idx = np.where(np.isnan(values), 0, np.arange(len(values)))
+    np.maximum.accumulate(idx, out=idx)
+    return values[idx]
+
+def _ny_day(start: np.ndarray) -> np.ndarray:
+    """New York date ordinal per epoch second; dates are resolved once per hour bucket"""
+    hours, inverse = np.unique(start // 3600, return_inverse=True)
+    days = np.array([datetime.fromtimestamp(int(h) * 3600, _US_EASTERN).date().toordinal() for h in hours],
+                    dtype=np.int64)
+    return days[inverse]
+
+def _prev_day_close(start: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """Last close of the previous New York date for every row (NaN on the first date)"""
+    day = _ny_day(start)
+    _, first, inverse = np.unique(day, return_index=True, return_inverse=True)
+    last = np.append(first[1:], len(day)) - 1
+    prev = np.concatenate(([np.nan], close[last[:-1]]))
+    return prev[inverse]
+
+def frame_from_bars(bars: dict) -> dict:
+    """
+    Bar columns -> backtest frame. Every bar close is a quote tick; prev_close is
+    the previous New York date's last close. Bars carry no book, so the spread
+    rule never fires on them.
+    """
+    n = len(bars["start"])
+    close = bars["close"].astype(np.float64)
+    return {
+        "time": bars["start"].astype(np.float64),
+        "price": close,
+        "prev_close": _prev_day_close(bars["start"], close) if n else np.empty(0),
+        "bid": np.full(n, np.nan),
+        "ask": np.full(n, np.nan),
+        "is_quote": np.ones(n, dtype=bool),
+    }
+
+def load_bar_frames(pattern: str) -> dict:
+    """
+    Read bar files matching a glob into one frame per symbol. The symbol is the
+    directory holding a HistoryCache .npz, or the BarRecorder column directory itself.
+    """
+    by_symbol = {}
+    for path in sorted(glob.glob(pattern)):
+        path = path.rstrip(os.sep)
+        symbol = os.path.basename(path if os.path.isdir(path) else os.path.dirname(path))
+        by_symbol.setdefault(symbol, []).append(read_bar_file(path))
+    return {symbol: frame_from_bars(concat_bars(parts)) for symbol, parts in by_symbol.items()}
+
+def _recording_prev_close(t: np.ndarray, price: np.ndarray, prev_close: np.ndarray) -> np.ndarray:
+    """
+    Recorded prev_close (only snapshot / poll quotes have one) carried forward within
+    its New York date; rows still without one use the previous date's last price.
+    """
+    day = _ny_day(t.astype(np.int64))
+    out = prev_close.copy()
+    bounds = np.flatnonzero(np.diff(day)) + 1
+    for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(day)]):
+        out[lo:hi] = _ffill(out[lo:hi])
+    missing = np.isnan(out)
+    if missing.any():
+        out[missing] = _prev_day_close(t.astype(np.int64), price)[missing]
+    return out
+
+def load_recording_frames(paths: list[str]) -> dict:
+    """
+    Decode push recordings into one frame per symbol. Quote rows set price and
+    prev_close, depth rows set best bid/ask; both are carried forward so every
+    row sees the latest state, as the live handler does. Pushes carry no
+    prev_close, see `_recording_prev_close`.
+    """
+    from src.monitor.recorder import QuoteReplayer
+
+    rows = {}
+    nan = float("nan")
+    for path in paths:
+        for kind, symbol, event, received_at in QuoteReplayer(path).events():
+            cols = rows.setdefault(symbol, ([], [], [], [], [], []))
+            cols[0].append(received_at)
+            if kind == "quote":
+                cols[1].append(event.last_done if event.last_done is not None else nan)
+                cols[2].append(event.prev_close if event.prev_close is not None else nan)
+                cols[3].append(nan)
+                cols[4].append(nan)
+                cols[5].append(True)
+            else:
+                cols[1].append(nan)
+                cols[2].append(nan)
+                cols[3].append(event.bids[0].price if event.bids else nan)
+                cols[4].append(event.asks[0].price if event.asks else nan)
+                cols[5].append(False)
+
+    frames = {}
+    for symbol, (t, price, prev_close, bid, ask, is_quote) in rows.items():
+        t = np.asarray(t)
+        order = np.argsort(t, kind="stable")
+        t = t[order]
+        price = _ffill(np.asarray(price)[order])
+        frames[symbol] = {
+            "time": t,
+            "price": price,
+            "prev_close": _recording_prev_close(t, price, np.asarray(prev_close)[order]),
+            "bid": _ffill(np.asarray(bid)[order]),
+            "ask": _ffill(np.asarray(ask)[order]),
+            "is_quote": np.asarray(is_quote)[order],
+        }
+    return frames
+
+def _forward_returns(t: np.ndarray, price: np.ndarray, horizon: float) -> np.ndarray:
+    """Return from each row to the first row at least `horizon` seconds later (NaN past the end)"""
+    j = np.searchsorted(t, t + horizon, side="left")
+    out = np.full(len(t), np.nan)
+    valid = j < len(t)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[valid] = price[j[valid]] / price[valid] - 1.0
+    return out
+
+def _edges(fire: np.ndarray) -> np.ndarray:
+    """Rows where a rule starts firing; a run of firing ticks counts as one signal"""
+    edges = fire.copy()
+    edges[1:] &= ~fire[:-1]
+    return edges
+
+class Backtester:
+    """
+    Run the PRICE_FLUCTUATION and SPREAD_NARROW rules of `Strategy` over stored
+    history as array operations.
+
+    Everything that does not depend on a threshold (change rate, spread, forward
+    returns per horizon) is computed once per symbol; evaluating a threshold is
+    then a comparison, an edge mask and a few reductions. For each rule:
+        ticks       rows on which the rule fires, as `Strategy.analyze` would
+        signals     starts of firing runs (what the coalescer would alert on)
+        hit_<h>s    PRICE_FLUCTUATION: share of signals whose return over h seconds
+                    has the sign of the move; SPREAD_NARROW: share where the price
+                    moved more than the spread at the signal
+        ret_<h>s    mean forward return in %, signed by the move's direction for
+                    PRICE_FLUCTUATION, absolute for SPREAD_NARROW
+    """
+
+    def __init__(self, frames: dict, horizons=DEFAULT_HORIZONS):
+        """
+        :param frames: symbol -> frame (see frame_from_bars / load_recording_frames)
+        :param horizons: Forward-return horizons in seconds
+        """
+        self.horizons = tuple(horizons)
+        self._price = {}
+        self._spread = {}
+        for symbol, frame in frames.items():
+            self._prepare(symbol, frame)
+
+    def _prepare(self, symbol: str, frame: dict):
+        t, price = frame["time"], frame["price"]
+        fwd = {h: _forward_returns(t, price, h) for h in self.horizons}
+
+        quote = frame["is_quote"] & (price > 0) & (frame["prev_close"] > 0)
+        change = (price[quote] - frame["prev_close"][quote]) / frame["prev_close"][quote] * 100
+        self._price[symbol] = (change, {h: r[quote] for h, r in fwd.items()})
+
+        # Spreads are judged on book updates, like the depth handler
+        depth = ~frame["is_quote"]
+        spread = frame["ask"][depth] - frame["bid"][depth]
+        valid = np.isfinite(spread) & (spread > 0) & (price[depth] > 0)
+        self._spread[symbol] = (spread[valid], price[depth][valid],
+                                {h: r[depth][valid] for h, r in fwd.items()})
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self._price)
+
+    def _accumulators(self) -> tuple[dict, dict, dict]:
+        """Per-horizon hit count, return sum and evaluated-signal count"""
+        return dict.fromkeys(self.horizons, 0), dict.fromkeys(self.horizons, 0.0), dict.fromkeys(self.horizons, 0)
+
+    def _stats(self, rule: str, threshold, ticks: int, signals: int, hits: dict, total: dict, count: dict) -> dict:
+        row = {"rule": rule, "threshold": threshold, "ticks": ticks, "signals": signals}
+        for h in self.horizons:
+            row[f"hit_{h}s"] = hits[h] / count[h] if count[h] else None
+            row[f"ret_{h}s"] = total[h] / count[h] * 100 if count[h] else None
+        return row
+
+    def price_rule(self, threshold=None) -> dict:
+        """
+        :param threshold: Change threshold in %; None uses each symbol's compiled rules
+        """
+        thresholds = self._rule_values("price_change", "price_on", threshold)
+        ticks = signals = 0
+        hits, total, count = self._accumulators()
+        for symbol, (change, fwd) in self._price.items():
+            limit = thresholds[symbol]
+            if limit is None:
+                continue
+            fire = np.abs(change) >= limit
+            start = _edges(fire)
+            ticks += int(fire.sum())
+            signals += int(start.sum())
+            direction = np.sign(change[start])
+            for h in self.horizons:
+                moved = direction * fwd[h][start]
+                moved = moved[np.isfinite(moved)]
+                hits[h] += int((moved > 0).sum())
+                total[h] += float(moved.sum())
+                count[h] += len(moved)
+        return self._stats("PRICE_FLUCTUATION", "rules" if threshold is None else threshold,
+                           ticks, signals, hits, total, count)
+
+    def spread_rule(self, threshold=None) -> dict:
+        """
+        :param threshold: Absolute spread threshold; None uses each symbol's compiled rules
+        """
+        thresholds = self._rule_values("spread", "spread_on", threshold)
+        ticks = signals = 0
+        hits, total, count = self._accumulators()
+        for symbol, (spread, price, fwd) in self._spread.items():
+            limit = thresholds[symbol]
+            if limit is None:
+                continue
+            fire = spread <= limit
+            start = _edges(fire)
+            ticks += int(fire.sum())
+            signals += int(start.sum())
+            # Did the price move more than the spread paid to enter?
+            cost = spread[start] / price[start]
+            for h in self.horizons:
+                moved = np.abs(fwd[h][start])
+                ok = np.isfinite(moved)
+                hits[h] += int((moved[ok] > cost[ok]).sum())
+                total[h] += float(moved[ok].sum())
+                count[h] += int(ok.sum())
+        return self._stats("SPREAD_NARROW", "rules" if threshold is None else threshold,
+                           ticks, signals, hits, total, count)
+
+    def _rule_values(self, key: str, flag: str, threshold) -> dict:
+        """symbol -> threshold; per-symbol compiled values (None if disabled) unless one is given"""
+        if threshold is not None:
+            return dict.fromkeys(self.symbols, float(threshold))
+        from src.analysis.rules import RuleTable
+        from config.settings import Settings
+
+        table = RuleTable(Settings.SYMBOLS_CONFIG, self.symbols)
+        values = {}
+        for symbol in self.symbols:
+            rules = table.get(symbol)
+            values[symbol] = getattr(rules, key) if getattr(rules, flag) else None
+        return values
+
+    def evaluate(self, rule: str, threshold=None) -> dict:
+        if rule == "PRICE_FLUCTUATION":
+            return self.price_rule(threshold)
+        if rule == "SPREAD_NARROW":
+            return self.spread_rule(threshold)
+        raise ValueError(f"Unsupported rule {rule}")
+
+# Per-process Backtester of a sweep (set once by the pool initializer)
+_worker = None
+
+def _init_worker(backtester: Backtester):
+    global _worker
+    _worker = backtester
+
+def _evaluate(task: tuple) -> dict:
+    return _worker.evaluate(*task)
+
+def sweep(frames: dict, price_grid=(), spread_grid=(), horizons=DEFAULT_HORIZONS, workers: int = None) -> list[dict]:
+    """
+    Evaluate threshold grids across a process pool.
+
+    The two rules are independent in `Strategy`, so each grid is swept on its own
+    (len(price_grid) + len(spread_grid) evaluations, not the product). The
+    precomputed Backtester is shipped to each worker once by the pool initializer;
+    tasks only carry (rule, threshold).
+    :param workers: Pool size (defaults to the CPU count; 1 runs in-process)
+    :return: One stats row per (rule, threshold), in grid order
+    """
+    backtester = Backtester(frames, horizons)
+    tasks = [("PRICE_FLUCTUATION", float(t)) for t in price_grid]
+    tasks += [("SPREAD_NARROW", float(t)) for t in spread_grid]
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        return [backtester.evaluate(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(backtester,)) as pool:
+        return list(pool.map(_evaluate, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+def parse_grid(spec: str) -> list[float]:
+    """'0.5,1,2' or 'start:stop:step' (stop inclusive) -> thresholds"""
+    if not spec:
+        return []
+    if ":" in spec:
+        start, stop, step = (float(x) for x in spec.split(":"))
+        return [round(v, 10) for v in np.arange(start, stop + step / 2, step)]
+    return [float(x) for x in spec.split(",") if x.strip()]
+
+def format_table(rows: list[dict]) -> str:
+    if not rows:
+        return "(no results)"
+    columns = list(rows[0])
+    cells = [[("-" if row[c] is None else f"{row[c]:.4g}" if isinstance(row[c], float) else str(row[c]))
+              for c in columns] for row in rows]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+    lines = ["  ".join(c.ljust(w) for c, w in zip(columns, widths))]
+    lines += ["  ".join(v.ljust(w) for v, w in zip(r, widths)) for r in cells]
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the price / spread rules over stored history")
+    parser.add_argument("--recording", nargs="*", default=[], help="Push recordings (quotes-YYYYMMDD.lbr)")
+    parser.add_argument("--bars", help="Glob of bar / history column files, e.g. 'data/history/1m/*/*.npz'")
+    parser.add_argument("--price-grid", default="", help="PRICE_CHANGE_THRESHOLD values: '1,2,3' or '0.5:5:0.5'")
+    parser.add_argument("--spread-grid", default="", help="SPREAD_THRESHOLD values: '0.01,0.05' or '0.01:0.1:0.01'")
+    parser.add_argument("--horizons", default=",".join(str(h) for h in DEFAULT_HORIZONS),
+                        help="Forward-return horizons in seconds")
+    parser.add_argument("--workers", type=int, default=None, help="Sweep processes (default: CPU count)")
+    parser.add_argument("--json", help="Also write the result rows to this file")
+    args = parser.parse_args()
+
+    from config.settings import Settings
+    Settings.load()
+
+    start = time.perf_counter()
+    frames = load_recording_frames(args.recording)
+    if args.bars:
+        frames.update(load_bar_frames(args.bars))
+    if not frames:
+        parser.error("no data: pass --recording and/or --bars")
+    rows_total = sum(len(f["time"]) for f in frames.values())
+    print(f"Loaded {rows_total} rows for {len(frames)} symbols in {time.perf_counter() - start:.2f}s")
+
+    horizons = [int(h) for h in args.horizons.split(",") if h.strip()]
+    price_grid, spread_grid = parse_grid(args.price_grid), parse_grid(args.spread_grid)
+    start = time.perf_counter()
+    if price_grid or spread_grid:
+        rows = sweep(frames, price_grid, spread_grid, horizons, args.workers)
+    else:
+        # No grid: score the thresholds currently configured in symbols.yaml / .env
+        backtester = Backtester(frames, horizons)
+        rows = [backtester.price_rule(), backtester.spread_rule()]
+    print(format_table(rows))
+    print(f"Evaluated {len(rows)} settings in {time.perf_counter() - start:.2f}s")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+if __name__ == "__main__":
+    main()
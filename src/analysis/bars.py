@@ -0,0 +1,137 @@
+import threading
+import numpy as np
+from src.utils.columnar import BAR_COLUMNS
+
+class BarAggregator:
+    """
+    Incremental OHLCV bars of one interval for all symbols.
+
+    The open bar of every symbol lives in preallocated per-slot arrays; a trade
+    updates its slot in O(1). A bar is completed when a trade for a later bucket
+    arrives or, for quiet symbols, by `close_due`. Completed bars are appended to
+    a preallocated row buffer (grown by doubling if it fills between drains)
+    that `drain` hands out as columns. Trades for a bucket older than the open
+    or last completed bar (late prints) are dropped and counted in `late_trades`:
+    they belong to neither bar, and a completed bar is never reopened.
+    """
+
+    def __init__(self, interval: int, capacity: int = 1024, buffer_size: int = 4096):
+        """
+        :param interval: Bar length in seconds
+        :param capacity: Initial number of symbol slots
+        :param buffer_size: Initial completed-bar buffer rows
+        """
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._slots = {}
+        self.symbols = []
+        self._alloc_open(capacity)
+        self._alloc_done(buffer_size)
+        self._n = 0
+        self.late_trades = 0
+
+    def _alloc_open(self, capacity: int):
+        self.start = np.full(capacity, -1, dtype=np.int64)
+        self.open = np.zeros(capacity)
+        self.high = np.zeros(capacity)
+        self.low = np.zeros(capacity)
+        self.close = np.zeros(capacity)
+        self.volume = np.zeros(capacity, dtype=np.int64)
+        self.turnover = np.zeros(capacity)
+        # Start of the last completed bar
+        self.closed = np.full(capacity, -1, dtype=np.int64)
+
+    def _alloc_done(self, rows: int):
+        self._done = {name: np.zeros(rows, dtype=np.int64 if name in ("start", "volume") else np.float64)
+                      for name in BAR_COLUMNS}
+        self._done_slot = np.zeros(rows, dtype=np.int32)
+
+    @staticmethod
+    def _grown(arr: np.ndarray, size: int, fill=0) -> np.ndarray:
+        new = np.full(size, fill, dtype=arr.dtype)
+        new[:len(arr)] = arr
+        return new
+
+    def slot(self, symbol: str) -> int:
+        idx = self._slots.get(symbol)
+        if idx is None:
+            idx = len(self.symbols)
+            if idx >= len(self.start):
+                size = len(self.start) * 2
+                self.start = self._grown(self.start, size, -1)
+                self.closed = self._grown(self.closed, size, -1)
+                for name in ("open", "high", "low", "close", "volume", "turnover"):
+                    setattr(self, name, self._grown(getattr(self, name), size))
+            self._slots[symbol] = idx
+            self.symbols.append(symbol)
+        return idx
+
+    def update(self, symbol: str, ts: float, price: float, volume: int):
+        """Fold one trade into its symbol's open bar; O(1)"""
+        bucket = int(ts // self.interval) * self.interval
+        with self._lock:
+            idx = self.slot(symbol)
+            current = self.start[idx]
+            if current == bucket:
+                if price > self.high[idx]:
+                    self.high[idx] = price
+                elif price < self.low[idx]:
+                    self.low[idx] = price
+                self.close[idx] = price
+                self.volume[idx] += volume
+                self.turnover[idx] += price * volume
+                return
+            if current > bucket or (current < 0 and bucket <= self.closed[idx]):
+                self.late_trades += 1
+                return
+            if current >= 0:
+                self._complete(idx)
+            self.start[idx] = bucket
+            self.open[idx] = self.high[idx] = self.low[idx] = self.close[idx] = price
+            self.volume[idx] = volume
+            self.turnover[idx] = price * volume
+
+    def _complete(self, idx: int):
+        n = self._n
+        if n >= len(self._done_slot):
+            size = len(self._done_slot) * 2
+            self._done = {name: self._grown(col, size) for name, col in self._done.items()}
+            self._done_slot = self._grown(self._done_slot, size)
+        self._done_slot[n] = idx
+        self._done["start"][n] = self.start[idx]
+        self._done["open"][n] = self.open[idx]
+        self._done["high"][n] = self.high[idx]
+        self._done["low"][n] = self.low[idx]
+        self._done["close"][n] = self.close[idx]
+        self._done["volume"][n] = self.volume[idx]
+        self._done["turnover"][n] = self.turnover[idx]
+        self._n = n + 1
+        self.closed[idx] = self.start[idx]
+        self.start[idx] = -1
+
+    def close_due(self, now: float, grace: float = 0.0) -> int:
+        """Complete open bars whose interval ended more than `grace` seconds before `now`"""
+        with self._lock:
+            due = np.flatnonzero((self.start >= 0) & (self.start + self.interval + grace <= now))
+            for idx in due:
+                self._complete(int(idx))
+            return len(due)
+
+    def close_all(self) -> int:
+        with self._lock:
+            due = np.flatnonzero(self.start >= 0)
+            for idx in due:
+                self._complete(int(idx))
+            return len(due)
+
+    def drain(self) -> tuple[list[str], dict]:
+        """
+        Take the completed bars.
+        :return: (symbol per row, column name -> array copy)
+        """
+        with self._lock:
+            n = self._n
+            self._n = 0
+            symbols = [self.symbols[i] for i in self._done_slot[:n]]
+            columns = {name: col[:n].copy() for name, col in self._done.items()}
+        return symbols, columns
@@ -0,0 +1,170 @@
+from datetime import datetime
+import logging
+import numpy as np
+from src.analysis.rules import RuleBook
+from src.analysis.strategy import StrategySignal
+
+logger = logging.getLogger(__name__)
+
+class BatchStrategy:
+    """
+    Vectorized counterpart of `Strategy.analyze` for micro-batches of quotes.
+
+    Per-symbol state lives in NumPy columns indexed by a symbol slot (last,
+    prev_close, best bid/ask). A batch is decoded once into row arrays, every
+    rule is evaluated as a single array expression, and `StrategySignal`
+    objects are built only for the rows that fired, with one clock read per
+    batch. Quotes that omit prev_close (push quotes do) fall back to the
+    value already held in the symbol's slot, see `seed`.
+
+    Per-symbol thresholds from the RuleBook are copied into threshold columns
+    (a disabled rule gets a threshold that can never fire) and re-copied only
+    when the book swaps in a new table.
+    """
+
+    def __init__(self, capacity: int = 1024, rules: RuleBook = None):
+        self.rules = rules or RuleBook()
+        self._table = self.rules.table
+
+        self._slots = {}
+        self._symbols = []
+        self.last = np.full(capacity, np.nan)
+        self.prev_close = np.full(capacity, np.nan)
+        self.bid = np.full(capacity, np.nan)
+        self.ask = np.full(capacity, np.nan)
+        self.price_threshold = np.full(capacity, np.inf)
+        self.spread_threshold = np.full(capacity, -np.inf)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.last)
+
+    def slot(self, symbol: str) -> int:
+        """Return the column index for symbol, allocating one if needed"""
+        idx = self._slots.get(symbol)
+        if idx is None:
+            idx = len(self._symbols)
+            if idx >= self.capacity:
+                self._grow(self.capacity * 2)
+            self._slots[symbol] = idx
+            self._symbols.append(symbol)
+            self._set_thresholds(idx, self._table.get(symbol))
+        return idx
+
+    def _set_thresholds(self, idx: int, rules):
+        self.price_threshold[idx] = rules.price_change if rules.price_on else np.inf
+        self.spread_threshold[idx] = rules.spread if rules.spread_on else -np.inf
+
+    def _refresh_thresholds(self, table):
+        """Re-copy every slot's thresholds after the RuleBook swapped tables"""
+        self._table = table
+        for idx, symbol in enumerate(self._symbols):
+            self._set_thresholds(idx, table.get(symbol))
+
+    def _grow(self, capacity: int):
+        for name, fill in (("last", np.nan), ("prev_close", np.nan), ("bid", np.nan), ("ask", np.nan),
+                           ("price_threshold", np.inf), ("spread_threshold", -np.inf)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def seed(self, symbol: str, prev_close: float):
+        """Store a reference close for symbols whose pushes do not carry one"""
+        self.prev_close[self.slot(symbol)] = float(prev_close)
+
+    def analyze_batch(self, quotes: list, symbols: list[str] = None) -> list[StrategySignal]:
+        """
+        Analyze a micro-batch of quotes.
+        :param quotes: Quote objects, in arrival order
+        :param symbols: Optional symbols aligned with quotes (defaults to quote.symbol)
+        :return: Signals in the same order `Strategy.analyze` would emit them quote by quote
+        """
+        n = len(quotes)
+        if n == 0:
+            return []
+        if self.rules.table is not self._table:
+            self._refresh_thresholds(self.rules.table)
+
+        names = []
+        slots = np.empty(n, dtype=np.intp)
+        last = np.zeros(n)
+        prev = np.zeros(n)
+        bid = np.full(n, np.nan)
+        ask = np.full(n, np.nan)
+
+        # Decode: the only per-quote Python work left
+        for i, quote in enumerate(quotes):
+            symbol = symbols[i] if symbols is not None else getattr(quote, 'symbol', 'UNKNOWN')
+            names.append(symbol)
+            slots[i] = self.slot(symbol)
+            try:
+                last[i] = float(getattr(quote, 'last_done', 0) or 0)
+                prev[i] = float(getattr(quote, 'prev_close', 0) or 0)
+            except Exception:
+                last[i] = prev[i] = 0.0
+                continue
+
+            bid_price = getattr(quote, 'bid_price', [])
+            ask_price = getattr(quote, 'ask_price', [])
+            if bid_price and ask_price and len(bid_price) > 0 and len(ask_price) > 0:
+                try:
+                    bid[i] = float(bid_price[0])
+                    ask[i] = float(ask_price[0])
+                except Exception:
+                    bid[i] = ask[i] = np.nan
+
+        # Missing prev_close: use the slot's stored reference close
+        missing_prev = prev <= 0
+        if missing_prev.any():
+            stored = self.prev_close[slots[missing_prev]]
+            prev[missing_prev] = np.where(np.isnan(stored), 0.0, stored)
+
+        # Evaluate every rule over the whole batch
+        valid = (last > 0) & (prev > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change_rate = ((last - prev) / prev) * 100
+        price_threshold = self.price_threshold[slots]
+        spread_threshold = self.spread_threshold[slots]
+        price_hit = valid & (np.abs(change_rate) >= price_threshold)
+
+        spread = ask - bid
+        with np.errstate(invalid='ignore'):
+            spread_hit = valid & (spread > 0) & (spread <= spread_threshold)
+
+        # Scatter the batch into per-symbol state (later rows win for repeated symbols)
+        self.last[slots[valid]] = last[valid]
+        self.prev_close[slots[valid]] = prev[valid]
+        has_book = ~np.isnan(bid)
+        self.bid[slots[has_book]] = bid[has_book]
+        self.ask[slots[has_book]] = ask[has_book]
+
+        signals = []
+        hits = np.flatnonzero(price_hit | spread_hit)
+        if len(hits) == 0:
+            return signals
+
+        now = datetime.now()
+        for i in hits:
+            last_done = float(last[i])
+            if price_hit[i]:
+                rate = float(change_rate[i])
+                signals.append(StrategySignal(
+                    symbol=names[i],
+                    signal_type="PRICE_FLUCTUATION",
+                    price=last_done,
+                    timestamp=now,
+                    details=f"Price: {last_done}, Change: {rate:.2f}% (Threshold: {float(price_threshold[i])}%)",
+                    value=rate
+                ))
+            if spread_hit[i]:
+                s, best_bid, best_ask = float(spread[i]), float(bid[i]), float(ask[i])
+                signals.append(StrategySignal(
+                    symbol=names[i],
+                    signal_type="SPREAD_NARROW",
+                    price=last_done,
+                    timestamp=now,
+                    details=f"Spread: {s:.2f} (Bid: {best_bid}, Ask: {best_ask}) <= Threshold: {float(spread_threshold[i])}",
+                    value=s
+                ))
+        return signals
@@ -0,0 +1,182 @@
+import threading
+import time
+import logging
+from config.settings import Settings
+from src.analysis.strategy import StrategySignal
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Signal types where a *smaller* value is the stronger signal
+_INVERTED_SIGNALS = {"SPREAD_NARROW"}
+
+class _AlertState:
+    """Per (symbol, signal_type) dedup state, resolved once on first sight"""
+    __slots__ = ("cooldown", "step", "last_sent", "last_magnitude", "suppressed")
+
+    def __init__(self, cooldown: float, step: float):
+        self.cooldown = cooldown
+        self.step = step
+        self.last_sent = None
+        self.last_magnitude = 0.0
+        self.suppressed = 0
+
+class AlertCoalescer:
+    """
+    Deduplication stage between Strategy and the alert sink.
+
+    - Cooldown: a (symbol, signal_type) pair alerts at most once per cooldown window.
+    - Escalation: inside the cooldown it re-alerts only if the signal strength moved
+      at least `escalation_step` past the last alerted value.
+    - Digest: signals admitted within one digest window are sent as a single message.
+
+    State is one `_AlertState` per (symbol, signal_type) plus at most one pending
+    signal per pair, so memory is bounded by the symbol universe, not tick count.
+    """
+
+    def __init__(self, sink, config: dict = None, clock=None):
+        """
+        :param sink: Callable(title, content, origin=epoch_seconds) receiving the final alerts (e.g. AlertNotifier.submit)
+        :param config: `alerts` section of symbols.yaml; defaults to Settings.SYMBOLS_CONFIG
+        :param clock: Monotonic time source for cooldowns (replays pass recorded time)
+        """
+        if config is None:
+            config = Settings.SYMBOLS_CONFIG.get('alerts') or {}
+
+        self.sink = sink
+        self._clock = clock or time.monotonic
+        self.digest_window = float(config.get('digest_window', Settings.ALERT_DIGEST_WINDOW))
+        self._defaults = {
+            'cooldown': float(config.get('cooldown', Settings.ALERT_COOLDOWN)),
+            'escalation_step': float(config.get('escalation_step', Settings.ALERT_ESCALATION_STEP)),
+        }
+        self._type_overrides = config.get('signal_types') or {}
+        self._symbol_overrides = config.get('symbols') or {}
+
+        self._states = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._stats = {"offered": 0, "suppressed": 0, "escalated": 0, "alerts": 0, "digests": 0}
+
+    def _new_state(self, symbol: str, signal_type: str) -> _AlertState:
+        rule = dict(self._defaults)
+        rule.update(self._type_overrides.get(signal_type) or {})
+        rule.update(self._symbol_overrides.get(symbol) or {})
+        return _AlertState(float(rule['cooldown']), float(rule['escalation_step']))
+
+    @staticmethod
+    def _magnitude(sig: StrategySignal) -> float:
+        if sig.signal_type in _INVERTED_SIGNALS:
+            return -sig.value
+        return abs(sig.value)
+
+    def offer(self, sig: StrategySignal, now: float = None) -> bool:
+        """
+        Feed one signal through the dedup stage.
+        :return: True if the signal was admitted for delivery
+        """
+        if now is None:
+            now = self._clock()
+        key = (sig.symbol, sig.signal_type)
+        magnitude = self._magnitude(sig)
+
+        with self._lock:
+            self._stats["offered"] += 1
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = self._new_state(sig.symbol, sig.signal_type)
+
+            if state.last_sent is not None and now - state.last_sent < state.cooldown:
+                if magnitude - state.last_magnitude < state.step:
+                    state.suppressed += 1
+                    self._stats["suppressed"] += 1
+                    return False
+                self._stats["escalated"] += 1
+
+            state.last_sent = now
+            state.last_magnitude = magnitude
+            # Latest signal wins if the pair is admitted twice in one window
+            self._pending[key] = sig
+
+        if self.digest_window <= 0:
+            self.flush()
+        elif self._thread is None:
+            self.start()
+        return True
+
+    def flush(self):
+        """Deliver everything admitted since the last flush"""
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            suppressed = {}
+            for key in pending:
+                state = self._states[key]
+                suppressed[key], state.suppressed = state.suppressed, 0
+
+        signals = list(pending.values())
+        # Analysis done -> alert enqueued (includes the intentional digest delay)
+        now = time.time()
+        origin = now
+        for sig in signals:
+            created = sig.timestamp.timestamp()
+            origin = min(origin, created)
+            metrics.observe("alert_enqueue_latency_ms", (now - created) * 1000)
+
+        if len(signals) == 1:
+            sig = signals[0]
+            title = f"Strategy Signal: {sig.signal_type} - {sig.symbol}"
+            content = self._format_signal(sig, suppressed[(sig.symbol, sig.signal_type)])
+            with self._lock:
+                self._stats["alerts"] += 1
+        else:
+            title = f"Strategy Digest: {len(signals)} signals"
+            content = "\n\n".join(
+                f"[{sig.signal_type}] {sig.symbol}\n"
+                + self._format_signal(sig, suppressed[(sig.symbol, sig.signal_type)])
+                for sig in signals
+            )
+            with self._lock:
+                self._stats["digests"] += 1
+
+        try:
+            self.sink(title, content, origin=origin)
+        except Exception as e:
+            logger.error(f"Failed to hand off alert: {e}")
+
+    @staticmethod
+    def _format_signal(sig: StrategySignal, suppressed: int) -> str:
+        content = f"Price: {sig.price}\nTime: {sig.timestamp}\nDetails: {sig.details}"
+        if suppressed:
+            content += f"\nSuppressed repeats: {suppressed}"
+        return content
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["tracked_pairs"] = len(self._states)
+            snapshot["pending"] = len(self._pending)
+        return snapshot
+
+    def start(self):
+        """Start the periodic digest flusher (no-op when digest_window <= 0)"""
+        if self.digest_window <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="alert-coalescer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flusher and deliver whatever is still pending"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.digest_window + 1)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop_event.wait(self.digest_window):
+            self.flush()
@@ -0,0 +1,185 @@
+import math
+import time
+from datetime import datetime
+import numpy as np
+from config.settings import Settings
+
+class RollingWindow:
+    """
+    Fixed-capacity time window over one symbol's ticks.
+
+    Ticks live in preallocated ring buffers; every aggregate is maintained
+    incrementally so `update` is O(1) amortized and reads are O(1):
+    - windowed return: last price vs. the oldest tick still in the window
+    - rolling high/low: monotonic deques stored as rings of tick sequence numbers
+    - VWAP: running sums of price*volume and volume
+    - realized volatility: running sum of squared log returns between adjacent ticks
+
+    If more than `capacity` ticks arrive within `window_seconds`, the oldest ones
+    are evicted early, so memory per symbol is always 48 * capacity bytes.
+    """
+    __slots__ = (
+        "capacity", "window_seconds",
+        "_ts", "_price", "_volume", "_logret", "_max_q", "_min_q",
+        "_head", "_tail", "_max_head", "_max_tail", "_min_head", "_min_tail",
+        "_pv_sum", "_vol_sum", "_r2_sum", "_last_cum_volume",
+    )
+
+    def __init__(self, capacity: int, window_seconds: float):
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self._ts = np.zeros(capacity)
+        self._price = np.zeros(capacity)
+        self._volume = np.zeros(capacity)
+        self._logret = np.zeros(capacity)
+        self._max_q = np.zeros(capacity, dtype=np.int64)
+        self._min_q = np.zeros(capacity, dtype=np.int64)
+        # Monotonic sequence numbers; ring index is seq % capacity
+        self._head = 0  # next tick to write
+        self._tail = 0  # oldest tick inside the window
+        self._max_head = self._max_tail = 0
+        self._min_head = self._min_tail = 0
+        self._pv_sum = 0.0
+        self._vol_sum = 0.0
+        self._r2_sum = 0.0
+        self._last_cum_volume = None
+
+    def __len__(self) -> int:
+        return self._head - self._tail
+
+    def update(self, ts: float, price: float, volume: float = 0.0):
+        """
+        Append one tick and slide the window.
+        :param ts: Tick time in epoch seconds
+        :param price: Trade/last price (> 0)
+        :param volume: Volume traded since the previous tick
+        """
+        cap = self.capacity
+        if self._head - self._tail == cap:
+            self._evict()
+
+        i = self._head % cap
+        self._ts[i] = ts
+        self._price[i] = price
+        self._volume[i] = volume
+        if self._head > self._tail:
+            prev_price = self._price[(self._head - 1) % cap]
+            r = math.log(price / prev_price) if prev_price > 0 else 0.0
+            self._logret[i] = r
+            self._r2_sum += r * r
+        else:
+            self._logret[i] = 0.0
+        self._pv_sum += price * volume
+        self._vol_sum += volume
+
+        # Rolling max: drop smaller prices from the back, then push
+        while self._max_head > self._max_tail and self._price[self._max_q[(self._max_head - 1) % cap] % cap] <= price:
+            self._max_head -= 1
+        self._max_q[self._max_head % cap] = self._head
+        self._max_head += 1
+        # Rolling min
+        while self._min_head > self._min_tail and self._price[self._min_q[(self._min_head - 1) % cap] % cap] >= price:
+            self._min_head -= 1
+        self._min_q[self._min_head % cap] = self._head
+        self._min_head += 1
+
+        self._head += 1
+
+        cutoff = ts - self.window_seconds
+        while self._head - self._tail > 1 and self._ts[self._tail % cap] < cutoff:
+            self._evict()
+
+    def update_cumulative(self, ts: float, price: float, cum_volume: float):
+        """Like `update`, but takes the session's cumulative volume (as pushed by the SDK)"""
+        last = self._last_cum_volume
+        self._last_cum_volume = cum_volume
+        delta = cum_volume - last if last is not None and cum_volume >= last else 0.0
+        self.update(ts, price, delta)
+
+    def _evict(self):
+        cap = self.capacity
+        i = self._tail % cap
+        self._pv_sum -= self._price[i] * self._volume[i]
+        self._vol_sum -= self._volume[i]
+        self._tail += 1
+        # The return pairing the evicted tick with its successor leaves the window too
+        if self._tail < self._head:
+            r = self._logret[self._tail % cap]
+            self._r2_sum -= r * r
+        if self._max_head > self._max_tail and self._max_q[self._max_tail % cap] < self._tail:
+            self._max_tail += 1
+        if self._min_head > self._min_tail and self._min_q[self._min_tail % cap] < self._tail:
+            self._min_tail += 1
+
+    @property
+    def last(self) -> float:
+        if self._head == self._tail:
+            return math.nan
+        return float(self._price[(self._head - 1) % self.capacity])
+
+    @property
+    def span_seconds(self) -> float:
+        """Time covered by the ticks currently in the window"""
+        if self._head - self._tail < 2:
+            return 0.0
+        cap = self.capacity
+        return float(self._ts[(self._head - 1) % cap] - self._ts[self._tail % cap])
+
+    def window_return(self) -> float:
+        """Percent change from the oldest tick in the window to the latest"""
+        if self._head - self._tail < 2:
+            return 0.0
+        first = self._price[self._tail % self.capacity]
+        return float((self.last - first) / first * 100) if first > 0 else 0.0
+
+    def high(self) -> float:
+        if self._max_head == self._max_tail:
+            return math.nan
+        return float(self._price[self._max_q[self._max_tail % self.capacity] % self.capacity])
+
+    def low(self) -> float:
+        if self._min_head == self._min_tail:
+            return math.nan
+        return float(self._price[self._min_q[self._min_tail % self.capacity] % self.capacity])
+
+    def vwap(self) -> float:
+        return self._pv_sum / self._vol_sum if self._vol_sum > 0 else math.nan
+
+    def realized_volatility(self) -> float:
+        """sqrt of the summed squared log returns in the window (not annualized)"""
+        return math.sqrt(max(self._r2_sum, 0.0))
+
+class IndicatorStore:
+    """Per-symbol `RollingWindow` registry, preallocated on first sight of a symbol"""
+
+    def __init__(self, window_seconds: float = None, capacity: int = None):
+        self.window_seconds = window_seconds or Settings.INSTANT_WINDOW_SECONDS
+        self.capacity = capacity or Settings.INDICATOR_CAPACITY
+        self._windows = {}
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def get(self, symbol: str) -> RollingWindow:
+        return self._windows.get(symbol)
+
+    def window(self, symbol: str) -> RollingWindow:
+        win = self._windows.get(symbol)
+        if win is None:
+            win = self._windows[symbol] = RollingWindow(self.capacity, self.window_seconds)
+        return win
+
+    def update_from_quote(self, symbol: str, quote, last_done: float) -> RollingWindow:
+        """Feed a quote push (timestamp + cumulative volume) into the symbol's window"""
+        ts = getattr(quote, 'timestamp', None)
+        if isinstance(ts, datetime):
+            ts = ts.timestamp()
+        elif not isinstance(ts, (int, float)) or ts <= 0:
+            ts = time.time()
+        volume = getattr(quote, 'volume', None)
+        win = self.window(symbol)
+        if isinstance(volume, (int, float)):
+            win.update_cumulative(ts, last_done, float(volume))
+        else:
+            win.update(ts, last_done, 0.0)
+        return win
@@ -0,0 +1,122 @@
+import math
+import time
+import numpy as np
+from config.settings import Settings
+
+class OrderBookStore:
+    """
+    Level-2 books for all subscribed symbols in preallocated arrays.
+
+    Prices and volumes are stored as (symbol slot, level) matrices; a depth
+    push overwrites its symbol's rows in place, so steady-state updates
+    allocate no arrays. Empty levels hold 0.
+    """
+
+    def __init__(self, levels: int = None, capacity: int = 1024):
+        self.levels = levels or Settings.DEPTH_LEVELS
+        self._slots = {}
+        self._alloc(capacity)
+
+    def _alloc(self, capacity: int):
+        shape = (capacity, self.levels)
+        self.bid_price = np.zeros(shape)
+        self.bid_volume = np.zeros(shape)
+        self.ask_price = np.zeros(shape)
+        self.ask_volume = np.zeros(shape)
+        # time.monotonic() of the last depth push per slot (0 = never)
+        self.updated_at = np.zeros(capacity)
+
+    @property
+    def capacity(self) -> int:
+        return self.bid_price.shape[0]
+
+    def slot(self, symbol: str) -> int:
+        """Return the row index for symbol, allocating one if needed"""
+        idx = self._slots.get(symbol)
+        if idx is None:
+            idx = len(self._slots)
+            if idx >= self.capacity:
+                self._grow(self.capacity * 2)
+            self._slots[symbol] = idx
+        return idx
+
+    def _grow(self, capacity: int):
+        old = (self.bid_price, self.bid_volume, self.ask_price, self.ask_volume, self.updated_at)
+        self._alloc(capacity)
+        for new, prev in zip((self.bid_price, self.bid_volume, self.ask_price, self.ask_volume, self.updated_at), old):
+            new[:prev.shape[0]] = prev
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._slots
+
+    def index(self, symbol: str):
+        """Slot of symbol, or None if no depth has been seen (never allocates)"""
+        return self._slots.get(symbol)
+
+    def age(self, idx: int) -> float:
+        """Seconds since the last depth push for the slot"""
+        return time.monotonic() - float(self.updated_at[idx])
+
+    def apply(self, symbol: str, event) -> int:
+        """
+        Apply a depth push (`bids`/`asks` lists of levels with position, price, volume).
+        :return: Slot of the updated book
+        """
+        idx = self.slot(symbol)
+        self._write(self.bid_price[idx], self.bid_volume[idx], getattr(event, 'bids', None) or [])
+        self._write(self.ask_price[idx], self.ask_volume[idx], getattr(event, 'asks', None) or [])
+        self.updated_at[idx] = time.monotonic()
+        return idx
+
+    def _write(self, prices, volumes, levels):
+        depth = self.levels
+        filled = 0
+        for i, level in enumerate(levels):
+            # position is 1-based in LongPort depth pushes
+            pos = (getattr(level, 'position', 0) or i + 1) - 1
+            if not 0 <= pos < depth:
+                continue
+            prices[pos] = float(level.price or 0)
+            volumes[pos] = float(level.volume or 0)
+            filled = max(filled, pos + 1)
+        if filled < depth:
+            prices[filled:] = 0.0
+            volumes[filled:] = 0.0
+
+    def best_bid(self, idx: int) -> float:
+        return float(self.bid_price[idx, 0])
+
+    def best_ask(self, idx: int) -> float:
+        return float(self.ask_price[idx, 0])
+
+    def mid(self, idx: int) -> float:
+        bid, ask = self.bid_price[idx, 0], self.ask_price[idx, 0]
+        if bid <= 0 or ask <= 0:
+            return math.nan
+        return float((bid + ask) / 2)
+
+    def spread_pct(self, idx: int) -> float:
+        """Best ask minus best bid as a percentage of mid"""
+        mid = self.mid(idx)
+        if math.isnan(mid):
+            return math.nan
+        return float((self.ask_price[idx, 0] - self.bid_price[idx, 0]) / mid * 100)
+
+    def imbalance(self, idx: int, levels: int = None) -> float:
+        """(bid volume - ask volume) / total over the top N levels, in [-1, 1]"""
+        n = levels or self.levels
+        bid = self.bid_volume[idx, :n].sum()
+        ask = self.ask_volume[idx, :n].sum()
+        total = bid + ask
+        return float((bid - ask) / total) if total > 0 else 0.0
+
+    def snapshot(self, idx: int, levels: int = 5) -> str:
+        """Compact text depth snapshot for alert content"""
+        rows = []
+        for i in range(min(levels, self.levels)):
+            bp, bv = self.bid_price[idx, i], self.bid_volume[idx, i]
+            ap, av = self.ask_price[idx, i], self.ask_volume[idx, i]
+            if bp <= 0 and ap <= 0:
+                break
+            rows.append(f"L{i + 1} Bid {bp:g} x {bv:g} | Ask {ap:g} x {av:g}")
+        return "\n".join(rows)
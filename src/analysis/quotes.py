@@ -0,0 +1,90 @@
+import time
+
+def _float(value) -> float:
+    try:
+        return float(value) if value is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+class LatestQuote:
+    """Last known quote of one symbol; never mutated once published to the store"""
+    __slots__ = ("symbol", "last_done", "open", "high", "low", "prev_close",
+                 "volume", "turnover", "timestamp", "updated_at")
+
+    def __repr__(self):
+        return f"LatestQuote(symbol={self.symbol}, last_done={self.last_done}, prev_close={self.prev_close})"
+
+class QuoteStore:
+    """
+    In-process latest quote per symbol, fed by the push stream (and by every snapshot pull).
+
+    An update builds a new `LatestQuote` and swaps it into the dict in one
+    assignment, so readers on other threads always see a consistent record.
+    Push quotes carry no prev_close; the previous record's value is carried over.
+    `updated_at` is time.monotonic() of the update, used for freshness checks.
+    """
+
+    def __init__(self, clock=None):
+        self._clock = clock or time.monotonic
+        self._quotes = {}
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._quotes
+
+    def update(self, symbol: str, event) -> LatestQuote:
+        """Record a quote push / snapshot; O(1)"""
+        prev = self._quotes.get(symbol)
+        rec = LatestQuote()
+        rec.symbol = symbol
+        rec.last_done = _float(getattr(event, 'last_done', None))
+        rec.open = _float(getattr(event, 'open', None))
+        rec.high = _float(getattr(event, 'high', None))
+        rec.low = _float(getattr(event, 'low', None))
+        rec.prev_close = _float(getattr(event, 'prev_close', None))
+        if rec.prev_close <= 0 and prev is not None:
+            rec.prev_close = prev.prev_close
+        volume = getattr(event, 'volume', 0)
+        rec.volume = int(volume) if isinstance(volume, (int, float)) else 0
+        rec.turnover = _float(getattr(event, 'turnover', None))
+        rec.timestamp = getattr(event, 'timestamp', None)
+        rec.updated_at = self._clock()
+        self._quotes[symbol] = rec
+        return rec
+
+    def update_many(self, items: list):
+        """Record [(symbol, quote)] pairs"""
+        for symbol, event in items:
+            self.update(symbol, event)
+
+    def get(self, symbol: str):
+        return self._quotes.get(symbol)
+
+    def age(self, symbol: str) -> float:
+        """Seconds since the symbol's last update (inf if never seen)"""
+        rec = self._quotes.get(symbol)
+        return self._clock() - rec.updated_at if rec is not None else float('inf')
+
+    def fresh(self, symbols: list[str], max_age: float) -> tuple[dict, list[str]]:
+        """
+        Split symbols into usable cached records and the rest.
+        A record is usable when it is at most max_age seconds old and has a price and prev_close.
+        :return: (symbol -> LatestQuote, symbols to fetch from the API)
+        """
+        now = self._clock()
+        found, missing = {}, []
+        for symbol in symbols:
+            rec = self._quotes.get(symbol)
+            if rec is not None and now - rec.updated_at <= max_age and rec.last_done > 0 and rec.prev_close > 0:
+                found[symbol] = rec
+            else:
+                missing.append(symbol)
+        return found, missing
+
+    def clear(self):
+        self._quotes = {}
+
+# Global store shared by the push path and pull callers
+quote_store = QuoteStore()
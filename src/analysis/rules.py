@@ -0,0 +1,193 @@
+import asyncio
+import os
+import re
+import time
+import logging
+import yaml
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_TYPES = ("PRICE_FLUCTUATION", "SPREAD_NARROW", "INSTANT_MOVE", "ORDER_IMBALANCE")
+
+# symbols.yaml key -> Settings default
+_DEFAULTS = {
+    "price_change": "PRICE_CHANGE_THRESHOLD",
+    "spread": "SPREAD_THRESHOLD",
+    "instant_move": "INSTANT_MOVE_THRESHOLD",
+    "spread_pct": "SPREAD_PCT_THRESHOLD",
+    "imbalance": "IMBALANCE_THRESHOLD",
+    "imbalance_levels": "IMBALANCE_LEVELS",
+}
+_SELECTORS = {"pattern", "symbols", "enabled", "disabled"}
+
+class RuleSet:
+    """Thresholds and enabled rules of one symbol, resolved once; read on every tick"""
+    __slots__ = ("price_change", "spread", "instant_move", "spread_pct", "imbalance", "imbalance_levels",
+                 "price_on", "spread_on", "instant_on", "imbalance_on")
+
+    def __init__(self, values: dict, enabled: set):
+        self.price_change = float(values["price_change"])
+        self.spread = float(values["spread"])
+        self.instant_move = float(values["instant_move"])
+        self.spread_pct = float(values["spread_pct"])
+        self.imbalance = float(values["imbalance"])
+        self.imbalance_levels = int(values["imbalance_levels"])
+        self.price_on = "PRICE_FLUCTUATION" in enabled
+        self.spread_on = "SPREAD_NARROW" in enabled
+        self.instant_on = "INSTANT_MOVE" in enabled
+        self.imbalance_on = "ORDER_IMBALANCE" in enabled
+
+def _check_override(where: str, spec: dict, selectors: set):
+    if not isinstance(spec, dict):
+        raise ValueError(f"{where}: expected a mapping, got {type(spec).__name__}")
+    unknown = set(spec) - set(_DEFAULTS) - selectors
+    if unknown:
+        raise ValueError(f"{where}: unknown keys {sorted(unknown)}")
+    for key in ("enabled", "disabled"):
+        bad = set(spec.get(key) or []) - set(SIGNAL_TYPES)
+        if bad:
+            raise ValueError(f"{where}: unknown signal types {sorted(bad)}")
+
+class RuleTable:
+    """
+    Compiled symbol -> RuleSet dispatch table.
+
+    Layers, later wins: Settings defaults, `rules.default`, every matching entry
+    of `rules.classes` (by `pattern` regex or `symbols` list, in file order), then
+    `rules.symbols` (and the legacy `custom_thresholds`). Known symbols are resolved
+    at compile time; symbols first seen later are resolved on first use and memoized.
+    """
+
+    def __init__(self, config: dict = None, symbols=()):
+        config = config or {}
+        rules = config.get('rules') or {}
+        self._base = {key: getattr(Settings, name) for key, name in _DEFAULTS.items()}
+
+        self._default = dict(rules.get('default') or {})
+        _check_override("rules.default", self._default, {"enabled", "disabled"})
+
+        self._classes = []
+        for name, spec in (rules.get('classes') or {}).items():
+            _check_override(f"rules.classes.{name}", spec, _SELECTORS)
+            pattern = re.compile(spec['pattern']) if spec.get('pattern') else None
+            self._classes.append((pattern, frozenset(spec.get('symbols') or []), spec))
+
+        self._symbols = {}
+        for symbol, spec in (config.get('custom_thresholds') or {}).items():
+            self._symbols[symbol] = dict(spec)
+        for symbol, spec in (rules.get('symbols') or {}).items():
+            self._symbols.setdefault(symbol, {}).update(spec)
+        for symbol, spec in self._symbols.items():
+            _check_override(f"rules.symbols.{symbol}", spec, {"enabled", "disabled"})
+
+        self.default = self._compile(None)
+        self._table = {}
+        for symbol in list(symbols) + list(self._symbols):
+            self._table[symbol] = self._compile(symbol)
+
+    @staticmethod
+    def _apply(values: dict, enabled: set, spec: dict) -> set:
+        for key in _DEFAULTS:
+            if key in spec:
+                values[key] = spec[key]
+        if spec.get('enabled') is not None:
+            enabled = set(spec['enabled'])
+        return enabled - set(spec.get('disabled') or [])
+
+    def _compile(self, symbol) -> RuleSet:
+        values = dict(self._base)
+        enabled = self._apply(values, set(SIGNAL_TYPES), self._default)
+        if symbol is not None:
+            for pattern, members, spec in self._classes:
+                if symbol in members or (pattern is not None and pattern.search(symbol)):
+                    enabled = self._apply(values, enabled, spec)
+            if symbol in self._symbols:
+                enabled = self._apply(values, enabled, self._symbols[symbol])
+        return RuleSet(values, enabled)
+
+    def get(self, symbol: str) -> RuleSet:
+        rules = self._table.get(symbol)
+        if rules is None:
+            rules = self._table[symbol] = self._compile(symbol)
+        return rules
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+class RuleBook:
+    """
+    Holds the live RuleTable. `reload` compiles a new table from symbols.yaml and
+    swaps the reference in one assignment, so a tick sees either the old or the
+    new table, never a mix. Subscriptions are untouched.
+    """
+
+    def __init__(self, config: dict = None, path: str = None, interval: float = None, clock=None):
+        """
+        :param config: Parsed symbols.yaml (defaults to Settings.SYMBOLS_CONFIG)
+        :param path: File watched by `poll` (defaults to Settings.SYMBOLS_CONFIG_PATH)
+        :param interval: Seconds between file checks (0 = never reload)
+        """
+        self.path = path or Settings.SYMBOLS_CONFIG_PATH
+        self.interval = Settings.RULES_RELOAD_INTERVAL if interval is None else interval
+        self._clock = clock or time.monotonic
+        self.table = RuleTable(Settings.SYMBOLS_CONFIG if config is None else config, Settings.MONITOR_SYMBOLS)
+        self.version = 1
+        self._mtime = self._stat()
+        self._checked = self._clock()
+        self._task = None
+
+    def get(self, symbol: str) -> RuleSet:
+        return self.table.get(symbol)
+
+    def _stat(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def reload(self) -> bool:
+        """Re-read the file and swap in the new table; the old one stays on any error"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                config = yaml.safe_load(f) or {}
+            table = RuleTable(config, Settings.MONITOR_SYMBOLS)
+        except Exception as e:
+            logger.error(f"Rules not reloaded from {self.path}, keeping version {self.version}: {e}")
+            return False
+        self.table = table
+        self.version += 1
+        logger.info(f"Rules reloaded from {self.path} (version {self.version})")
+        return True
+
+    def poll(self) -> bool:
+        """Reload if the file changed; a no-op until `interval` has passed since the last check"""
+        if self.interval <= 0:
+            return False
+        now = self._clock()
+        if now - self._checked < self.interval:
+            return False
+        self._checked = now
+        mtime = self._stat()
+        if mtime is None or mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        return self.reload()
+
+    def start(self):
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._watch(), name="rules-watch")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await asyncio.to_thread(self.poll)
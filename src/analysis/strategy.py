@@ -1,27 +1,38 @@
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 from datetime import datetime
-from config.settings import Settings
-from longport.quote import Quote
+from src.analysis.rules import RuleBook
 import logging
 
+if TYPE_CHECKING:
+    # The SDK is only needed for the type; importing it at runtime slows startup
+    from longport.quote import Quote
+
 logger = logging.getLogger(__name__)
 
 @dataclass
 class StrategySignal:
     symbol: str
-    signal_type: str  # 'PRICE_FLUCTUATION' or 'SPREAD_NARROW'
+    signal_type: str  # 'PRICE_FLUCTUATION', 'SPREAD_NARROW', 'INSTANT_MOVE' or 'ORDER_IMBALANCE'
     price: float
     timestamp: datetime
     details: str
+    value: float = 0.0  # Rule metric: change rate (%) or spread, used for alert escalation
 
 class Strategy:
-    def __init__(self):
-        self.price_threshold = Settings.PRICE_CHANGE_THRESHOLD
-        self.spread_threshold = Settings.SPREAD_THRESHOLD
-        
-    def analyze(self, quote: Quote) -> list[StrategySignal]:
+    def __init__(self, indicators=None, rules: RuleBook = None):
+        """
+        :param indicators: Optional IndicatorStore; enables the INSTANT_MOVE rule
+        :param rules: RuleBook with per-symbol thresholds (defaults to one compiled from Settings)
+        """
+        self.rules = rules or RuleBook()
+        self.indicators = indicators
+
+    def analyze(self, quote: "Quote", symbol: str = None) -> list[StrategySignal]:
         signals = []
-        
+        if symbol is None:
+            symbol = getattr(quote, 'symbol', 'UNKNOWN')
+
         # Ensure we have necessary data
         # Note: Depending on SDK version, quote might handle attributes differently.
         # Assuming quote object has standard attributes or dictionary access.
@@ -32,42 +43,143 @@ class Strategy:
             # If quote is a dict or other format
             return signals
 
-        if last_done <= 0 or prev_close <= 0:
+        if last_done <= 0:
+            return signals
+
+        # One dict lookup; thresholds and enabled rules are precompiled per symbol
+        rules = self.rules.table.get(symbol)
+
+        # 0. Instantaneous move over the rolling window (push quotes carry no prev_close)
+        instant = self.check_instant_move(symbol, quote, last_done, rules)
+        if instant is not None:
+            signals.append(instant)
+
+        if prev_close <= 0:
             return signals
 
         try:
             # 1. Price Fluctuation Analysis
             change_rate = ((last_done - prev_close) / prev_close) * 100
-            if abs(change_rate) >= self.price_threshold:
+            if rules.price_on and abs(change_rate) >= rules.price_change:
                 signal = StrategySignal(
-                    symbol=getattr(quote, 'symbol', 'UNKNOWN'),
+                    symbol=symbol,
                     signal_type="PRICE_FLUCTUATION",
                     price=last_done,
                     timestamp=datetime.now(),
-                    details=f"Price: {last_done}, Change: {change_rate:.2f}% (Threshold: {self.price_threshold}%)"
+                    details=f"Price: {last_done}, Change: {change_rate:.2f}% (Threshold: {rules.price_change}%)",
+                    value=change_rate
                 )
                 signals.append(signal)
 
             # 2. Spread Analysis (if bid/ask available)
-            bid_price = getattr(quote, 'bid_price', [])
-            ask_price = getattr(quote, 'ask_price', [])
-            
+            bid_price = getattr(quote, 'bid_price', []) if rules.spread_on else None
+            ask_price = getattr(quote, 'ask_price', []) if rules.spread_on else None
+
             if bid_price and ask_price and len(bid_price) > 0 and len(ask_price) > 0:
                 best_bid = float(bid_price[0])
                 best_ask = float(ask_price[0])
                 spread = best_ask - best_bid
-                
-                if 0 < spread <= self.spread_threshold:
+
+                if 0 < spread <= rules.spread:
                     signal = StrategySignal(
-                        symbol=getattr(quote, 'symbol', 'UNKNOWN'),
+                        symbol=symbol,
                         signal_type="SPREAD_NARROW",
                         price=last_done,
                         timestamp=datetime.now(),
-                        details=f"Spread: {spread:.2f} (Bid: {best_bid}, Ask: {best_ask}) <= Threshold: {self.spread_threshold}"
+                        details=f"Spread: {spread:.2f} (Bid: {best_bid}, Ask: {best_ask}) <= Threshold: {rules.spread}",
+                        value=spread
                     )
                     signals.append(signal)
         except Exception as e:
-            logger.error(f"Error analyzing quote for {getattr(quote, 'symbol', 'UNKNOWN')}: {e}")
+            logger.error(f"Error analyzing quote for {symbol}: {e}")
+
+        return signals
+
+    def check_instant_move(self, symbol: str, quote, last_done: float = None, rules=None):
+        """
+        Feed the tick into the rolling window and evaluate the INSTANT_MOVE rule.
+        :param rules: The symbol's RuleSet (looked up when omitted)
+        :return: StrategySignal or None (always None without an IndicatorStore)
+        """
+        if self.indicators is None:
+            return None
+        if rules is None:
+            rules = self.rules.table.get(symbol)
+
+        try:
+            if last_done is None:
+                last_done = float(getattr(quote, 'last_done', 0) or 0)
+            if last_done <= 0:
+                return None
+
+            window = self.indicators.update_from_quote(symbol, quote, last_done)
+            move = window.window_return()
+            if rules.instant_on and abs(move) >= rules.instant_move:
+                return StrategySignal(
+                    symbol=symbol,
+                    signal_type="INSTANT_MOVE",
+                    price=last_done,
+                    timestamp=datetime.now(),
+                    details=(
+                        f"Price: {last_done}, Move: {move:.2f}% in {window.span_seconds:.0f}s "
+                        f"(Threshold: {rules.instant_move}%/{window.window_seconds:.0f}s, "
+                        f"High: {window.high()}, Low: {window.low()}, VWAP: {window.vwap():.4f})"
+                    ),
+                    value=move
+                )
+        except Exception as e:
+            logger.error(f"Error updating indicators for {symbol}: {e}")
+        return None
+
+    def analyze_depth(self, symbol: str, books, idx: int) -> list[StrategySignal]:
+        """
+        Analyze a symbol's level-2 book after a depth push.
+        :param books: OrderBookStore holding the book
+        :param idx: Slot of the symbol in books
+        """
+        signals = []
+        best_bid = books.best_bid(idx)
+        best_ask = books.best_ask(idx)
+        if best_bid <= 0 or best_ask <= 0:
+            return signals
+
+        try:
+            rules = self.rules.table.get(symbol)
+            mid = books.mid(idx)
+            spread = best_ask - best_bid
+            spread_pct = books.spread_pct(idx)
+
+            # 1. Spread Analysis from the top of book
+            if rules.spread_on and 0 < spread <= rules.spread:
+                signals.append(StrategySignal(
+                    symbol=symbol,
+                    signal_type="SPREAD_NARROW",
+                    price=mid,
+                    timestamp=datetime.now(),
+                    details=f"Spread: {spread:.2f} ({spread_pct:.3f}% of mid, Bid: {best_bid}, Ask: {best_ask}) <= Threshold: {rules.spread}",
+                    value=spread
+                ))
+
+            # 2. Order book imbalance, only meaningful when the book is liquid
+            if not rules.imbalance_on:
+                return signals
+            imbalance = books.imbalance(idx, rules.imbalance_levels)
+            if spread_pct <= rules.spread_pct and abs(imbalance) >= rules.imbalance:
+                side = "Bid" if imbalance > 0 else "Ask"
+                signals.append(StrategySignal(
+                    symbol=symbol,
+                    signal_type="ORDER_IMBALANCE",
+                    price=mid,
+                    timestamp=datetime.now(),
+                    details=(
+                        f"{side}-heavy book: imbalance {imbalance:+.2f} over top {rules.imbalance_levels} levels "
+                        f"(Threshold: {rules.imbalance}), Spread: {spread_pct:.3f}%\n"
+                        f"{books.snapshot(idx)}"
+                    ),
+                    value=imbalance
+                ))
+        except Exception as e:
+            logger.error(f"Error analyzing depth for {symbol}: {e}")
 
         return signals
 
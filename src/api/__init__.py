@@ -1,4 +1,9 @@
 from .notification import AlertManager
+from .notifier import AlertNotifier, alert_notifier
 from .trade import TradeManager
+from .execution import ExecutionEngine, PriceProtectionError, execution_engine
+from .order_tracker import OrderTracker, order_tracker
 
-__all__ = ['AlertManager', 'TradeManager']
+__all__ = ['AlertManager', 'AlertNotifier', 'alert_notifier', 'TradeManager',
+           'ExecutionEngine', 'PriceProtectionError', 'execution_engine',
+           'OrderTracker', 'order_tracker']
@@ -0,0 +1,183 @@
+import time
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from config.settings import Settings
+from src.api.longport.client import longport_client
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+class PriceProtectionError(ValueError):
+    """Order rejected locally by the price-protection rule"""
+
+@dataclass
+class OrderAck:
+    order_id: str
+    symbol: str
+    side: str
+    order_type: str
+    price: float
+    quantity: int
+    submitted_at: datetime
+    latency_ms: float  # submit -> broker acknowledgement
+
+class ExecutionEngine:
+    """
+    Async order submission on the shared AsyncTradeContext.
+
+    Before an order leaves the process it is checked against the locally
+    cached top-of-book (the OrderBookStore fed by depth pushes): a dict lookup
+    and two array reads, no quote request. A limit price must sit inside the
+    best bid/ask band, widened by PRICE_PROTECTION_TOLERANCE percent; market
+    orders only need a live book. Submit-to-ack latency is recorded per order.
+    """
+
+    def __init__(self, books=None, tolerance: float = None, max_age: float = None, tracker=None):
+        """
+        :param books: OrderBookStore holding top-of-book (defaults to the push handler's)
+        :param tracker: OrderTracker told about every acknowledged order
+        :param tolerance: Allowed distance outside the band, in percent
+        :param max_age: Max age of the cached book in seconds (0 disables the check)
+        """
+        self._books = books
+        self._tracker = tracker
+        self.tolerance = (Settings.PRICE_PROTECTION_TOLERANCE if tolerance is None else tolerance) / 100
+        self.max_age = Settings.PRICE_PROTECTION_MAX_AGE if max_age is None else max_age
+
+    @property
+    def books(self):
+        if self._books is None:
+            # Resolved lazily: the push handler pulls in the whole analysis stack
+            from src.api.longport.push.handler import push_handler
+            self._books = push_handler.order_books
+        return self._books
+
+    @property
+    def tracker(self):
+        if self._tracker is None:
+            from src.api.order_tracker import order_tracker
+            self._tracker = order_tracker
+        return self._tracker
+
+    @property
+    def enabled(self) -> bool:
+        return Settings.ENABLE_TRADING
+
+    async def start(self):
+        """
+        Create the trade context up front so the first order does not pay for the
+        handshake, and start tracking order pushes on it.
+        """
+        if self.enabled:
+            ctx = await longport_client.get_trade_context()
+            await self.tracker.start(ctx)
+
+    def check_price(self, symbol: str, side: str, price: float = None):
+        """
+        Price-protection rule, O(1) against the cached book.
+        :param price: Limit price; None for market orders
+        :raises PriceProtectionError: if the order must not be sent
+        """
+        idx = self.books.index(symbol)
+        if idx is None:
+            raise PriceProtectionError(f"No order book cached for {symbol}")
+        if self.max_age > 0 and self.books.age(idx) > self.max_age:
+            raise PriceProtectionError(f"Order book for {symbol} is {self.books.age(idx):.0f}s old")
+
+        bid = self.books.best_bid(idx)
+        ask = self.books.best_ask(idx)
+        if bid <= 0 or ask <= 0:
+            raise PriceProtectionError(f"One-sided book for {symbol} (Bid: {bid}, Ask: {ask})")
+        if price is None:
+            return
+
+        low = bid * (1 - self.tolerance)
+        high = ask * (1 + self.tolerance)
+        if not low <= price <= high:
+            raise PriceProtectionError(
+                f"{side} {symbol} @ {price} outside band [{low:.4f}, {high:.4f}] (Bid: {bid}, Ask: {ask})"
+            )
+
+    async def submit_order(self, symbol: str, side: str, quantity: int, price: float = None,
+                           order_type: str = "LO", remark: str = None):
+        """
+        Submit an order without blocking the event loop.
+        :param side: "Buy" or "Sell"
+        :param price: Limit price (required for LO, ignored for MO)
+        :param order_type: "LO" (limit) or "MO" (market)
+        :return: OrderAck, or None when trading is disabled
+        """
+        if not self.enabled:
+            logger.warning("Trading is disabled. Skipping order submission.")
+            return None
+
+        is_market = order_type.upper() == "MO"
+        if not is_market and price is None:
+            raise ValueError("Limit orders need a price")
+
+        try:
+            self.check_price(symbol, side, None if is_market else price)
+        except PriceProtectionError as e:
+            metrics.inc("orders_rejected_total", reason="price_protection")
+            logger.warning(f"Order blocked by price protection: {e}")
+            raise
+
+        from longport.openapi import OrderSide, OrderType, TimeInForceType
+
+        ctx = await longport_client.get_trade_context()
+        kwargs = dict(
+            symbol=symbol,
+            order_type=OrderType.MO if is_market else OrderType.LO,
+            side=OrderSide.Buy if side.lower() == "buy" else OrderSide.Sell,
+            submitted_quantity=Decimal(int(quantity)),
+            time_in_force=TimeInForceType.Day,
+        )
+        if not is_market:
+            kwargs["submitted_price"] = Decimal(str(price))
+        # Tagged so the order tracker can tell our orders from others on the account
+        tag = Settings.ORDER_REMARK_TAG
+        remark = f"{tag} {remark}" if tag and remark else (tag or remark)
+        if remark:
+            kwargs["remark"] = remark
+
+        submitted_at = datetime.now()
+        start = time.perf_counter()
+        try:
+            resp = await ctx.submit_order(**kwargs)
+        except Exception as e:
+            metrics.inc("orders_rejected_total", reason="broker")
+            logger.error(f"Failed to submit order {side} {quantity} {symbol}: {e}")
+            raise
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        metrics.inc("orders_submitted_total", side=side.lower())
+        metrics.observe("order_ack_latency_ms", latency_ms, side=side.lower())
+        ack = OrderAck(
+            order_id=str(getattr(resp, 'order_id', resp)),
+            symbol=symbol,
+            side=side,
+            order_type="MO" if is_market else "LO",
+            price=price,
+            quantity=int(quantity),
+            submitted_at=submitted_at,
+            latency_ms=latency_ms,
+        )
+        logger.info(f"Order acknowledged in {latency_ms:.1f}ms: {ack}")
+        # Visible as open right away; its lifecycle then follows order-changed pushes
+        self.tracker.register(ack.order_id, symbol, side, quantity, price)
+        return ack
+
+    async def cancel_order(self, order_id: str):
+        if not self.enabled:
+            logger.warning("Trading is disabled. Skipping order cancel.")
+            return
+        ctx = await longport_client.get_trade_context()
+        start = time.perf_counter()
+        await ctx.cancel_order(order_id)
+        metrics.observe("order_cancel_latency_ms", (time.perf_counter() - start) * 1000)
+        logger.info(f"Cancel requested for order {order_id}")
+
+# Global execution engine
+execution_engine = ExecutionEngine()
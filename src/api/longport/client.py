@@ -1,5 +1,4 @@
 import asyncio
-from longport.openapi import Config, AsyncQuoteContext, AsyncTradeContext
 from config.settings import Settings
 from src.utils.logger import logger
 
@@ -7,6 +6,9 @@ class LongPortClient:
     _instance = None
     _quote_ctx = None
     _trade_ctx = None
+    # Concurrent first callers share one context creation
+    _quote_lock = None
+    _trade_lock = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -15,6 +17,9 @@ class LongPortClient:
 
     @property
     def config(self):
+        # The SDK (a native extension) is imported on first use, not at startup
+        from longport.openapi import Config
+
         return Config(
             app_key=Settings.LONGPORT_APP_KEY,
             app_secret=Settings.LONGPORT_APP_SECRET,
@@ -24,14 +29,30 @@ class LongPortClient:
     async def get_quote_context(self):
         """Get or create AsyncQuoteContext singleton"""
         if self._quote_ctx is None:
-            try:
-                self._quote_ctx = await AsyncQuoteContext.create(self.config)
-                logger.info("LongPort AsyncQuoteContext initialized successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize AsyncQuoteContext: {e}")
-                raise
+            from longport.openapi import AsyncQuoteContext
+
+            if self._quote_lock is None:
+                self._quote_lock = asyncio.Lock()
+            async with self._quote_lock:
+                if self._quote_ctx is None:
+                    try:
+                        self._quote_ctx = await AsyncQuoteContext.create(self.config)
+                        logger.info("LongPort AsyncQuoteContext initialized successfully")
+                    except Exception as e:
+                        logger.error(f"Failed to initialize AsyncQuoteContext: {e}")
+                        raise
         return self._quote_ctx
 
+    def reset_quote_context(self):
+        """
+        Drop the cached AsyncQuoteContext so the next get_quote_context creates a new one.
+        :return: The discarded context (or None)
+        """
+        ctx, self._quote_ctx = self._quote_ctx, None
+        if ctx is not None:
+            logger.info("LongPort AsyncQuoteContext discarded")
+        return ctx
+
     async def get_trade_context(self):
         """Get or create AsyncTradeContext singleton (if trading enabled)"""
         if not Settings.ENABLE_TRADING:
@@ -39,12 +60,18 @@ class LongPortClient:
             return None
             
         if self._trade_ctx is None:
-            try:
-                self._trade_ctx = await AsyncTradeContext.create(self.config)
-                logger.info("LongPort AsyncTradeContext initialized successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize AsyncTradeContext: {e}")
-                raise
+            from longport.openapi import AsyncTradeContext
+
+            if self._trade_lock is None:
+                self._trade_lock = asyncio.Lock()
+            async with self._trade_lock:
+                if self._trade_ctx is None:
+                    try:
+                        self._trade_ctx = await AsyncTradeContext.create(self.config)
+                        logger.info("LongPort AsyncTradeContext initialized successfully")
+                    except Exception as e:
+                        logger.error(f"Failed to initialize AsyncTradeContext: {e}")
+                        raise
         return self._trade_ctx
 
 # Global client instance
@@ -1,3 +1,3 @@
-from .watchlist import get_watchlist
+from .watchlist import get_watchlist, fetch_watchlist, WatchlistSync
 
-__all__ = ['get_watchlist']
+__all__ = ['get_watchlist', 'fetch_watchlist', 'WatchlistSync']
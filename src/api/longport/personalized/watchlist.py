@@ -1,6 +1,27 @@
+import asyncio
+from config.settings import Settings
 from src.api.longport.client import longport_client
 from src.utils.logger import logger
 
+async def fetch_watchlist() -> list[dict]:
+    """
+    Fetch the user's watchlist, raising on API errors.
+    Same return structure as `get_watchlist`.
+    """
+    ctx = await longport_client.get_quote_context()
+    # Use watchlist() method for v3 SDK
+    groups = await ctx.watchlist()
+
+    result = []
+    for group in groups:
+        for security in group.securities:
+            result.append({
+                "symbol": security.symbol,
+                "name": security.name,
+                "watchlist_name": group.name
+            })
+    return result
+
 async def get_watchlist():
     """
     Get user's watchlist from LongPort.
@@ -13,19 +34,78 @@ async def get_watchlist():
         ]
     """
     try:
-        ctx = await longport_client.get_quote_context()
-        # Use watchlist() method for v3 SDK
-        groups = await ctx.watchlist()
-        
-        result = []
-        for group in groups:
-            for security in group.securities:
-                result.append({
-                    "symbol": security.symbol,
-                    "name": security.name,
-                    "watchlist_name": group.name
-                })
-        return result
+        return await fetch_watchlist()
     except Exception as e:
         logger.error(f"Failed to get watchlist: {e}")
         return []
+
+class WatchlistSync:
+    """
+    Keep a SubscriptionManager source in step with the app watchlist.
+
+    Polls the watchlist in the background and caches the last snapshot; the
+    manager is only called when the symbol set actually changed, and then only
+    the added/removed symbols are (un)subscribed. A failed poll keeps the last
+    snapshot, so an API error never unsubscribes anything.
+    """
+
+    def __init__(self, manager, interval: float = None, groups: list[str] = None, source: str = "watchlist"):
+        """
+        :param manager: SubscriptionManager receiving the symbol set
+        :param interval: Poll interval in seconds
+        :param groups: Only follow these watchlist groups (default: all)
+        """
+        self.manager = manager
+        self.interval = interval or Settings.WATCHLIST_SYNC_INTERVAL
+        self.groups = set(groups if groups is not None else Settings.WATCHLIST_GROUPS) or None
+        self.source = source
+        self.snapshot = None
+        self._task = None
+
+    async def sync_once(self) -> bool:
+        """
+        Poll once and apply the diff.
+        :return: True if the symbol set changed
+        """
+        try:
+            items = await fetch_watchlist()
+        except Exception as e:
+            logger.warning(f"Watchlist sync skipped, keeping last snapshot: {e}")
+            return False
+
+        symbols = frozenset(
+            item["symbol"] for item in items
+            if self.groups is None or item["watchlist_name"] in self.groups
+        )
+        if symbols == self.snapshot:
+            return False
+
+        # Snapshot only once applied, so a failed subscribe is retried on the next poll
+        await self.manager.set_source(self.source, symbols)
+        previous, self.snapshot = self.snapshot, symbols
+        if previous is not None:
+            logger.info(f"Watchlist changed: +{sorted(symbols - previous)} -{sorted(previous - symbols)}")
+        return True
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="watchlist-sync")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sync_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Watchlist sync failed: {e}")
+            await asyncio.sleep(self.interval)
@@ -1,3 +1,4 @@
 from .quote import get_quote
+from .history import get_candlesticks, history_cache
 
-__all__ = ['get_quote']
+__all__ = ['get_quote', 'get_candlesticks', 'history_cache']
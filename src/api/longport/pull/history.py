@@ -0,0 +1,206 @@
+import asyncio
+import os
+from datetime import date, timedelta
+from zoneinfo import ZoneInfo
+import numpy as np
+from config.settings import Settings
+from src.api.longport.client import longport_client
+from src.api.longport.symbol.metadata import trading_date
+from src.utils.columnar import BAR_COLUMNS, concat_bars, read_columns, write_columns
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.ratelimit import AsyncRateLimiter
+
+_US_EASTERN = ZoneInfo("America/New_York")
+
+# Cache label -> longport.openapi.Period member
+PERIODS = {"1m": "Min_1", "5m": "Min_5", "15m": "Min_15", "30m": "Min_30", "60m": "Min_60", "1d": "Day"}
+# Regular-session bars per day, used to size requests under the per-request limit
+_BARS_PER_DAY = {"1m": 390, "5m": 78, "15m": 26, "30m": 13, "60m": 7, "1d": 1}
+# Max candlesticks the API returns per request
+MAX_CANDLESTICKS = 1000
+
+def _weekdays(start: date, end: date) -> list[date]:
+    days = []
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+def _ranges(days: list[date], max_days: int) -> list[tuple[date, date]]:
+    """Group sorted days into (first, last) ranges of consecutive weekdays, at most max_days each"""
+    ranges = []
+    for day in days:
+        if ranges:
+            first, last, count = ranges[-1]
+            gap = (day - last).days
+            contiguous = gap == 1 or (gap <= 3 and last.weekday() == 4)
+            if contiguous and count < max_days:
+                ranges[-1] = (first, day, count + 1)
+                continue
+        ranges.append((day, day, 1))
+    return [(first, last) for first, last, _ in ranges]
+
+def _to_columns(candles: list, period: str) -> tuple[dict, list[date]]:
+    """Candlestick objects -> (BAR_COLUMNS arrays, New York date per row)"""
+    n = len(candles)
+    columns = {name: np.zeros(n, dtype=np.int64 if name in ("start", "volume") else np.float64)
+               for name in BAR_COLUMNS}
+    days = []
+    for i, c in enumerate(candles):
+        ts = c.timestamp
+        columns["start"][i] = int(ts.timestamp())
+        columns["open"][i] = float(c.open)
+        columns["high"][i] = float(c.high)
+        columns["low"][i] = float(c.low)
+        columns["close"][i] = float(c.close)
+        columns["volume"][i] = int(c.volume)
+        columns["turnover"][i] = float(c.turnover)
+        # Daily candles are stamped with their date; intraday ones fall on the New York date
+        if period == "1d" or ts.tzinfo is None:
+            days.append(ts.date())
+        else:
+            days.append(ts.astimezone(_US_EASTERN).date())
+    return columns, days
+
+class HistoryCache:
+    """
+    Local candlestick cache, one column file per (period, symbol, day):
+        <dir>/<period>/<SYMBOL>/<YYYY-MM-DD>.npz
+    Only finished trading days are stored (an empty file marks a day without
+    bars, e.g. a holiday), so a stored day never needs to be fetched again.
+    `backfill` fetches just the days that are not on disk yet, for many symbols
+    concurrently under HISTORY_CONCURRENCY in-flight requests and HISTORY_RATE
+    requests per second.
+    """
+
+    def __init__(self, directory: str = None, concurrency: int = None, rate: float = None, today=None):
+        """
+        :param today: Callable returning the current trading date (tests pin it)
+        """
+        self.directory = directory or Settings.HISTORY_DIR
+        self.concurrency = concurrency or Settings.HISTORY_CONCURRENCY
+        self.limiter = AsyncRateLimiter(rate or Settings.HISTORY_RATE)
+        self._today = today or (lambda: date.fromisoformat(trading_date()))
+
+    def path_for(self, symbol: str, period: str, day: date) -> str:
+        return os.path.join(self.directory, period, symbol, f"{day.isoformat()}.npz")
+
+    def cached_days(self, symbol: str, period: str) -> set[date]:
+        folder = os.path.join(self.directory, period, symbol)
+        try:
+            names = os.listdir(folder)
+        except FileNotFoundError:
+            return set()
+        return {date.fromisoformat(name[:-4]) for name in names if name.endswith(".npz")}
+
+    def missing_days(self, symbol: str, period: str, start: date, end: date) -> list[date]:
+        """Weekdays in [start, end] without a stored file (today and later always count as missing)"""
+        cached = self.cached_days(symbol, period)
+        return [day for day in _weekdays(start, end) if day not in cached]
+
+    def load(self, symbol: str, period: str, start: date, end: date) -> dict:
+        """Stored bars of [start, end] as BAR_COLUMNS arrays sorted by start"""
+        parts = []
+        for day in _weekdays(start, end):
+            path = self.path_for(symbol, period, day)
+            if os.path.exists(path):
+                parts.append(read_columns(path))
+        return concat_bars(parts)
+
+    def _store(self, symbol: str, period: str, first: date, last: date, columns: dict, days: list[date]):
+        today = self._today()
+        row_days = np.array([d.toordinal() for d in days], dtype=np.int64)
+        for day in _weekdays(first, last):
+            if day >= today:
+                continue
+            rows = row_days == day.toordinal()
+            write_columns(self.path_for(symbol, period, day), {name: col[rows] for name, col in columns.items()})
+
+    async def _fetch(self, ctx, symbol: str, period: str, first: date, last: date, semaphore) -> dict:
+        from longport.openapi import AdjustType, Period
+
+        async with semaphore:
+            await self.limiter.acquire()
+            candles = await ctx.history_candlesticks_by_date(
+                symbol, getattr(Period, PERIODS[period]), AdjustType.NoAdjust, start=first, end=last)
+        metrics.inc("history_requests_total", period=period)
+        columns, days = _to_columns(candles, period)
+        if len(candles) >= MAX_CANDLESTICKS:
+            # Truncated: storing it would mark the cut-off days as empty for good
+            weekdays = _weekdays(first, last)
+            if len(weekdays) > 1:
+                mid = weekdays[len(weekdays) // 2 - 1]
+                logger.warning(f"History for {symbol} {period} {first}..{last} hit the {MAX_CANDLESTICKS} row limit, "
+                               f"splitting at {mid}")
+                halves = await asyncio.gather(
+                    self._fetch(ctx, symbol, period, first, mid, semaphore),
+                    self._fetch(ctx, symbol, period, mid + timedelta(days=1), last, semaphore),
+                )
+                return concat_bars(list(halves))
+            logger.warning(f"History for {symbol} {period} {first} hit the {MAX_CANDLESTICKS} row limit, not cached")
+            return columns
+        await asyncio.to_thread(self._store, symbol, period, first, last, columns, days)
+        return columns
+
+    async def backfill(self, symbols: list[str], period: str, start: date, end: date) -> dict:
+        """
+        Fetch every missing (symbol, day) of [start, end] into the cache.
+        :return: Stats: requests, failed, days_fetched, days_cached
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Unsupported period {period}, expected one of {list(PERIODS)}")
+        max_days = max(1, MAX_CANDLESTICKS // _BARS_PER_DAY[period])
+        jobs = []
+        days_cached = 0
+        for symbol in dict.fromkeys(symbols):
+            missing = await asyncio.to_thread(self.missing_days, symbol, period, start, end)
+            days_cached += len(_weekdays(start, end)) - len(missing)
+            jobs.extend((symbol, first, last) for first, last in _ranges(missing, max_days))
+
+        stats = {"requests": len(jobs), "failed": 0, "days_fetched": 0, "days_cached": days_cached}
+        if not jobs:
+            return stats
+
+        ctx = await longport_client.get_quote_context()
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+        results = await asyncio.gather(
+            *(self._fetch(ctx, symbol, period, first, last, semaphore) for symbol, first, last in jobs),
+            return_exceptions=True,
+        )
+        for (symbol, first, last), result in zip(jobs, results):
+            if isinstance(result, BaseException):
+                stats["failed"] += 1
+                logger.error(f"Failed to backfill {symbol} {period} {first}..{last}: {result}")
+            else:
+                stats["days_fetched"] += len(_weekdays(first, last))
+        logger.info(f"History backfill {period}: {stats}")
+        return stats
+
+    async def get(self, symbol: str, period: str, start: date, end: date) -> dict:
+        """
+        Bars of [start, end]: finished days come from disk, only missing days are fetched.
+        Days from today on are never stored, so they are fetched on every call.
+        """
+        await self.backfill([symbol], period, start, end)
+        today = self._today()
+        bars = await asyncio.to_thread(self.load, symbol, period, start, min(end, today - timedelta(days=1)))
+        if end < today:
+            return bars
+        try:
+            ctx = await longport_client.get_quote_context()
+            live = await self._fetch(ctx, symbol, period, max(start, today), end,
+                                     asyncio.Semaphore(1))
+        except Exception as e:
+            logger.error(f"Failed to get current bars for {symbol} {period}: {e}")
+            return bars
+        return concat_bars([bars, live])
+
+# Global cache
+history_cache = HistoryCache()
+
+async def get_candlesticks(symbol: str, period: str, start: date, end: date) -> dict:
+    """Historical bars for symbol (see HistoryCache.get)"""
+    return await history_cache.get(symbol, period, start, end)
@@ -1,44 +1,132 @@
-from datetime import datetime
+import asyncio
+from datetime import datetime, timedelta
+from config.settings import Settings
+from src.analysis.quotes import quote_store
 from src.api.longport.client import longport_client
+from src.api.longport.symbol.metadata import metadata_store
+from src.utils.cache import TTLCache
 from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+# symbol -> display name (None when the API does not know the symbol)
+_static_names = TTLCache(Settings.STATIC_INFO_TTL)
+
+def _chunks(symbols: list[str], size: int) -> list[list[str]]:
+    return [symbols[i:i + size] for i in range(0, len(symbols), size)]
+
+async def fetch_chunks(method, symbols: list[str], what: str, semaphore: asyncio.Semaphore = None,
+                       failed: list = None) -> list:
+    """
+    Call a batch API once per chunk, all chunks concurrently.
+    A failed chunk is logged and skipped so it only loses its own symbols.
+    :param failed: Optional list that receives the symbols of failed chunks
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, Settings.QUOTE_CONCURRENCY))
+
+    async def fetch(chunk):
+        async with semaphore:
+            return await method(chunk)
+
+    chunks = _chunks(symbols, max(1, Settings.QUOTE_BATCH_SIZE))
+    results = await asyncio.gather(*(fetch(chunk) for chunk in chunks), return_exceptions=True)
+
+    items = []
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Failed to get {what} for {len(chunk)} symbols ({chunk[0]}...): {result}")
+            if failed is not None:
+                failed.extend(chunk)
+            continue
+        items.extend(result)
+    return items
+
+async def _fetch_names(ctx, symbols: list[str], semaphore: asyncio.Semaphore) -> dict:
+    """Resolve names from the on-disk metadata store, calling static_info only for unknown symbols"""
+    names = {}
+    missing = await asyncio.to_thread(metadata_store.missing, symbols)
+    if missing:
+        failed = []
+        infos = await fetch_chunks(ctx.static_info, missing, "static info", semaphore, failed)
+        # Only symbols the API answered for are known-unknown; failed chunks are retried next call
+        failed = set(failed)
+        names = {symbol: None for symbol in missing if symbol not in failed}
+        if infos:
+            await asyncio.to_thread(metadata_store.upsert_static_infos, infos)
+        returned = {info.symbol for info in infos}
+        await asyncio.to_thread(metadata_store.mark_absent, [s for s in names if s not in returned])
+    known = await asyncio.to_thread(metadata_store.get_many, symbols)
+    for symbol, meta in known.items():
+        names[symbol] = meta.name_cn or meta.name_en
+    if names:
+        _static_names.set_many(names)
+    return names
 
 async def get_quote(symbols: list[str]):
     """
     Get real-time quotes for symbols.
-    
+
+    Symbols whose latest push (see QuoteStore) is at most Settings.QUOTE_MAX_AGE
+    seconds old are answered from memory; only stale or unknown symbols are
+    requested. Those are split into chunks of Settings.QUOTE_BATCH_SIZE; quote
+    chunks and static-info lookups for names not yet cached run concurrently.
+    Names come from memory, then the on-disk metadata store, and only then from
+    ctx.static_info.
+
     Args:
         symbols (list[str]): List of symbols (e.g. ["US.AAPL", "HK.00700"])
-        
+
     Returns:
         dict: key is symbol, value is quote info
     """
     if not symbols:
         return {}
-    
+
     try:
-        ctx = await longport_client.get_quote_context()
-        
-        # Get quotes
-        quotes = await ctx.quote(symbols)
-        
-        # Get static info for names
-        static_infos = await ctx.static_info(symbols)
-        name_map = {info.symbol: info.name_cn or info.name_en for info in static_infos}
-        
+        symbols = list(dict.fromkeys(symbols))
+        if Settings.QUOTE_MAX_AGE > 0:
+            cached, stale = quote_store.fresh(symbols, Settings.QUOTE_MAX_AGE)
+        else:
+            cached, stale = {}, symbols
+        metrics.inc("quote_cache_hits_total", len(cached))
+        metrics.inc("quote_cache_misses_total", len(stale))
+
+        # Names never change intraday; only symbols missing from the cache pay for static_info
+        name_map, missing = _static_names.get_many(symbols)
+        quotes = list(cached.values())
+        if stale or missing:
+            ctx = await longport_client.get_quote_context()
+            semaphore = asyncio.Semaphore(max(1, Settings.QUOTE_CONCURRENCY))
+            fetched, names = await asyncio.gather(
+                fetch_chunks(ctx.quote, stale, "quotes", semaphore) if stale else asyncio.sleep(0, []),
+                _fetch_names(ctx, missing, semaphore) if missing else asyncio.sleep(0, {}),
+            )
+            name_map.update(names)
+            # Snapshots refresh the store (and seed prev_close for later pushes)
+            quote_store.update_many([(q.symbol, q) for q in fetched])
+            quotes.extend(fetched)
+
+        now = datetime.now()
+        fetched_at = now.strftime("%Y-%m-%d %H:%M:%S")
         result = {}
         for q in quotes:
+            if q.symbol in cached:
+                # Served from the store: report when the push arrived, not now
+                updated_at = (now - timedelta(seconds=quote_store.age(q.symbol))).strftime("%Y-%m-%d %H:%M:%S")
+            else:
+                updated_at = fetched_at
             last = float(q.last_done)
             prev = float(q.prev_close)
             change_rate = (last - prev) / prev if prev != 0 else 0
-            
+
             result[q.symbol] = {
-                "name": name_map.get(q.symbol, q.symbol),
+                "name": name_map.get(q.symbol) or q.symbol,
                 "last_price": last,
                 "change_rate": "{:+.2%}".format(change_rate),  # Format as percentage with sign (e.g. +1.23%)
                 "pre_close_price": prev,
-                "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                "updated_at": updated_at
             }
         return result
     except Exception as e:
-        logger.error(f"Failed to get quotes for {symbols}: {e}")
+        logger.error(f"Failed to get quotes for {len(symbols)} symbols: {e}")
         return {}
@@ -1,29 +1,82 @@
 from src.utils.logger import logger
 from src.analysis.strategy import Strategy
-from src.api.notification import AlertManager
+from src.analysis.batch import BatchStrategy
+from src.analysis.indicators import IndicatorStore
+from src.analysis.orderbook import OrderBookStore
+from src.analysis.rules import RuleBook
+from src.analysis.coalescer import AlertCoalescer
+from src.api.notifier import alert_notifier
+from src.utils.metrics import metrics
 from config.settings import Settings
 
 class PushHandler:
-    def __init__(self):
-        self.strategy = Strategy()
+    def __init__(self, notifier=None, coalescer=None):
+        self.indicators = IndicatorStore()
+        # One rule book for both engines, so a hot reload reaches them together
+        self.rules = RuleBook()
+        self.strategy = Strategy(indicators=self.indicators, rules=self.rules)
+        self.batch_strategy = BatchStrategy(rules=self.rules)
+        self.order_books = OrderBookStore()
+        self.notifier = notifier or alert_notifier
+        # Cooldown / escalation / digest stage in front of the notifier
+        self.coalescer = coalescer or AlertCoalescer(sink=self.notifier.submit)
+        self._signal_listeners = []
+
+    def add_signal_listener(self, callback):
+        """Call `callback(sig)` for every dispatched signal (before cooldown filtering)"""
+        self._signal_listeners.append(callback)
 
     def on_quote(self, symbol: str, event):
         """Handle quote push event"""
         try:
             # Note: The actual event object structure depends on LongPort SDK version
             # Here we assume 'event' has price/spread info or is the Quote object itself
-            logger.debug(f"Received quote for {symbol}: {event}")
+            logger.debug("Received quote for %s: %s", symbol, event)
             
             # Use Strategy to analyze
-            signals = self.strategy.analyze(event)
+            signals = self.strategy.analyze(event, symbol)
             
             for sig in signals:
-                logger.info(f"Signal triggered: {sig}")
-                AlertManager.send_alert(
-                    title=f"Strategy Signal: {sig.signal_type} - {sig.symbol}",
-                    content=f"Price: {sig.price}\nTime: {sig.timestamp}\nDetails: {sig.details}"
-                )
+                self.dispatch(sig)
         except Exception as e:
             logger.error(f"Error handling quote for {symbol}: {e}")
 
+    def dispatch(self, sig):
+        """Count a signal and pass it to the alert coalescer"""
+        logger.info("Signal triggered: %s", sig)
+        metrics.inc("signals_total", type=sig.signal_type)
+        for callback in self._signal_listeners:
+            callback(sig)
+        # Repeats inside the cooldown are dropped here; admitted signals are
+        # batched into digests and enqueued on the notifier's worker pool
+        self.coalescer.offer(sig)
+
+    def on_depth(self, symbol: str, event):
+        """Handle depth (level-2) push event"""
+        try:
+            idx = self.order_books.apply(symbol, event)
+            signals = self.strategy.analyze_depth(symbol, self.order_books, idx)
+
+            for sig in signals:
+                self.dispatch(sig)
+        except Exception as e:
+            logger.error(f"Error handling depth for {symbol}: {e}")
+
+    def on_quote_batch(self, items: list):
+        """Handle a micro-batch of (symbol, event) pushes with the vectorized engine"""
+        try:
+            symbols = [symbol for symbol, _ in items]
+            events = [event for _, event in items]
+            signals = self.batch_strategy.analyze_batch(events, symbols)
+            # Rolling-window state is per tick, so the INSTANT_MOVE rule stays scalar
+            for symbol, event in items:
+                instant = self.strategy.check_instant_move(symbol, event)
+                if instant is not None:
+                    signals.append(instant)
+
+            for sig in signals:
+                self.dispatch(sig)
+        except Exception as e:
+            logger.error(f"Error handling quote batch of {len(items)}: {e}")
+
 push_handler = PushHandler()
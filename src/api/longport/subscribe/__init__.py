@@ -0,0 +1,3 @@
+from .manager import SubscriptionManager
+
+__all__ = ['SubscriptionManager']
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+class SubscriptionManager:
+    """
+    Owns the live push subscription set.
+
+    Several sources (static config, the watchlist, option chains...) each
+    declare the symbols they want; the subscribed set is their union. When a
+    source changes, only the difference against what is already subscribed is
+    sent to the server, so adding one symbol costs one subscribe call instead
+    of a full resubscription.
+
+    With a `budget`, at most that many symbols are subscribed: the union is
+    ordered by `ranker` and only the top of it gets push; the remainder is
+    left to pull polling (see SubscriptionScheduler).
+    """
+
+    def __init__(self, ctx=None, sub_types: list = None, budget: int = 0, ranker=None):
+        """
+        :param ctx: AsyncQuoteContext (can also be passed to `bind` later)
+        :param sub_types: SubType list used for every subscription
+        :param budget: Max subscribed symbols (0 = unlimited)
+        :param ranker: Callable(set) -> list ordered by priority, used when over budget
+        """
+        self.ctx = ctx
+        self.sub_types = sub_types
+        self.budget = budget
+        self.ranker = ranker
+        self._sources = {}
+        self.subscribed = set()
+        self._lock = asyncio.Lock()
+        self._listeners = []
+
+    def bind(self, ctx, sub_types: list = None):
+        self.ctx = ctx
+        if sub_types is not None:
+            self.sub_types = sub_types
+
+    def add_listener(self, callback):
+        """callback(added: list[str], removed: list[str]) runs after each applied diff"""
+        self._listeners.append(callback)
+
+    def desired(self) -> set:
+        wanted = set()
+        for symbols in self._sources.values():
+            wanted |= symbols
+        return wanted
+
+    def selected(self) -> set:
+        """The part of `desired()` that fits in the subscription budget"""
+        wanted = self.desired()
+        if not self.budget or len(wanted) <= self.budget:
+            return wanted
+        ranked = self.ranker(wanted) if self.ranker else sorted(wanted)
+        return set(ranked[:self.budget])
+
+    def overflow(self) -> set:
+        """Wanted symbols that did not get a push subscription"""
+        return self.desired() - self.subscribed
+
+    def source(self, name: str) -> frozenset:
+        return frozenset(self._sources.get(name, ()))
+
+    async def set_source(self, name: str, symbols) -> tuple[list, list]:
+        """
+        Replace one source's symbol set and apply the resulting diff.
+        :return: (subscribed, unsubscribed) symbols
+        """
+        self._sources[name] = set(symbols)
+        return await self.apply()
+
+    async def remove_source(self, name: str) -> tuple[list, list]:
+        self._sources.pop(name, None)
+        return await self.apply()
+
+    async def clear(self) -> tuple[list, list]:
+        """Drop every source and unsubscribe everything (shutdown)"""
+        self._sources.clear()
+        return await self.apply()
+
+    async def apply(self) -> tuple[list, list]:
+        """Subscribe what is wanted but missing, unsubscribe what nobody wants any more"""
+        error = None
+        async with self._lock:
+            before = set(self.subscribed)
+            wanted = self.selected()
+            added = sorted(wanted - self.subscribed)
+            removed = sorted(self.subscribed - wanted)
+
+            # Free budget before using it; `subscribed` follows each chunk the server accepted
+            try:
+                if removed:
+                    await self._call(self.ctx.unsubscribe, removed, self.subscribed.difference_update)
+                if added:
+                    await self._call(self.ctx.subscribe, added, self.subscribed.update, is_first_push=True)
+            except Exception as e:
+                error = e
+            # Report what actually changed, even when some chunks failed
+            added = sorted(self.subscribed - before)
+            removed = sorted(before - self.subscribed)
+
+        if added or removed:
+            logger.info(f"Subscriptions: +{len(added)} -{len(removed)} (total {len(self.subscribed)})")
+            for callback in self._listeners:
+                try:
+                    result = callback(added, removed)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    logger.error(f"Subscription listener failed: {e}")
+        if error is not None:
+            raise error
+        return added, removed
+
+    async def restore(self, ctx=None):
+        """Resubscribe the whole current set, e.g. on a fresh connection after a reconnect"""
+        async with self._lock:
+            if ctx is not None:
+                self.ctx = ctx
+            if self.subscribed:
+                await self._call(self.ctx.subscribe, sorted(self.subscribed), is_first_push=True)
+                logger.info(f"Restored {len(self.subscribed)} subscriptions")
+
+    async def _call(self, method, symbols: list, on_done=None, **kwargs):
+        """
+        Send symbols in QUOTE_BATCH_SIZE chunks. Every chunk is attempted; on_done(chunk)
+        runs for each one that succeeded, then the first failure (if any) is raised.
+        """
+        size = max(1, Settings.QUOTE_BATCH_SIZE)
+        error = None
+        for i in range(0, len(symbols), size):
+            chunk = symbols[i:i + size]
+            try:
+                await method(chunk, self.sub_types, **kwargs)
+            except Exception as e:
+                logger.error(f"{getattr(method, '__name__', 'call')} failed for {len(chunk)} symbols ({chunk[0]}...): {e}")
+                error = error or e
+                continue
+            if on_done is not None:
+                on_done(chunk)
+        if error is not None:
+            raise error
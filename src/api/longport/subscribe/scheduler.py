@@ -0,0 +1,204 @@
+import asyncio
+import math
+import time
+import logging
+from config.settings import Settings
+from src.api.longport.client import longport_client
+from src.api.longport.pull.quote import fetch_chunks
+
+logger = logging.getLogger(__name__)
+
+class _Activity:
+    """Decayed activity of one symbol plus its pull-polling schedule"""
+    __slots__ = ("signals", "volatility", "last_price", "anchor_price", "anchor_at", "interval", "next_poll")
+
+    def __init__(self, interval: float):
+        self.signals = 0.0
+        self.volatility = 0.0
+        self.last_price = 0.0
+        # Price the current volatility window started from
+        self.anchor_price = 0.0
+        self.anchor_at = 0.0
+        self.interval = interval
+        self.next_poll = 0.0
+
+class SubscriptionScheduler:
+    """
+    Fit the wanted universe into the connection's subscription budget.
+
+    Every symbol has a priority score: pinned symbols always come first, the
+    rest are ranked by exponentially decayed signal count and absolute price
+    moves. A move is sampled at most once per SCHEDULER_INTERVAL window and
+    scaled to one window's length, so a pushed symbol (seen on every tick) and a
+    polled one (seen every few seconds) earn comparable scores for the same
+    price path. The SubscriptionManager gives push to the top `budget` symbols;
+    everything else is covered by batched `ctx.quote` polling. Each polled
+    symbol has its own interval, halved when its price changed since the last
+    poll and doubled when it did not (bounded by POLL_MIN/MAX_INTERVAL), so
+    active names are polled often and idle ones rarely. Scores are re-ranked
+    every SCHEDULER_INTERVAL seconds, promoting or demoting symbols; current
+    subscribers get a SCHEDULER_HYSTERESIS bonus so near-ties do not churn.
+    """
+
+    def __init__(self, manager, sink, pinned=None, interval: float = None,
+                 min_poll: float = None, max_poll: float = None, half_life: float = None,
+                 hysteresis: float = None, clock=None):
+        """
+        :param manager: SubscriptionManager whose budget is enforced
+        :param sink: Callable(list of (symbol, quote)) receiving polled quotes
+        :param pinned: Symbols that always get push
+        """
+        self.manager = manager
+        self.sink = sink
+        self.pinned = set(pinned if pinned is not None else Settings.PINNED_SYMBOLS)
+        self.interval = interval or Settings.SCHEDULER_INTERVAL
+        self.min_poll = min_poll or Settings.POLL_MIN_INTERVAL
+        self.max_poll = max_poll or Settings.POLL_MAX_INTERVAL
+        self.half_life = half_life or Settings.SCHEDULER_HALF_LIFE
+        self.hysteresis = Settings.SCHEDULER_HYSTERESIS if hysteresis is None else hysteresis
+        self._clock = clock or time.monotonic
+        self._activity = {}
+        self._last_decay = self._clock()
+        self._tasks = []
+        manager.ranker = self.rank
+
+    def _get(self, symbol: str) -> _Activity:
+        activity = self._activity.get(symbol)
+        if activity is None:
+            # setdefault: the SDK push thread and the event loop may both insert
+            activity = self._activity.setdefault(symbol, _Activity(self.min_poll))
+        return activity
+
+    def pin(self, symbols):
+        self.pinned.update(symbols)
+
+    def note_signal(self, sig):
+        """PushHandler signal listener"""
+        self._get(sig.symbol).signals += 1.0
+
+    def observe(self, symbol: str, event):
+        """Record a price (push or poll); O(1)"""
+        last = getattr(event, 'last_done', None)
+        if not last:
+            return
+        price = float(last)
+        activity = self._get(symbol)
+        activity.last_price = price
+        now = self._clock()
+        if activity.anchor_price <= 0:
+            activity.anchor_price, activity.anchor_at = price, now
+            return
+        span = now - activity.anchor_at
+        if span >= self.interval:
+            # Move per window, however many ticks fell inside it
+            move = abs(price / activity.anchor_price - 1) * 100
+            activity.volatility += move * self.interval / span
+            activity.anchor_price, activity.anchor_at = price, now
+
+    def score(self, symbol: str) -> float:
+        if symbol in self.pinned:
+            return math.inf
+        activity = self._activity.get(symbol)
+        if activity is None:
+            return 0.0
+        score = activity.signals * Settings.SCHEDULER_SIGNAL_WEIGHT + activity.volatility
+        if symbol in self.manager.subscribed:
+            score *= 1 + self.hysteresis
+        return score
+
+    def rank(self, symbols) -> list[str]:
+        """Highest priority first; ties broken by name for stable output"""
+        return sorted(symbols, key=lambda s: (-self.score(s), s))
+
+    def decay(self):
+        now = self._clock()
+        factor = 0.5 ** ((now - self._last_decay) / self.half_life)
+        self._last_decay = now
+        # Snapshot: observe() may add symbols from the SDK thread meanwhile
+        for activity in list(self._activity.values()):
+            activity.signals *= factor
+            activity.volatility *= factor
+
+    def evict(self) -> int:
+        """Forget symbols no source wants any more (pinned ones are kept)"""
+        wanted = self.manager.desired()
+        # Snapshot: observe() may add symbols from the SDK thread meanwhile
+        stale = [s for s in list(self._activity) if s not in wanted and s not in self.pinned]
+        for symbol in stale:
+            self._activity.pop(symbol, None)
+        return len(stale)
+
+    async def reschedule(self) -> tuple[list, list]:
+        """Drop unwanted symbols, decay scores and re-apply the budget; returns (promoted, demoted)"""
+        self.evict()
+        self.decay()
+        promoted, demoted = await self.manager.apply()
+        if promoted or demoted:
+            logger.info(f"Push tier: promoted {promoted}, demoted {demoted}")
+        now = self._clock()
+        for symbol in demoted:
+            # Demoted symbols start on the fast poll cadence
+            activity = self._get(symbol)
+            activity.interval = self.min_poll
+            activity.next_poll = now
+        return promoted, demoted
+
+    def due(self) -> list[str]:
+        now = self._clock()
+        return sorted(s for s in self.manager.overflow() if self._get(s).next_poll <= now)
+
+    async def poll(self) -> int:
+        """One batched ctx.quote for every polled symbol that is due"""
+        symbols = self.due()
+        if not symbols:
+            return 0
+        ctx = await longport_client.get_quote_context()
+        quotes = await fetch_chunks(ctx.quote, symbols, "polled quotes")
+
+        now = self._clock()
+        for q in quotes:
+            activity = self._get(q.symbol)
+            before = activity.last_price
+            self.observe(q.symbol, q)
+            if activity.last_price != before:
+                activity.interval = max(self.min_poll, activity.interval / 2)
+            else:
+                activity.interval = min(self.max_poll, activity.interval * 2)
+            activity.next_poll = now + activity.interval
+        # Symbols missing from the response retry at the slow cadence
+        for symbol in symbols:
+            activity = self._get(symbol)
+            if activity.next_poll <= now:
+                activity.next_poll = now + self.max_poll
+
+        if quotes:
+            self.sink([(q.symbol, q) for q in quotes])
+        return len(quotes)
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._loop(self.reschedule, self.interval), name="subscription-scheduler"),
+                asyncio.create_task(self._loop(self.poll, min(1.0, self.min_poll)), name="quote-poller"),
+            ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    @staticmethod
+    async def _loop(step, period: float):
+        while True:
+            await asyncio.sleep(period)
+            try:
+                await step()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Subscription scheduler step failed: {e}")
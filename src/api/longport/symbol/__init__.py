@@ -0,0 +1,4 @@
+from .metadata import MetadataStore, SecurityMeta, metadata_store, trading_date
+from .option_chain import ChainSpec, OptionChainExpander
+
+__all__ = ['MetadataStore', 'SecurityMeta', 'metadata_store', 'trading_date', 'ChainSpec', 'OptionChainExpander']
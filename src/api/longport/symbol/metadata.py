@@ -0,0 +1,264 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+_US_EASTERN = ZoneInfo("America/New_York")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS security_meta (
+    symbol TEXT NOT NULL,
+    trading_date TEXT NOT NULL,
+    name_cn TEXT,
+    name_en TEXT,
+    name_hk TEXT,
+    exchange TEXT,
+    currency TEXT,
+    lot_size INTEGER,
+    board TEXT,
+    stock_derivatives TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (symbol, trading_date)
+)
+"""
+
+# Symbols static_info answered for without returning them, by the trading date asked
+_MISSING_SCHEMA = """
+CREATE TABLE IF NOT EXISTS security_missing (
+    symbol TEXT PRIMARY KEY,
+    trading_date TEXT NOT NULL
+)
+"""
+
+_COLUMNS = ("symbol", "trading_date", "name_cn", "name_en", "name_hk", "exchange",
+            "currency", "lot_size", "board", "stock_derivatives", "updated_at")
+
+def trading_date(now: datetime = None) -> str:
+    """US trading date (New York calendar day, weekends roll back to Friday)"""
+    now = now.astimezone(_US_EASTERN) if now else datetime.now(_US_EASTERN)
+    day = now.date()
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day.isoformat()
+
+@dataclass
+class SecurityMeta:
+    symbol: str
+    trading_date: str
+    name_cn: str = ""
+    name_en: str = ""
+    name_hk: str = ""
+    exchange: str = ""
+    currency: str = ""
+    lot_size: int = 0
+    board: str = ""
+    stock_derivatives: list = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return self.name_cn or self.name_en or self.symbol
+
+    @classmethod
+    def from_static_info(cls, info, day: str) -> "SecurityMeta":
+        """Build from a LongPort SecurityStaticInfo"""
+        return cls(
+            symbol=info.symbol,
+            trading_date=day,
+            name_cn=str(getattr(info, 'name_cn', '') or ''),
+            name_en=str(getattr(info, 'name_en', '') or ''),
+            name_hk=str(getattr(info, 'name_hk', '') or ''),
+            exchange=str(getattr(info, 'exchange', '') or ''),
+            currency=str(getattr(info, 'currency', '') or ''),
+            lot_size=int(getattr(info, 'lot_size', 0) or 0),
+            board=str(getattr(info, 'board', '') or ''),
+            stock_derivatives=[str(d) for d in (getattr(info, 'stock_derivatives', None) or [])],
+        )
+
+class MetadataStore:
+    """
+    SQLite-backed store for static security metadata.
+
+    Rows are versioned by trading date: one row per (symbol, trading_date), and
+    lookups return the latest version. Symbols are loaded from disk lazily on
+    first access and then served from memory, so a restart pays no static_info
+    call for symbols seen within METADATA_MAX_AGE_DAYS. Symbols static_info does
+    not know are recorded too and only asked for again on the next trading day.
+    """
+
+    def __init__(self, path: str = None, max_age_days: int = None):
+        self.path = path or Settings.METADATA_DB
+        self.max_age_days = Settings.METADATA_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        self._conn = None
+        self._lock = threading.Lock()
+        # symbol -> SecurityMeta, or None once the disk has been checked and had nothing
+        self._memo = {}
+        # symbol -> trading date static_info last returned nothing for it (None: never)
+        self._absent = {}
+        self._pruned_day = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.execute(_MISSING_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def upsert_many(self, metas: list[SecurityMeta]) -> int:
+        """Insert or replace the given versions in one transaction"""
+        if not metas:
+            return 0
+        now = datetime.now().isoformat(timespec="seconds")
+        rows = [(m.symbol, m.trading_date, m.name_cn, m.name_en, m.name_hk, m.exchange, m.currency,
+                 m.lot_size, m.board, json.dumps(m.stock_derivatives), now) for m in metas]
+        placeholders = ", ".join("?" * len(_COLUMNS))
+        updates = ", ".join(f"{c}=excluded.{c}" for c in _COLUMNS[2:])
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO security_meta ({', '.join(_COLUMNS)}) VALUES ({placeholders}) "
+                    f"ON CONFLICT(symbol, trading_date) DO UPDATE SET {updates}",
+                    rows,
+                )
+                conn.executemany("DELETE FROM security_missing WHERE symbol = ?", [(m.symbol,) for m in metas])
+            for m in metas:
+                self._absent.pop(m.symbol, None)
+                current = self._memo.get(m.symbol)
+                if current is None or current.trading_date <= m.trading_date:
+                    self._memo[m.symbol] = m
+        return len(rows)
+
+    def upsert_static_infos(self, infos: list, day: str = None) -> list[SecurityMeta]:
+        day = day or trading_date()
+        metas = [SecurityMeta.from_static_info(info, day) for info in infos]
+        self.upsert_many(metas)
+        return metas
+
+    def mark_absent(self, symbols: list[str], day: str = None) -> int:
+        """Record symbols static_info returned nothing for, so `missing` skips them for the day"""
+        if not symbols:
+            return 0
+        day = day or trading_date()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO security_missing (symbol, trading_date) VALUES (?, ?) "
+                    "ON CONFLICT(symbol) DO UPDATE SET trading_date=excluded.trading_date",
+                    [(s, day) for s in symbols],
+                )
+            for s in symbols:
+                self._absent[s] = day
+        return len(symbols)
+
+    def _load(self, symbols: list[str]):
+        """Read the latest version of symbols not yet in memory (caller holds the lock)"""
+        pending = [s for s in symbols if s not in self._memo]
+        if not pending:
+            return
+        conn = self._connect()
+        for i in range(0, len(pending), 500):
+            chunk = pending[i:i + 500]
+            rows = conn.execute(
+                f"SELECT {', '.join(_COLUMNS[:-1])} FROM security_meta "
+                f"WHERE symbol IN ({', '.join('?' * len(chunk))}) ORDER BY trading_date",
+                chunk,
+            ).fetchall()
+            found = {}
+            for row in rows:
+                # Ordered by date, so the last row per symbol is its latest version
+                found[row[0]] = SecurityMeta(*row[:-1], stock_derivatives=json.loads(row[-1] or "[]"))
+            absent = dict(conn.execute(
+                f"SELECT symbol, trading_date FROM security_missing WHERE symbol IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall())
+            for symbol in chunk:
+                self._memo[symbol] = found.get(symbol)
+                self._absent[symbol] = absent.get(symbol)
+
+    def get(self, symbol: str):
+        """Latest known metadata for symbol, or None"""
+        return self.get_many([symbol]).get(symbol)
+
+    def get_many(self, symbols: list[str]) -> dict:
+        """:return: dict symbol -> SecurityMeta for every symbol with a stored version"""
+        with self._lock:
+            self._load(symbols)
+            return {s: self._memo[s] for s in symbols if self._memo.get(s) is not None}
+
+    def missing(self, symbols: list[str], today: str = None) -> list[str]:
+        """
+        Symbols with no stored version, or whose latest one is older than max_age_days;
+        symbols static_info already returned nothing for today are left out.
+        """
+        today = today or trading_date()
+        cutoff = (datetime.fromisoformat(today) - timedelta(days=self.max_age_days)).date().isoformat()
+        known = self.get_many(symbols)
+        return [s for s in symbols
+                if (s not in known or known[s].trading_date < cutoff) and self._absent.get(s) != today]
+
+    def prune(self, keep: int = 3, today: str = None) -> int:
+        """Delete all but the newest `keep` versions per symbol, and negative rows of past days"""
+        today = today or trading_date()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                cur = conn.execute(
+                    "DELETE FROM security_meta WHERE rowid IN ("
+                    " SELECT rowid FROM ("
+                    "  SELECT rowid, ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY trading_date DESC) AS rn"
+                    "  FROM security_meta) WHERE rn > ?)",
+                    (keep,),
+                )
+                conn.execute("DELETE FROM security_missing WHERE trading_date < ?", (today,))
+            return cur.rowcount
+
+    async def ensure(self, ctx, symbols: list[str]) -> dict:
+        """
+        Make sure metadata for symbols is available, calling ctx.static_info only
+        for symbols that are unknown or stale. Old versions are pruned once per
+        trading day.
+        :return: dict symbol -> SecurityMeta
+        """
+        symbols = list(dict.fromkeys(symbols))
+        today = trading_date()
+        if self._pruned_day != today:
+            self._pruned_day = today
+            pruned = await asyncio.to_thread(self.prune, today=today)
+            if pruned:
+                logger.info(f"Metadata: pruned {pruned} old versions")
+        missing = await asyncio.to_thread(self.missing, symbols, today)
+        if missing:
+            # Imported here to avoid a cycle: pull.quote uses this store for names
+            from src.api.longport.pull.quote import fetch_chunks
+            failed = []
+            infos = await fetch_chunks(ctx.static_info, missing, "static info", failed=failed)
+            if infos:
+                await asyncio.to_thread(self.upsert_static_infos, infos, today)
+            # Failed chunks are retried next call; answered-but-absent symbols wait a day
+            returned = {info.symbol for info in infos} | set(failed)
+            await asyncio.to_thread(self.mark_absent, [s for s in missing if s not in returned], today)
+            logger.info(f"Metadata: {len(symbols) - len(missing)} symbols from disk, fetched {len(infos)}/{len(missing)}")
+        return await asyncio.to_thread(self.get_many, symbols)
+
+# Global metadata store (the database is opened on first use)
+metadata_store = MetadataStore()
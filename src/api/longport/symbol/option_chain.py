@@ -0,0 +1,207 @@
+import asyncio
+import bisect
+import logging
+from datetime import date, datetime
+from config.settings import Settings
+from src.api.longport.client import longport_client
+from src.api.longport.symbol.metadata import trading_date
+
+logger = logging.getLogger(__name__)
+
+class ChainSpec:
+    """Expansion rule for one underlying (from `option_chains` in symbols.yaml)"""
+    __slots__ = ("underlying", "expiries", "window_pct", "sides", "standard_only")
+
+    def __init__(self, underlying: str, expiries: int = None, window_pct: float = None,
+                 sides: str = "both", standard_only: bool = True):
+        self.underlying = underlying
+        self.expiries = int(expiries or Settings.OPTION_EXPIRIES)
+        self.window_pct = float(window_pct if window_pct is not None else Settings.OPTION_WINDOW_PCT)
+        self.sides = sides
+        self.standard_only = standard_only
+
+    @classmethod
+    def from_config(cls, config: dict = None) -> list["ChainSpec"]:
+        """Specs for OPTION_UNDERLYINGS plus the `option_chains` yaml entries (yaml wins)"""
+        if config is None:
+            config = Settings.SYMBOLS_CONFIG
+        specs = {u: cls(u) for u in Settings.OPTION_UNDERLYINGS}
+        for entry in config.get('option_chains') or []:
+            entry = dict(entry)
+            underlying = entry.pop('underlying')
+            specs[underlying] = cls(underlying, **entry)
+        return list(specs.values())
+
+class _Window:
+    """Resolved strikes across the tracked expiries, sorted by strike"""
+    __slots__ = ("day", "strikes", "contracts", "lo", "hi", "center")
+
+    def __init__(self, day: str, strikes: list[float], contracts: list[tuple]):
+        self.day = day
+        self.strikes = strikes
+        self.contracts = contracts  # aligned with strikes: tuple of contract symbols
+        # Strike index range currently subscribed (-1 = not applied yet)
+        self.lo = self.hi = -1
+        self.center = None
+
+class OptionChainExpander:
+    """
+    Subscribe the options around each underlying's live price.
+
+    Expiry dates and strikes are fetched once per trading day and cached. The
+    strikes of the nearest `expiries` expiries are kept in one sorted list, so
+    the moneyness window [price * (1 - w), price * (1 + w)] is two bisects.
+    Underlying pushes only record the latest price (`observe`, O(1) on the SDK
+    thread); a periodic step re-centres a window once the price has moved more
+    than OPTION_RECENTER_PCT and hands the new contract set to the
+    SubscriptionManager, which (un)subscribes only the strikes that entered or
+    left the window.
+    """
+
+    def __init__(self, manager, specs: list[ChainSpec] = None, interval: float = None, recenter_pct: float = None):
+        self.manager = manager
+        self.specs = {s.underlying: s for s in (specs if specs is not None else ChainSpec.from_config())}
+        self.interval = interval or Settings.OPTION_REBALANCE_INTERVAL
+        self.recenter_pct = Settings.OPTION_RECENTER_PCT if recenter_pct is None else recenter_pct
+        self.prices = {}
+        self._windows = {}
+        # (underlying, day) -> expiry list; (underlying, expiry, day) -> strike infos
+        self._expiry_cache = {}
+        self._strike_cache = {}
+        self._task = None
+
+    @property
+    def underlyings(self) -> list[str]:
+        return list(self.specs)
+
+    def observe(self, symbol: str, event):
+        """SDK callback hook: remember the latest underlying price"""
+        if symbol in self.specs:
+            last = getattr(event, 'last_done', None)
+            if last:
+                self.prices[symbol] = float(last)
+
+    async def start(self):
+        if not self.specs:
+            return
+        await self.manager.set_source("option-underlyings", self.underlyings)
+        # Seed prices so the first windows do not wait for a push; without them the
+        # first push and the next rebalance fill the windows instead
+        try:
+            ctx = await longport_client.get_quote_context()
+            for q in await ctx.quote(self.underlyings):
+                self.prices.setdefault(q.symbol, float(q.last_done))
+        except Exception as e:
+            logger.error(f"Failed to seed option underlying prices: {e}")
+        await self.rebalance()
+        self._task = asyncio.create_task(self._run(), name="option-chain-expander")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def expiries(self, underlying: str, day: str = None) -> list[date]:
+        day = day or trading_date()
+        key = (underlying, day)
+        if key not in self._expiry_cache:
+            ctx = await longport_client.get_quote_context()
+            self._expiry_cache[key] = sorted(await ctx.option_chain_expiry_date_list(underlying))
+        return self._expiry_cache[key]
+
+    async def strikes(self, underlying: str, expiry: date, day: str = None) -> list:
+        day = day or trading_date()
+        key = (underlying, expiry, day)
+        if key not in self._strike_cache:
+            ctx = await longport_client.get_quote_context()
+            self._strike_cache[key] = await ctx.option_chain_info_by_date(underlying, expiry)
+        return self._strike_cache[key]
+
+    async def resolve(self, spec: ChainSpec, day: str = None) -> _Window:
+        """Build the sorted strike list for the nearest expiries (cached per trading day)"""
+        day = day or trading_date()
+        today = date.fromisoformat(day)
+        expiries = [e for e in await self.expiries(spec.underlying, day) if _as_date(e) >= today][:spec.expiries]
+        infos = await asyncio.gather(*(self.strikes(spec.underlying, e, day) for e in expiries))
+
+        by_strike = {}
+        for strike_infos in infos:
+            for info in strike_infos:
+                if spec.standard_only and not getattr(info, 'standard', True):
+                    continue
+                contracts = []
+                if spec.sides in ("both", "call") and info.call_symbol:
+                    contracts.append(info.call_symbol)
+                if spec.sides in ("both", "put") and info.put_symbol:
+                    contracts.append(info.put_symbol)
+                by_strike.setdefault(float(info.price), []).extend(contracts)
+
+        strikes = sorted(by_strike)
+        window = _Window(day, strikes, [tuple(by_strike[s]) for s in strikes])
+        logger.info(f"Resolved {spec.underlying} chain: {len(expiries)} expiries, {len(strikes)} strikes")
+        return window
+
+    def _drop_old_days(self, day: str):
+        self._expiry_cache = {k: v for k, v in self._expiry_cache.items() if k[-1] == day}
+        self._strike_cache = {k: v for k, v in self._strike_cache.items() if k[-1] == day}
+
+    async def rebalance(self, day: str = None) -> int:
+        """
+        Re-centre windows whose underlying moved enough; returns how many changed.
+        """
+        day = day or trading_date()
+        changed = 0
+        for underlying, spec in self.specs.items():
+            price = self.prices.get(underlying)
+            if not price:
+                continue
+            try:
+                window = self._windows.get(underlying)
+                if window is None or window.day != day:
+                    self._drop_old_days(day)
+                    window = self._windows[underlying] = await self.resolve(spec, day)
+                elif window.center and abs(price / window.center - 1) * 100 < self.recenter_pct:
+                    continue
+                if await self._shift(underlying, spec, window, price):
+                    changed += 1
+            except Exception as e:
+                logger.error(f"Failed to rebalance option window for {underlying}: {e}")
+        return changed
+
+    async def _shift(self, underlying: str, spec: ChainSpec, window: _Window, price: float) -> bool:
+        w = spec.window_pct / 100
+        lo = bisect.bisect_left(window.strikes, price * (1 - w))
+        hi = bisect.bisect_right(window.strikes, price * (1 + w))
+        if (lo, hi) == (window.lo, window.hi):
+            window.center = price
+            return False
+        contracts = [c for group in window.contracts[lo:hi] for c in group]
+        added, removed = await self.manager.set_source(f"options:{underlying}", contracts)
+        # Only a window the server accepted counts as moved; a failed subscribe retries next pass
+        window.center = price
+        window.lo, window.hi = lo, hi
+        if added or removed:
+            logger.info(f"{underlying} @ {price}: option window {window.strikes[lo] if lo < hi else '-'}"
+                        f"..{window.strikes[hi - 1] if lo < hi else '-'} (+{len(added)} -{len(removed)})")
+        return True
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.rebalance()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Option chain rebalance failed: {e}")
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
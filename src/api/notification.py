@@ -6,11 +6,21 @@ logger = logging.getLogger(__name__)
 
 class AlertManager:
     @staticmethod
-    def send_feishu(message: str):
-        """Send alert to Feishu"""
+    def format_message(title: str, content: str) -> str:
+        """Build the full alert text shared by all channels"""
+        return f"【美股期权监控】\n{title}\n\n{content}"
+
+    @staticmethod
+    def send_feishu(message: str, session: requests.Session = None) -> bool:
+        """
+        Send alert to Feishu
+        :param message: Alert text
+        :param session: Optional keep-alive session (used by the async notifier)
+        :return: True if the webhook acknowledged the message
+        """
         webhook = Settings.FEISHU_WEBHOOK
         if not webhook:
-            return
+            return False
 
         headers = {'Content-Type': 'application/json'}
         data = {
@@ -19,20 +29,28 @@ class AlertManager:
                 "text": message
             }
         }
-        
+
         try:
-            response = requests.post(webhook, headers=headers, json=data, timeout=10)
+            post = session.post if session is not None else requests.post
+            response = post(webhook, headers=headers, json=data, timeout=Settings.ALERT_TIMEOUT)
             response.raise_for_status()
             logger.info("Feishu alert sent successfully")
+            return True
         except Exception as e:
             logger.error(f"Failed to send Feishu alert: {e}")
+            return False
 
     @staticmethod
-    def send_dingtalk(message: str):
-        """Send alert to DingTalk"""
+    def send_dingtalk(message: str, session: requests.Session = None) -> bool:
+        """
+        Send alert to DingTalk
+        :param message: Alert text
+        :param session: Optional keep-alive session (used by the async notifier)
+        :return: True if the webhook acknowledged the message
+        """
         webhook = Settings.DINGTALK_WEBHOOK
         if not webhook:
-            return
+            return False
 
         headers = {'Content-Type': 'application/json'}
         data = {
@@ -43,20 +61,33 @@ class AlertManager:
         }
 
         try:
-            response = requests.post(webhook, headers=headers, json=data, timeout=10)
+            post = session.post if session is not None else requests.post
+            response = post(webhook, headers=headers, json=data, timeout=Settings.ALERT_TIMEOUT)
             response.raise_for_status()
             logger.info("DingTalk alert sent successfully")
+            return True
         except Exception as e:
             logger.error(f"Failed to send DingTalk alert: {e}")
+            return False
+
+    @staticmethod
+    def channels():
+        """Return (name, sender) pairs for every configured channel"""
+        result = []
+        if Settings.FEISHU_WEBHOOK:
+            result.append(("feishu", AlertManager.send_feishu))
+        if Settings.DINGTALK_WEBHOOK:
+            result.append(("dingtalk", AlertManager.send_dingtalk))
+        return result
 
     @staticmethod
     def send_alert(title: str, content: str):
-        """Send alert to all configured channels"""
-        full_message = f"【美股期权监控】\n{title}\n\n{content}"
-        
+        """Send alert to all configured channels (blocking)"""
+        full_message = AlertManager.format_message(title, content)
+
         # Log to console/file first
         logger.info(f"ALERT: {full_message}")
-        
+
         # Send to configured channels
         AlertManager.send_feishu(full_message)
         AlertManager.send_dingtalk(full_message)
@@ -0,0 +1,149 @@
+import queue
+import threading
+import time
+import logging
+import requests
+from config.settings import Settings
+from src.api.notification import AlertManager
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+class AlertNotifier:
+    """
+    Non-blocking alert delivery.
+
+    `submit` only formats the message and enqueues one job per configured
+    channel, so the quote callback never waits on network I/O. A pool of
+    worker threads drains the bounded queue, each with its own keep-alive
+    `requests.Session`, which lets Feishu and DingTalk be delivered in
+    parallel. When the queue is full, new jobs are dropped and counted
+    instead of blocking the producer.
+    """
+
+    def __init__(self, max_queue: int = None, workers: int = None):
+        self.max_queue = max_queue or Settings.ALERT_QUEUE_SIZE
+        self.workers = workers or Settings.ALERT_WORKERS
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._running = False
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,   # alerts accepted by submit()
+            "enqueued": 0,    # channel jobs put on the queue
+            "dropped": 0,     # channel jobs rejected because the queue was full
+            "sent": 0,        # channel jobs acknowledged by the webhook
+            "failed": 0,      # channel jobs that errored or timed out
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        """Start the worker pool (idempotent)"""
+        with self._lock:
+            if self._running:
+                return
+            self._stop_event.clear()
+            self._running = True
+            for i in range(self.workers):
+                t = threading.Thread(target=self._worker, name=f"alert-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+        logger.info(f"Alert notifier started with {self.workers} workers (queue size {self.max_queue})")
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the worker pool after draining already queued jobs"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            self._stop_event.set()
+            threads, self._threads = self._threads, []
+
+        deadline = time.monotonic() + timeout
+        for t in threads:
+            t.join(max(0.0, deadline - time.monotonic()))
+        logger.info(f"Alert notifier stopped: {self.stats()}")
+
+    def submit(self, title: str, content: str, origin: float = None) -> bool:
+        """
+        Queue an alert for every configured channel without blocking.
+        :param origin: Epoch seconds when the underlying signal fired (for end-to-end latency)
+        :return: False if at least one channel job was dropped
+        """
+        if not self._running:
+            self.start()
+
+        message = AlertManager.format_message(title, content)
+        logger.info("ALERT: %s", message)
+
+        enqueued_at = time.monotonic()
+        if origin is None:
+            origin = time.time()
+        accepted = dropped = 0
+        for name, sender in AlertManager.channels():
+            try:
+                self._queue.put_nowait((name, sender, message, enqueued_at, origin))
+                accepted += 1
+            except queue.Full:
+                dropped += 1
+
+        with self._stats_lock:
+            self._stats["submitted"] += 1
+            self._stats["enqueued"] += accepted
+            self._stats["dropped"] += dropped
+
+        metrics.inc("alerts_submitted_total")
+        if dropped:
+            metrics.inc("alert_jobs_dropped_total", value=dropped)
+            logger.warning(f"Alert queue full, dropped {dropped} channel job(s)")
+        return dropped == 0
+
+    def stats(self) -> dict:
+        """Snapshot of the backpressure counters"""
+        with self._stats_lock:
+            snapshot = dict(self._stats)
+        snapshot["queue_depth"] = self._queue.qsize()
+        return snapshot
+
+    def _worker(self):
+        session = requests.Session()
+        try:
+            while True:
+                try:
+                    name, sender, message, enqueued_at, origin = self._queue.get(timeout=0.2)
+                except queue.Empty:
+                    if self._stop_event.is_set():
+                        return
+                    continue
+
+                try:
+                    ok = sender(message, session=session)
+                except Exception as e:
+                    logger.error(f"Unexpected error delivering {name} alert: {e}")
+                    ok = False
+                finally:
+                    self._queue.task_done()
+
+                with self._stats_lock:
+                    self._stats["sent" if ok else "failed"] += 1
+
+                elapsed = time.monotonic() - enqueued_at
+                if ok:
+                    metrics.inc("webhook_sent_total", channel=name)
+                    # Alert enqueued -> webhook acknowledged, and signal -> acknowledged
+                    metrics.observe("webhook_ack_latency_ms", elapsed * 1000, channel=name)
+                    metrics.observe("signal_to_ack_latency_ms", (time.time() - origin) * 1000, channel=name)
+                else:
+                    metrics.inc("webhook_failed_total", channel=name)
+                if elapsed > 5.0:
+                    logger.warning(f"{name} alert delivered {elapsed:.2f}s after enqueue")
+        finally:
+            session.close()
+
+# Global notifier instance
+alert_notifier = AlertNotifier()
@@ -0,0 +1,222 @@
+import threading
+import time
+import logging
+from collections import deque
+from datetime import datetime
+from config.settings import Settings
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which an order can no longer fill
+TERMINAL_STATUSES = {"Filled", "Rejected", "Canceled", "Expired", "PartialWithdrawal"}
+# Transitions worth a phone alert (PRD: fills, rejects and cancels)
+ALERT_STATUSES = {"Filled", "PartialFilled", "Rejected", "Canceled", "Expired", "PartialWithdrawal"}
+
+def _status_name(status) -> str:
+    """OrderStatus enum / string -> bare name, e.g. 'OrderStatus.Filled' -> 'Filled'"""
+    return str(status).rsplit(".", 1)[-1]
+
+def _float(value) -> float:
+    try:
+        return float(value) if value is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+class TrackedOrder:
+    __slots__ = ("order_id", "symbol", "side", "status", "submitted_quantity", "submitted_price",
+                 "executed_quantity", "executed_price", "updated_at", "msg")
+
+    def __init__(self, order_id: str, symbol: str, side: str):
+        self.order_id = order_id
+        self.symbol = symbol
+        self.side = side
+        self.status = "Submitted"
+        self.submitted_quantity = 0.0
+        self.submitted_price = 0.0
+        self.executed_quantity = 0.0
+        self.executed_price = 0.0
+        self.updated_at = None
+        self.msg = ""
+
+    @property
+    def is_open(self) -> bool:
+        return self.status not in TERMINAL_STATUSES
+
+    def __repr__(self):
+        return (f"TrackedOrder({self.order_id} {self.side} {self.symbol} {self.status} "
+                f"{self.executed_quantity:g}/{self.submitted_quantity:g})")
+
+class OrderTracker:
+    """
+    Order lifecycle from the trade-context order-changed push.
+
+    Only orders placed by this process are tracked: ones registered by the
+    ExecutionEngine, or whose remark starts with ORDER_REMARK_TAG (a push can
+    arrive before the submit call returns). Pushes for other orders on the
+    account are ignored. Orders are indexed by order id, and open orders
+    additionally by symbol; finished orders are dropped ORDER_RETENTION seconds
+    after they close. Positions are the net of tracked fills since start
+    (optionally seeded once from `stock_positions`). Every lookup is a dict
+    access, and the tracker never polls `today_orders`, so quote quota is left
+    for market data. Fills, rejects and cancels are sent to the alert notifier.
+    """
+
+    def __init__(self, notifier=None, tag: str = None, retention: float = None, clock=None):
+        """
+        :param tag: Remark prefix marking our orders (defaults to ORDER_REMARK_TAG)
+        :param retention: Seconds a finished order is kept (defaults to ORDER_RETENTION)
+        """
+        self._notifier = notifier
+        self.tag = Settings.ORDER_REMARK_TAG if tag is None else tag
+        self.retention = Settings.ORDER_RETENTION if retention is None else retention
+        self._clock = clock or time.monotonic
+        self._lock = threading.Lock()
+        self._orders = {}
+        self._open_by_symbol = {}
+        self._positions = {}
+        # (closed_at, order_id) in closing order, for eviction
+        self._closed = deque()
+
+    @property
+    def notifier(self):
+        if self._notifier is None:
+            from src.api.notifier import alert_notifier
+            self._notifier = alert_notifier
+        return self._notifier
+
+    async def start(self, ctx, seed_positions: bool = True):
+        """Seed positions, then subscribe to private order pushes on the trade context"""
+        from longport.openapi import TopicType
+
+        # Seeding first: a fill pushed after subscribing is then never also in the snapshot
+        if seed_positions:
+            try:
+                self.seed_positions(await ctx.stock_positions())
+            except Exception as e:
+                logger.error(f"Failed to seed positions: {e}")
+        ctx.set_on_order_changed(self.on_order_changed)
+        await ctx.subscribe([TopicType.Private])
+        logger.info("Order tracker subscribed to order-changed pushes")
+
+    def seed_positions(self, response):
+        """Load starting positions from a StockPositionsResponse"""
+        with self._lock:
+            for channel in getattr(response, 'channels', None) or []:
+                for pos in getattr(channel, 'positions', None) or []:
+                    self._positions[pos.symbol] = self._positions.get(pos.symbol, 0.0) + _float(pos.quantity)
+
+    def register(self, order_id: str, symbol: str, side: str, quantity: float = 0, price: float = None):
+        """Record an order we just submitted, before its first push arrives"""
+        with self._lock:
+            if order_id in self._orders:
+                return
+            order = TrackedOrder(order_id, symbol, side)
+            order.submitted_quantity = float(quantity)
+            order.submitted_price = _float(price)
+            order.updated_at = datetime.now()
+            self._orders[order_id] = order
+            self._open_by_symbol.setdefault(symbol, {})[order_id] = order
+
+    def on_order_changed(self, event):
+        """SDK callback for PushOrderChanged"""
+        try:
+            self._apply(event)
+        except Exception as e:
+            logger.error(f"Error handling order push: {e}")
+
+    def is_ours(self, order_id: str, remark) -> bool:
+        return order_id in self._orders or bool(self.tag and str(remark or "").startswith(self.tag))
+
+    def _apply(self, event):
+        order_id = str(event.order_id)
+        status = _status_name(event.status)
+        side = _status_name(getattr(event, 'side', ''))
+
+        with self._lock:
+            self._evict()
+            order = self._orders.get(order_id)
+            if order is None:
+                if not self.is_ours(order_id, getattr(event, 'remark', None)):
+                    logger.debug(f"Ignoring push for order {order_id} not placed by this process")
+                    return
+                order = self._orders[order_id] = TrackedOrder(order_id, event.symbol, side)
+            previous = order.status
+            filled_before = order.executed_quantity
+
+            order.side = side or order.side
+            order.status = status
+            order.submitted_quantity = _float(getattr(event, 'submitted_quantity', order.submitted_quantity))
+            order.submitted_price = _float(getattr(event, 'submitted_price', order.submitted_price))
+            order.executed_quantity = max(filled_before, _float(getattr(event, 'executed_quantity', 0)))
+            order.executed_price = _float(getattr(event, 'executed_price', order.executed_price))
+            order.updated_at = getattr(event, 'updated_at', None) or datetime.now()
+            order.msg = getattr(event, 'msg', '') or ''
+
+            # Fills move the position by the newly executed quantity only (pushes may repeat)
+            delta = order.executed_quantity - filled_before
+            if delta > 0:
+                signed = delta if order.side.lower() == "buy" else -delta
+                self._positions[order.symbol] = self._positions.get(order.symbol, 0.0) + signed
+
+            open_orders = self._open_by_symbol.setdefault(order.symbol, {})
+            if order.is_open:
+                open_orders[order_id] = order
+            else:
+                open_orders.pop(order_id, None)
+                if not open_orders:
+                    del self._open_by_symbol[order.symbol]
+                if previous not in TERMINAL_STATUSES:
+                    self._closed.append((self._clock(), order_id))
+
+        if status == previous and delta <= 0:
+            return
+        metrics.inc("order_transitions_total", status=status)
+        logger.info(f"Order {order_id} {previous} -> {status}: {order}")
+        if status in ALERT_STATUSES:
+            self._alert(order, previous)
+
+    def _evict(self):
+        """Drop orders finished more than `retention` seconds ago; caller holds the lock"""
+        cutoff = self._clock() - self.retention
+        while self._closed and self._closed[0][0] <= cutoff:
+            _, order_id = self._closed.popleft()
+            order = self._orders.get(order_id)
+            if order is not None and not order.is_open:
+                del self._orders[order_id]
+
+    def _alert(self, order: TrackedOrder, previous: str):
+        title = f"Order {order.status}: {order.side} {order.symbol}"
+        content = (
+            f"Order ID: {order.order_id}\n"
+            f"Status: {previous} -> {order.status}\n"
+            f"Filled: {order.executed_quantity:g}/{order.submitted_quantity:g} @ {order.executed_price:g}\n"
+            f"Limit: {order.submitted_price:g}\n"
+            f"Position: {self.position(order.symbol):g}"
+        )
+        if order.msg:
+            content += f"\nMessage: {order.msg}"
+        self.notifier.submit(title, content)
+
+    def get(self, order_id: str):
+        return self._orders.get(str(order_id))
+
+    def open_orders(self, symbol: str = None) -> list[TrackedOrder]:
+        """Open orders for one symbol (O(1) lookup), or all open orders"""
+        with self._lock:
+            if symbol is not None:
+                return list(self._open_by_symbol.get(symbol, {}).values())
+            return [o for orders in self._open_by_symbol.values() for o in orders.values()]
+
+    def has_open_orders(self, symbol: str) -> bool:
+        return bool(self._open_by_symbol.get(symbol))
+
+    def position(self, symbol: str) -> float:
+        return self._positions.get(symbol, 0.0)
+
+    def positions(self) -> dict:
+        with self._lock:
+            return {s: q for s, q in self._positions.items() if q}
+
+# Global order tracker
+order_tracker = OrderTracker()
@@ -1,5 +1,3 @@
-from longport.openapi import TradeContext, Config as LongPortConfig
-from longport.openapi import OrderSide, OrderType, TimeInForceType
 from config.settings import Settings
 import logging
 from decimal import Decimal
@@ -14,11 +12,13 @@ class TradeManager:
             self._init_context()
 
     def _init_context(self):
+        from longport.openapi import TradeContext, Config as LongPortConfig
+
         try:
             lp_config = LongPortConfig(
-                app_key=Settings.LB_APP_KEY,
-                app_secret=Settings.LB_APP_SECRET,
-                access_token=Settings.LB_ACCESS_TOKEN
+                app_key=Settings.LONGPORT_APP_KEY,
+                app_secret=Settings.LONGPORT_APP_SECRET,
+                access_token=Settings.LONGPORT_ACCESS_TOKEN
             )
             self.ctx = TradeContext(lp_config)
             logger.info("TradeContext initialized successfully")
@@ -38,6 +38,8 @@ class TradeManager:
             logger.warning("Trading is disabled. Skipping order submission.")
             return
 
+        from longport.openapi import OrderSide, OrderType, TimeInForceType
+
         try:
             # Map side string to OrderSide enum
             order_side = OrderSide.Buy if side.lower() == "buy" else OrderSide.Sell
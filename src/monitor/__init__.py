@@ -1,3 +1,8 @@
-from .core import MonitorSystem
-
 __all__ = ['MonitorSystem']
+
+def __getattr__(name):
+    # Resolved lazily: shard workers import src.monitor.sharding without the Monitor stack
+    if name == 'MonitorSystem':
+        from .core import MonitorSystem
+        return MonitorSystem
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+import logging
+from collections import defaultdict
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import numpy as np
+from config.settings import Settings
+from src.analysis.bars import BarAggregator
+from src.utils.columnar import BAR_COLUMNS, append_columns, read_bars
+
+logger = logging.getLogger(__name__)
+
+_US_EASTERN = ZoneInfo("America/New_York")
+
+# Directory label per bar interval (seconds)
+INTERVAL_LABELS = {1: "1s", 60: "1m"}
+
+class BarRecorder:
+    """
+    Build 1s and 1m bars from trade pushes and persist them as columnar files.
+
+    The SDK callback only folds each trade into the aggregators (O(1), no I/O).
+    A background thread closes bars of quiet symbols, drains completed bars
+    every BAR_FLUSH_INTERVAL seconds and writes them partitioned by New York
+    date and symbol:
+        <dir>/<1s|1m>/<YYYY-MM-DD>/<SYMBOL>/<column>.bin
+    Each partition holds one raw array file per BAR_COLUMNS name; a flush appends
+    its rows to every column file, so a day leaves one file per column instead of
+    one per flush, and a reader loads only the columns it opens.
+    """
+
+    def __init__(self, directory: str = None, intervals=(1, 60), flush_interval: float = None,
+                 grace: float = None, clock=None):
+        """
+        :param grace: Seconds after a bar's end before a quiet symbol's bar is closed
+        """
+        self.directory = directory or Settings.BARS_DIR
+        self.flush_interval = flush_interval or Settings.BAR_FLUSH_INTERVAL
+        self.grace = Settings.BAR_CLOSE_GRACE if grace is None else grace
+        self._clock = clock or time.time
+        self.aggregators = [BarAggregator(interval) for interval in intervals]
+        self._stop = threading.Event()
+        self._thread = None
+        self._write_lock = threading.Lock()
+        self.trades = 0
+        self.bars_written = 0
+
+    def on_trades(self, symbol: str, event):
+        """SDK trade callback: fold every trade of the push into the open bars"""
+        for trade in getattr(event, 'trades', None) or []:
+            try:
+                ts = trade.timestamp
+                ts = ts.timestamp() if isinstance(ts, datetime) else float(ts)
+                price = float(trade.price)
+                volume = int(trade.volume)
+            except Exception as e:
+                logger.error(f"Skipping malformed trade for {symbol}: {e}")
+                continue
+            for aggregator in self.aggregators:
+                aggregator.update(symbol, ts, price, volume)
+            self.trades += 1
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="bar-writer", daemon=True)
+            self._thread.start()
+            logger.info(f"Writing bars to {self.directory}")
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush bars: {e}")
+
+    def flush(self, close_all: bool = False) -> int:
+        """Close due bars (all open bars with close_all) and write completed ones"""
+        written = 0
+        now = self._clock()
+        for aggregator in self.aggregators:
+            if close_all:
+                aggregator.close_all()
+            else:
+                aggregator.close_due(now, self.grace)
+            symbols, columns = aggregator.drain()
+            if symbols:
+                written += self._write(aggregator.interval, symbols, columns)
+        return written
+
+    def _write(self, interval: int, symbols: list[str], columns: dict) -> int:
+        label = INTERVAL_LABELS.get(interval, f"{interval}s")
+        # Partition key per row; the New York date is computed once per hour bucket
+        days = {}
+        groups = defaultdict(list)
+        for i, (symbol, start) in enumerate(zip(symbols, columns["start"].tolist())):
+            hour = start // 3600
+            day = days.get(hour)
+            if day is None:
+                day = days[hour] = datetime.fromtimestamp(start, _US_EASTERN).date().isoformat()
+            groups[(day, symbol)].append(i)
+
+        with self._write_lock:
+            for (day, symbol), rows in groups.items():
+                rows = np.asarray(rows)
+                path = os.path.join(self.directory, label, day, symbol)
+                append_columns(path, {name: columns[name][rows] for name in BAR_COLUMNS})
+        self.bars_written += len(symbols)
+        return len(symbols)
+
+    def load(self, symbol: str, interval: int, day: str) -> dict:
+        """Bars of one partition as BAR_COLUMNS arrays, sorted by start"""
+        label = INTERVAL_LABELS.get(interval, f"{interval}s")
+        return read_bars(os.path.join(self.directory, label, day, symbol))
+
+    def close(self):
+        """Stop the writer thread and persist every open bar"""
+        if self._thread:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        try:
+            self.flush(close_all=True)
+        except Exception as e:
+            logger.error(f"Failed to flush bars on close: {e}")
+        late = ", ".join(f"{INTERVAL_LABELS.get(a.interval, f'{a.interval}s')}={a.late_trades}"
+                         for a in self.aggregators)
+        logger.info(f"Bar recorder closed after {self.trades} trades, {self.bars_written} bars "
+                    f"(late trades dropped: {late})")
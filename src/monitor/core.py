@@ -1,28 +1,235 @@
 import asyncio
-from longport.openapi import SubType
 from config.settings import Settings
 from src.utils.logger import logger
+from src.analysis.quotes import quote_store
 from src.api.longport.client import longport_client
 from src.api.longport.push.handler import push_handler
+from src.api.longport.symbol.metadata import metadata_store
+from src.api.longport.subscribe.manager import SubscriptionManager
+from src.api.longport.subscribe.scheduler import SubscriptionScheduler
+from src.api.longport.personalized.watchlist import WatchlistSync
+from src.api.longport.pull.quote import fetch_chunks
+from src.api.longport.symbol.option_chain import ChainSpec, OptionChainExpander
+from src.api.notifier import alert_notifier
+from src.api.execution import execution_engine
+from src.monitor.sharding import ShardedAnalyzer
+from src.monitor.ingest import ConflatingIngestor
+from src.monitor.metrics_server import MetricsServer
+from src.monitor.recorder import QuoteRecorder
+from src.monitor.bars import BarRecorder
+from src.monitor.supervisor import ConnectionSupervisor
+from src.monitor.startup import StartupTimer
 
 class Monitor:
     def __init__(self):
+        from longport.openapi import SubType
+
         self.ctx = None
+        self.sharded = None
+        # SDK callback threads only drop pushes into latest-value slots; analysis runs on the loop
+        self.quote_ingestor = ConflatingIngestor(push_handler.on_quote_batch, name="quote")
+        self.depth_ingestor = ConflatingIngestor(self._on_depth_batch, name="depth")
+        self.metrics_server = MetricsServer() if Settings.METRICS_ENABLED else None
+        self.recorder = QuoteRecorder() if Settings.RECORD_ENABLED else None
+        self.bars = BarRecorder() if Settings.BARS_ENABLED else None
+        self._quote_sink = None
+        self._background_tasks = set()
+        # Quote + level-2 depth (+ trades for bars) for the union of config symbols and (optionally) the watchlist
+        sub_types = [SubType.Quote, SubType.Depth]
+        if self.bars:
+            sub_types.append(SubType.Trade)
+        self.subscriptions = SubscriptionManager(sub_types=sub_types, budget=Settings.SUBSCRIPTION_BUDGET)
+        self.subscriptions.add_listener(self._on_subscriptions_changed)
+        self.watchlist_sync = WatchlistSync(self.subscriptions) if Settings.WATCHLIST_SYNC_ENABLED else None
+        specs = ChainSpec.from_config()
+        self.option_chains = OptionChainExpander(self.subscriptions, specs) if specs else None
+        # Over budget, the most active symbols keep push and the rest are polled
+        self.scheduler = None
+        if Settings.SUBSCRIPTION_BUDGET > 0:
+            self.scheduler = SubscriptionScheduler(self.subscriptions, sink=self._on_polled)
+            # Option windows re-centre on the underlying's price, so underlyings stay on push
+            self.scheduler.pin(spec.underlying for spec in specs)
+            push_handler.add_signal_listener(self.scheduler.note_signal)
+        self.supervisor = ConnectionSupervisor(
+            connect=self._reconnect_context,
+            on_connected=self._on_connected,
+            probe=self._probe,
+        )
+
+    @staticmethod
+    def _on_depth_batch(items: list):
+        for symbol, event in items:
+            push_handler.on_depth(symbol, event)
+
+    def _on_quote(self, symbol: str, event):
+        """SDK quote callback: record (optional), then hand off for analysis"""
+        self.supervisor.beat()
+        # Latest price for pull callers (get_quote) without another API call
+        quote_store.update(symbol, event)
+        if self.option_chains:
+            self.option_chains.observe(symbol, event)
+        if self.scheduler:
+            self.scheduler.observe(symbol, event)
+        if self.recorder:
+            self.recorder.record_quote(symbol, event)
+        self._quote_sink(symbol, event)
+
+    def _on_depth(self, symbol: str, event):
+        """SDK depth callback: record (optional), then hand off for analysis"""
+        self.supervisor.beat()
+        if self.recorder:
+            self.recorder.record_depth(symbol, event)
+        self.depth_ingestor.on_push(symbol, event)
+
+    def _on_trades(self, symbol: str, event):
+        """SDK trade callback: O(1) bar updates; files are written by the bar writer thread"""
+        self.supervisor.beat()
+        self.bars.on_trades(symbol, event)
+
+    def _set_callbacks(self, ctx):
+        ctx.set_on_quote(self._on_quote)
+        ctx.set_on_depth(self._on_depth)
+        if self.bars:
+            ctx.set_on_trades(self._on_trades)
+
+    def _on_subscriptions_changed(self, added: list, removed: list):
+        """Warm metadata (and prev_close) for newly subscribed symbols without delaying their pushes"""
+        if added:
+            # Names / lot sizes come from the local store; only unknown symbols hit static_info
+            self._background(metadata_store.ensure(self.ctx, added))
+            # Pushes carry no prev_close; symbols never snapshotted or polled need one
+            unseeded = [s for s in added if not (quote_store.get(s) and quote_store.get(s).prev_close > 0)]
+            if unseeded:
+                self._background(self._snapshot(self.ctx, unseeded))
+
+    def _background(self, coro):
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    @staticmethod
+    async def _reconnect_context():
+        longport_client.reset_quote_context()
+        return await longport_client.get_quote_context()
+
+    @staticmethod
+    async def _probe(ctx):
+        # Cheap request on the same connection as the pushes
+        await ctx.trading_session()
+
+    def _analyze_snapshot(self, items: list):
+        """Run ctx.quote snapshots [(symbol, quote)] through the strategy"""
+        quote_store.update_many(items)
+        if self.recorder:
+            # Replays need the prev_close that only snapshots and polls carry
+            for symbol, q in items:
+                self.recorder.record_quote(symbol, q)
+        if self.sharded:
+            # Same rings as the SDK push thread; ShmRing.push serialises the two producers
+            for symbol, q in items:
+                self.sharded.on_quote(symbol, q)
+        else:
+            # Snapshot quotes carry prev_close, which also re-seeds the batch engine
+            push_handler.on_quote_batch(items)
+
+    def _on_polled(self, items: list):
+        """Quotes of symbols outside the subscription budget, polled by the scheduler"""
+        if self.option_chains:
+            for symbol, q in items:
+                self.option_chains.observe(symbol, q)
+        self._analyze_snapshot(items)
 
-    async def start(self):
-        """Start the monitoring system"""
+    async def _snapshot(self, ctx, symbols: list[str]) -> int:
+        """Feed a ctx.quote snapshot of symbols through the strategy; seeds prev_close for later pushes"""
+        if not symbols:
+            return 0
+        quotes = await fetch_chunks(ctx.quote, symbols, "snapshot quotes")
+        self._analyze_snapshot([(q.symbol, q) for q in quotes])
+        return len(quotes)
+
+    async def _gap_fill(self, ctx):
+        """Feed a ctx.quote snapshot of every subscribed symbol through the strategy"""
+        symbols = sorted(self.subscriptions.subscribed)
+        if not symbols:
+            return
+        count = await self._snapshot(ctx, symbols)
+        logger.info(f"Gap-filled {count}/{len(symbols)} symbols from snapshot")
+
+    async def _on_connected(self, ctx):
+        """Bring a fresh context to the state of the old one"""
+        self.ctx = ctx
+        self._set_callbacks(ctx)
+        # Snapshot before resubscribing so state is current when pushes resume
+        await self._gap_fill(ctx)
+        await self.subscriptions.restore(ctx)
+
+    async def start(self, timer: StartupTimer = None):
+        """
+        Start the monitoring system
+        :param timer: StartupTimer the phases are added to (a report is logged at the end)
+        """
         logger.info(f"Monitored Symbols: {Settings.MONITOR_SYMBOLS}")
+        timer = timer or StartupTimer()
         
         try:
-            self.ctx = await longport_client.get_quote_context()
+            # Quote and trade contexts connect concurrently; order fills / rejects /
+            # cancels arrive by push once the trade context is up
+            connecting = [timer.timed("quote_context", longport_client.get_quote_context())]
+            if execution_engine.enabled:
+                connecting.append(timer.timed("trade_context", execution_engine.start()))
+            with timer.phase("connect"):
+                self.ctx, *_ = await asyncio.gather(*connecting)
+
+            # Start alert workers before the first push can produce a signal
+            alert_notifier.start()
+            push_handler.coalescer.start()
+            # Threshold edits in symbols.yaml take effect without a restart
+            push_handler.rules.start()
             
-            # Set callback
-            self.ctx.set_on_quote(push_handler.on_quote)
+            # Set callbacks
+            if Settings.SHARD_WORKERS > 0:
+                # Quotes are analyzed in worker processes; signals come back to the coalescer
+                self.sharded = ShardedAnalyzer(sink=push_handler.dispatch)
+                self.sharded.start()
+                self._quote_sink = self.sharded.on_quote
+            else:
+                self.quote_ingestor.start()
+                self._quote_sink = self.quote_ingestor.on_push
+            self.depth_ingestor.start()
+            if self.bars:
+                self.bars.start()
+            self._set_callbacks(self.ctx)
             
-            # Subscribe to quotes
-            # Note: SubType.Quote is standard for basic price updates
-            await self.ctx.subscribe(Settings.MONITOR_SYMBOLS, [SubType.Quote], is_first_push=True)
-            logger.info("Subscribed to quotes successfully.")
+            # Subscribe to quotes and level-2 depth
+            # Note: SubType.Quote is standard for basic price updates; bid/ask only arrive via SubType.Depth
+            # First subscription goes out before any secondary work; metadata
+            # warmup and the prev_close snapshot for the new symbols run afterwards
+            # as background tasks
+            self.subscriptions.bind(self.ctx)
+            with timer.phase("subscribe"):
+                await self.subscriptions.set_source("config", Settings.MONITOR_SYMBOLS)
+            logger.info("Subscribed to quotes and depth successfully.")
+
+            with timer.phase("background"):
+                # Later watchlist edits only (un)subscribe the symbols that changed
+                if self.watchlist_sync:
+                    self.watchlist_sync.start()
+
+                # Options around each underlying's live price; the window follows the price
+                if self.option_chains:
+                    await self.option_chains.start()
+
+                # Re-rank push vs poll tiers and poll whatever did not fit the budget
+                if self.scheduler:
+                    self.scheduler.start()
+
+                # Reconnect on a dead stream; restores callbacks, state and subscriptions
+                self.supervisor.start(self.ctx)
+
+                if self.metrics_server:
+                    self.metrics_server.start()
+
+            timer.report()
             
         except Exception as e:
             logger.critical(f"System crashed during startup: {e}")
@@ -30,5 +237,39 @@ class Monitor:
 
     async def stop(self):
         logger.info("Stopping system...")
-        # Add unsubscribe or context cleanup if SDK supports it
-        pass
+        await self.supervisor.stop()
+        await push_handler.rules.stop()
+        if self.scheduler:
+            await self.scheduler.stop()
+        if self.watchlist_sync:
+            await self.watchlist_sync.stop()
+        if self.option_chains:
+            await self.option_chains.stop()
+        for task in list(self._background_tasks):
+            task.cancel()
+        if self.ctx is not None:
+            try:
+                await asyncio.wait_for(self.subscriptions.clear(), Settings.HEARTBEAT_PROBE_TIMEOUT)
+            except Exception as e:
+                logger.warning(f"Failed to unsubscribe on shutdown: {e}")
+        await self.quote_ingestor.stop()
+        await self.depth_ingestor.stop()
+        if self.sharded:
+            await asyncio.to_thread(self.sharded.stop)
+        if self.recorder:
+            self.recorder.close()
+        if self.bars:
+            # Writes the bars still open
+            await asyncio.to_thread(self.bars.close)
+        # Flush pending digests, then pending alerts; both block, so keep them off the event loop
+        await asyncio.to_thread(push_handler.coalescer.stop)
+        await asyncio.to_thread(alert_notifier.stop)
+        if self.metrics_server:
+            await asyncio.to_thread(self.metrics_server.stop)
+        metadata_store.close()
+        longport_client.reset_quote_context()
+        self.ctx = None
+        logger.info("System stopped.")
+
+# Alias for backward compatibility
+MonitorSystem = Monitor
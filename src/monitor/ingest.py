@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+import logging
+from datetime import datetime
+from config.settings import Settings
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+class ConflatingIngestor:
+    """
+    Hand pushes from SDK callback threads to the asyncio event loop.
+
+    The callback only stores the event in a per-symbol latest-value slot and,
+    if no drain is already scheduled, wakes the loop with `call_soon_threadsafe`.
+    While a symbol waits to be processed, newer ticks overwrite the pending one
+    (counted as `conflated`), so the backlog is bounded by the number of symbols
+    and end-to-end latency by one drain cycle. New symbols beyond `max_pending`
+    are dropped and counted.
+    """
+
+    def __init__(self, handler, name: str = "quote", max_pending: int = None):
+        """
+        :param handler: Callable receiving a list of (symbol, event), run on the event loop
+        :param name: Label used in logs and stats
+        :param max_pending: Max distinct symbols waiting at once
+        """
+        self.handler = handler
+        self.name = name
+        self.max_pending = max_pending or Settings.INGEST_MAX_PENDING
+        self._latest = {}
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._loop = None
+        self._wakeup = None
+        self._task = None
+        self._stats = {"received": 0, "conflated": 0, "dropped": 0, "processed": 0, "batches": 0}
+        self.max_batch_ms = 0.0
+
+    def start(self, loop: asyncio.AbstractEventLoop = None):
+        """Start draining on the given (or running) event loop"""
+        self._loop = loop or asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._run(), name=f"ingest-{self.name}")
+        with self._lock:
+            if self._latest:
+                self._scheduled = True
+                self._wakeup.set()
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        logger.info(f"Ingestor '{self.name}' stopped: {self.stats()}")
+
+    def on_push(self, symbol: str, event):
+        """SDK callback: O(1), never blocks on analysis or I/O"""
+        received_at = time.time()
+        metrics.inc("pushes_received_total", stream=self.name)
+        # Exchange timestamp -> callback entry (includes clock skew against the exchange)
+        ts = getattr(event, 'timestamp', None)
+        if isinstance(ts, datetime):
+            metrics.observe("push_latency_ms", (received_at - ts.timestamp()) * 1000, stream=self.name)
+
+        with self._lock:
+            self._stats["received"] += 1
+            if symbol in self._latest:
+                self._stats["conflated"] += 1
+                metrics.inc("pushes_conflated_total", stream=self.name)
+            elif len(self._latest) >= self.max_pending:
+                self._stats["dropped"] += 1
+                metrics.inc("pushes_dropped_total", stream=self.name)
+                return
+            self._latest[symbol] = (event, received_at)
+            if self._scheduled or self._loop is None:
+                return
+            self._scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # Event loop already closed during shutdown
+            pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["pending"] = len(self._latest)
+        snapshot["max_batch_ms"] = round(self.max_batch_ms, 3)
+        return snapshot
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            with self._lock:
+                batch, self._latest = self._latest, {}
+                self._scheduled = False
+            if not batch:
+                continue
+
+            start = time.perf_counter()
+            try:
+                self.handler([(symbol, event) for symbol, (event, _) in batch.items()])
+            except Exception as e:
+                logger.error(f"Error processing {self.name} batch of {len(batch)}: {e}")
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if elapsed_ms > self.max_batch_ms:
+                self.max_batch_ms = elapsed_ms
+
+            # Callback entry -> analysis done, per conflated tick
+            done = time.time()
+            for _, received_at in batch.values():
+                metrics.observe("analysis_latency_ms", (done - received_at) * 1000, stream=self.name)
+
+            with self._lock:
+                self._stats["processed"] += len(batch)
+                self._stats["batches"] += 1
+            metrics.inc("pushes_processed_total", value=len(batch), stream=self.name)
+            # Let other coroutines run between drains
+            await asyncio.sleep(0)
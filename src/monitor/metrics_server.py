@@ -0,0 +1,59 @@
+import threading
+import logging
+from config.settings import Settings
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+def create_app(registry=metrics):
+    """Flask app exposing /metrics (Prometheus text) and /metrics.json"""
+    from flask import Flask, Response, jsonify
+
+    app = Flask("longbridge-metrics")
+
+    @app.route("/metrics")
+    def prometheus():
+        return Response(registry.render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+    @app.route("/metrics.json")
+    def snapshot():
+        return jsonify(registry.snapshot())
+
+    @app.route("/healthz")
+    def healthz():
+        return "ok"
+
+    return app
+
+class MetricsServer:
+    """Serve the metrics app from a daemon thread, bound to localhost by default"""
+
+    def __init__(self, host: str = None, port: int = None, registry=metrics):
+        self.host = host or Settings.METRICS_HOST
+        self.port = Settings.METRICS_PORT if port is None else port
+        self.registry = registry
+        self._server = None
+        self._thread = None
+
+    def start(self) -> bool:
+        try:
+            from werkzeug.serving import make_server
+            self._server = make_server(self.host, self.port, create_app(self.registry), threaded=True)
+        except ImportError:
+            logger.warning("Flask is not installed, /metrics endpoint disabled")
+            return False
+        except OSError as e:
+            logger.error(f"Failed to bind metrics endpoint on {self.host}:{self.port}: {e}")
+            return False
+
+        self.port = self._server.server_port
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Metrics endpoint listening on http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._thread.join(timeout=5)
+            self._server = None
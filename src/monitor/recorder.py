@@ -0,0 +1,308 @@
+import argparse
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+import logging
+from datetime import datetime
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# File layout: MAGIC + version, then a stream of tagged records.
+MAGIC = b"LBQR"
+VERSION = 1
+_FILE_HEADER = struct.Struct("<4sH")
+
+REC_SYMBOL = 1
+REC_QUOTE = 2
+REC_DEPTH = 3
+
+# tag, symbol id, name length (+ name bytes)
+_SYMBOL = struct.Struct("<BHB")
+# tag, symbol id, received_at, exchange ts, last, open, high, low, prev_close, volume, turnover
+_QUOTE = struct.Struct("<BH7dqd")
+# tag, symbol id, received_at, bid levels, ask levels (+ levels)
+_DEPTH = struct.Struct("<BHdBB")
+# position, price, volume
+_LEVEL = struct.Struct("<Bdd")
+
+def _float(value) -> float:
+    try:
+        return float(value) if value is not None else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+class QuoteRecorder:
+    """
+    Append every push event to a compact binary log, one file per day.
+    Snapshot and poll quotes are recorded as quote records too: they are the only
+    ones carrying prev_close, which a replay needs to evaluate pushes.
+
+    Symbols are interned per file (a 2-byte id after their first appearance), so a
+    quote costs 75 bytes on disk and one struct.pack into a 1MB write buffer.
+    """
+
+    def __init__(self, directory: str = None, buffer_size: int = 1 << 20):
+        self.directory = directory or Settings.RECORD_DIR
+        self.buffer_size = buffer_size
+        self._lock = threading.Lock()
+        self._file = None
+        self._day = None
+        self._symbols = {}
+        self.events = 0
+
+    def path_for(self, day: str) -> str:
+        return os.path.join(self.directory, f"quotes-{day}.lbr")
+
+    def _open(self, day: str):
+        if self._file:
+            self._file.close()
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(day)
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "ab", buffering=self.buffer_size)
+        if is_new:
+            self._file.write(_FILE_HEADER.pack(MAGIC, VERSION))
+        # Symbol ids are scoped to a file; appending to an existing file re-declares them
+        self._symbols = {}
+        self._day = day
+        logger.info(f"Recording push events to {path}")
+
+    def _symbol_id(self, symbol: str) -> int:
+        sid = self._symbols.get(symbol)
+        if sid is None:
+            sid = self._symbols[symbol] = len(self._symbols)
+            name = symbol.encode()
+            self._file.write(_SYMBOL.pack(REC_SYMBOL, sid, len(name)) + name)
+        return sid
+
+    def _prepare(self, now: float):
+        day = datetime.fromtimestamp(now).strftime("%Y%m%d")
+        if day != self._day:
+            self._open(day)
+
+    def record_quote(self, symbol: str, event, received_at: float = None):
+        now = received_at or time.time()
+        ts = getattr(event, 'timestamp', None)
+        ts = ts.timestamp() if isinstance(ts, datetime) else math.nan
+        volume = getattr(event, 'volume', 0)
+        try:
+            with self._lock:
+                self._prepare(now)
+                self._file.write(_QUOTE.pack(
+                    REC_QUOTE, self._symbol_id(symbol), now, ts,
+                    _float(getattr(event, 'last_done', None)),
+                    _float(getattr(event, 'open', None)),
+                    _float(getattr(event, 'high', None)),
+                    _float(getattr(event, 'low', None)),
+                    _float(getattr(event, 'prev_close', None)),
+                    int(volume) if isinstance(volume, (int, float)) else 0,
+                    _float(getattr(event, 'turnover', None)),
+                ))
+                self.events += 1
+        except Exception as e:
+            logger.error(f"Failed to record quote for {symbol}: {e}")
+
+    def record_depth(self, symbol: str, event, received_at: float = None):
+        now = received_at or time.time()
+        bids = getattr(event, 'bids', None) or []
+        asks = getattr(event, 'asks', None) or []
+        try:
+            parts = []
+            for levels in (bids, asks):
+                for i, level in enumerate(levels[:255]):
+                    parts.append(_LEVEL.pack(
+                        getattr(level, 'position', 0) or i + 1,
+                        _float(level.price),
+                        _float(level.volume),
+                    ))
+            with self._lock:
+                self._prepare(now)
+                sid = self._symbol_id(symbol)
+                self._file.write(_DEPTH.pack(REC_DEPTH, sid, now, min(len(bids), 255), min(len(asks), 255)))
+                self._file.write(b"".join(parts))
+                self.events += 1
+        except Exception as e:
+            logger.error(f"Failed to record depth for {symbol}: {e}")
+
+    def flush(self):
+        with self._lock:
+            if self._file:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+                self._day = None
+        logger.info(f"Recorder closed after {self.events} events")
+
+class ReplayQuote:
+    """Quote push rebuilt from a recording"""
+    __slots__ = ("symbol", "timestamp", "last_done", "open", "high", "low", "prev_close", "volume", "turnover")
+
+    def __repr__(self):
+        return f"ReplayQuote(symbol={self.symbol}, last_done={self.last_done}, timestamp={self.timestamp})"
+
+class ReplayLevel:
+    __slots__ = ("position", "price", "volume")
+
+    def __init__(self, position: int, price: float, volume: float):
+        self.position = position
+        self.price = price
+        self.volume = volume
+
+class ReplayDepth:
+    __slots__ = ("symbol", "bids", "asks")
+
+def _nan_to_none(value: float):
+    return None if math.isnan(value) else value
+
+class QuoteReplayer:
+    """Memory-map a recording and feed it back through a PushHandler"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def events(self):
+        """
+        Iterate recorded events in order.
+        :return: Generator of (kind, symbol, event, received_at) with kind 'quote' or 'depth'
+        """
+        with open(self.path, "rb") as f:
+            if os.path.getsize(self.path) <= _FILE_HEADER.size:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                magic, version = _FILE_HEADER.unpack_from(buf, 0)
+                if magic != MAGIC:
+                    raise ValueError(f"{self.path} is not a quote recording")
+                if version != VERSION:
+                    raise ValueError(f"Unsupported recording version {version}")
+
+                symbols = {}
+                offset = _FILE_HEADER.size
+                end = len(buf)
+                while offset < end:
+                    tag = buf[offset]
+                    if tag == REC_SYMBOL:
+                        _, sid, length = _SYMBOL.unpack_from(buf, offset)
+                        offset += _SYMBOL.size
+                        symbols[sid] = bytes(buf[offset:offset + length]).decode()
+                        offset += length
+                    elif tag == REC_QUOTE:
+                        if offset + _QUOTE.size > end:
+                            break  # truncated tail (process killed mid-write)
+                        (_, sid, received_at, ts, last, open_, high, low,
+                         prev_close, volume, turnover) = _QUOTE.unpack_from(buf, offset)
+                        offset += _QUOTE.size
+                        quote = ReplayQuote()
+                        quote.symbol = symbols[sid]
+                        quote.timestamp = datetime.fromtimestamp(ts) if not math.isnan(ts) else None
+                        quote.last_done = _nan_to_none(last)
+                        quote.open = _nan_to_none(open_)
+                        quote.high = _nan_to_none(high)
+                        quote.low = _nan_to_none(low)
+                        quote.prev_close = _nan_to_none(prev_close)
+                        quote.volume = volume
+                        quote.turnover = _nan_to_none(turnover)
+                        yield "quote", quote.symbol, quote, received_at
+                    elif tag == REC_DEPTH:
+                        _, sid, received_at, n_bids, n_asks = _DEPTH.unpack_from(buf, offset)
+                        offset += _DEPTH.size
+                        if offset + (n_bids + n_asks) * _LEVEL.size > end:
+                            break
+                        levels = [ReplayLevel(*_LEVEL.unpack_from(buf, offset + i * _LEVEL.size))
+                                  for i in range(n_bids + n_asks)]
+                        offset += (n_bids + n_asks) * _LEVEL.size
+                        depth = ReplayDepth()
+                        depth.symbol = symbols[sid]
+                        depth.bids = levels[:n_bids]
+                        depth.asks = levels[n_bids:]
+                        yield "depth", depth.symbol, depth, received_at
+                    else:
+                        raise ValueError(f"Corrupt recording at offset {offset}")
+
+    def replay(self, handler, speed: float = 0.0, clock=None) -> int:
+        """
+        Feed the recording through handler.on_quote_batch / handler.on_depth.
+        Quotes go through the batch engine as live pushes do, one event per batch
+        so the result does not depend on replay timing; recorded snapshot and poll
+        quotes carry the prev_close that later pushes are measured against.
+        :param speed: 1 for real time, N for N times faster, 0 for as fast as possible
+        :param clock: Optional ReplayClock advanced to each event's recorded time
+        :return: Number of events replayed
+        """
+        count = 0
+        first_recorded = wall_start = None
+        for kind, symbol, event, received_at in self.events():
+            if speed > 0:
+                if first_recorded is None:
+                    first_recorded, wall_start = received_at, time.monotonic()
+                delay = (received_at - first_recorded) / speed - (time.monotonic() - wall_start)
+                if delay > 0:
+                    time.sleep(delay)
+            if clock is not None:
+                clock.now = received_at
+            if kind == "quote":
+                handler.on_quote_batch([(symbol, event)])
+            else:
+                handler.on_depth(symbol, event)
+            count += 1
+        return count
+
+class ReplayClock:
+    """Monotonic clock driven by recorded event times, so cooldowns follow replay time"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class CollectingSink:
+    """Alert sink that records alerts instead of calling webhooks"""
+
+    def __init__(self):
+        self.alerts = []
+
+    def submit(self, title: str, content: str, origin: float = None) -> bool:
+        self.alerts.append((title, content))
+        logger.info(f"[replay] ALERT suppressed: {title}")
+        return True
+
+def build_replay_handler(live_alerts: bool = False, clock: ReplayClock = None):
+    """PushHandler for replays; webhooks are suppressed unless live_alerts is set"""
+    from src.api.longport.push.handler import PushHandler
+    from src.analysis.coalescer import AlertCoalescer
+    from src.api.notifier import alert_notifier
+
+    notifier = alert_notifier if live_alerts else CollectingSink()
+    config = dict(Settings.SYMBOLS_CONFIG.get('alerts') or {})
+    config['digest_window'] = 0
+    coalescer = AlertCoalescer(sink=notifier.submit, config=config, clock=clock)
+    return PushHandler(notifier=notifier, coalescer=coalescer)
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded quote stream through the strategy")
+    parser.add_argument("path", help="Recording file (quotes-YYYYMMDD.lbr)")
+    parser.add_argument("--speed", type=float, default=0.0, help="1 = real time, N = N x faster, 0 = max speed")
+    parser.add_argument("--live-alerts", action="store_true", help="Send alerts to the real webhooks")
+    args = parser.parse_args()
+
+    Settings.load()
+    clock = ReplayClock()
+    handler = build_replay_handler(args.live_alerts, clock)
+    start = time.perf_counter()
+    count = QuoteReplayer(args.path).replay(handler, speed=args.speed, clock=clock)
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {count} events in {elapsed:.2f}s")
+    print(f"Coalescer: {handler.coalescer.stats()}")
+    if isinstance(handler.notifier, CollectingSink):
+        print(f"Suppressed alerts: {len(handler.notifier.alerts)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import math
+import queue
+import struct
+import threading
+import time
+import zlib
+import logging
+import multiprocessing as mp
+from datetime import datetime
+from multiprocessing import shared_memory
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# symbol, timestamp, last_done, prev_close, best bid, best ask, cumulative volume
+_RECORD = struct.Struct("<32s6d")
+# head (next write seq, owned by producer), tail (next read seq, owned by consumer)
+_HEADER = struct.Struct("<QQ")
+
+class ShmRing:
+    """
+    Single-consumer ring of fixed-size quote records in shared memory.
+
+    The producer side only writes `head` and the consumer only writes `tail`, so no
+    lock is needed across processes; a record is published by bumping `head` after
+    it has been written. The ingest process has two producer threads per ring (SDK
+    pushes, and snapshots / polls from the event loop), so `push` takes a per-ring
+    lock in the producer process; one ring per shard keeps each symbol's records in
+    arrival order. The consumer side stays lock-free.
+    """
+
+    def __init__(self, capacity: int, name: str = None):
+        self.capacity = capacity
+        size = _HEADER.size + capacity * _RECORD.size
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            _HEADER.pack_into(self.shm.buf, 0, 0, 0)
+            self._owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self._owner = False
+        self.name = self.shm.name
+        self._push_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        head, tail = _HEADER.unpack_from(self.shm.buf, 0)
+        return head - tail
+
+    def push(self, symbol: bytes, ts: float, last: float, prev_close: float,
+             bid: float, ask: float, volume: float) -> bool:
+        """Append one record; returns False (and writes nothing) if the ring is full"""
+        buf = self.shm.buf
+        with self._push_lock:
+            head, tail = _HEADER.unpack_from(buf, 0)
+            if head - tail >= self.capacity:
+                return False
+            offset = _HEADER.size + (head % self.capacity) * _RECORD.size
+            _RECORD.pack_into(buf, offset, symbol, ts, last, prev_close, bid, ask, volume)
+            struct.pack_into("<Q", buf, 0, head + 1)
+        return True
+
+    def pop_many(self, max_records: int = 256) -> list[tuple]:
+        """Consume up to max_records records in FIFO order"""
+        buf = self.shm.buf
+        head, tail = _HEADER.unpack_from(buf, 0)
+        end = min(head, tail + max_records)
+        records = []
+        for seq in range(tail, end):
+            offset = _HEADER.size + (seq % self.capacity) * _RECORD.size
+            records.append(_RECORD.unpack_from(buf, offset))
+        if end != tail:
+            struct.pack_into("<Q", buf, 8, end)
+        return records
+
+    def close(self):
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+class ShardQuote:
+    """Minimal quote object rebuilt from a ring record, consumed by Strategy.analyze"""
+    __slots__ = ("symbol", "timestamp", "last_done", "prev_close", "bid_price", "ask_price", "volume")
+
+    def __init__(self, record: tuple):
+        symbol, ts, last, prev_close, bid, ask, volume = record
+        self.symbol = symbol.rstrip(b"\0").decode()
+        self.timestamp = ts
+        self.last_done = last
+        self.prev_close = prev_close if prev_close > 0 else None
+        self.bid_price = [bid] if not math.isnan(bid) else []
+        self.ask_price = [ask] if not math.isnan(ask) else []
+        self.volume = volume
+
+def _shard_worker(shard_id: int, ring_name: str, capacity: int, signal_queue, stop_event):
+    """Worker process: drain one ring through a private Strategy instance"""
+    # A spawned worker starts with unloaded settings (no-op when forked)
+    Settings.load()
+
+    from src.analysis.strategy import Strategy
+    from src.analysis.indicators import IndicatorStore
+
+    ring = ShmRing(capacity, name=ring_name)
+    strategy = Strategy(indicators=IndicatorStore())
+    # Pushes carry no prev_close; reuse the last one a snapshot / poll record brought
+    prev_closes = {}
+    idle = 0
+    try:
+        while True:
+            # Each worker watches symbols.yaml itself (rate-limited inside poll)
+            strategy.rules.poll()
+            records = ring.pop_many()
+            if not records:
+                if stop_event.is_set():
+                    break
+                # Back off from a hot spin to at most 1ms while the ring is empty
+                idle = min(idle + 1, 10)
+                time.sleep(0.0001 * idle)
+                continue
+            idle = 0
+            for record in records:
+                quote = ShardQuote(record)
+                if quote.prev_close:
+                    prev_closes[quote.symbol] = quote.prev_close
+                else:
+                    quote.prev_close = prev_closes.get(quote.symbol)
+                for sig in strategy.analyze(quote, quote.symbol):
+                    signal_queue.put(sig)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ring.close()
+
+class ShardedAnalyzer:
+    """
+    Fan quote pushes out to N analysis processes.
+
+    The ingest process keeps the LongPort connection; `on_quote` is registered as
+    the SDK callback, hashes the symbol to a shard (crc32, stable across restarts)
+    and copies the quote into that shard's shared-memory ring. Every symbol always
+    lands on the same single-consumer ring, so per-symbol ordering is preserved.
+    Signals come back on a multiprocessing queue (they are rare) and are handed to
+    `sink` (e.g. PushHandler.dispatch) by a collector thread. Depth pushes stay in
+    the ingest process.
+    """
+
+    def __init__(self, sink, workers: int = None, capacity: int = None, context: str = "spawn"):
+        self.sink = sink
+        self.workers = workers or Settings.SHARD_WORKERS
+        self.capacity = capacity or Settings.SHARD_RING_CAPACITY
+        self._ctx = mp.get_context(context)
+        self._rings = []
+        self._procs = []
+        self._signal_queue = None
+        self._stop_event = None
+        self._collector = None
+        self._encoded = {}
+        self.dropped = 0
+        self.forwarded = 0
+
+    def shard_of(self, symbol: str) -> int:
+        return zlib.crc32(symbol.encode()) % self.workers
+
+    def start(self):
+        self._signal_queue = self._ctx.Queue()
+        self._stop_event = self._ctx.Event()
+        for shard_id in range(self.workers):
+            ring = ShmRing(self.capacity)
+            proc = self._ctx.Process(
+                target=_shard_worker,
+                args=(shard_id, ring.name, self.capacity, self._signal_queue, self._stop_event),
+                name=f"shard-{shard_id}",
+                daemon=True,
+            )
+            proc.start()
+            self._rings.append(ring)
+            self._procs.append(proc)
+
+        self._collector = threading.Thread(target=self._collect, name="shard-collector", daemon=True)
+        self._collector.start()
+        logger.info(f"Started {self.workers} analysis shards (ring capacity {self.capacity})")
+
+    def stop(self, timeout: float = 5.0):
+        if not self._procs:
+            return
+        self._stop_event.set()
+        for proc in self._procs:
+            proc.join(timeout)
+            if proc.is_alive():
+                proc.terminate()
+        self._signal_queue.put(None)
+        self._collector.join(timeout)
+        for ring in self._rings:
+            ring.close()
+        self._procs, self._rings = [], []
+        logger.info(f"Stopped analysis shards: forwarded={self.forwarded}, dropped={self.dropped}")
+
+    def on_quote(self, symbol: str, event):
+        """SDK quote callback: copy the push into its shard's ring"""
+        try:
+            encoded = self._encoded.get(symbol)
+            if encoded is None:
+                encoded = self._encoded[symbol] = (symbol.encode()[:32], self.shard_of(symbol))
+            name, shard = encoded
+
+            ts = getattr(event, 'timestamp', None)
+            ts = ts.timestamp() if isinstance(ts, datetime) else time.time()
+            last = float(getattr(event, 'last_done', 0) or 0)
+            prev_close = float(getattr(event, 'prev_close', 0) or 0)
+            volume = float(getattr(event, 'volume', 0) or 0)
+            bid_price = getattr(event, 'bid_price', None)
+            ask_price = getattr(event, 'ask_price', None)
+            bid = float(bid_price[0]) if bid_price else math.nan
+            ask = float(ask_price[0]) if ask_price else math.nan
+
+            if self._rings[shard].push(name, ts, last, prev_close, bid, ask, volume):
+                self.forwarded += 1
+            else:
+                self.dropped += 1
+        except Exception as e:
+            logger.error(f"Error forwarding quote for {symbol}: {e}")
+
+    def _collect(self):
+        while True:
+            try:
+                sig = self._signal_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if sig is None:
+                return
+            try:
+                self.sink(sig)
+            except Exception as e:
+                logger.error(f"Error dispatching shard signal: {e}")
@@ -0,0 +1,43 @@
+import time
+from contextlib import contextmanager
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+class StartupTimer:
+    """Wall time of each startup phase, reported as one log line and as metrics"""
+
+    def __init__(self, started: float = None, clock=None):
+        """
+        :param started: perf_counter() value of process start (defaults to now)
+        """
+        self._clock = clock or time.perf_counter
+        self.started = self._clock() if started is None else started
+        self.phases = []
+
+    def record(self, name: str, ms: float):
+        """Add a phase measured elsewhere (e.g. Settings.load_ms)"""
+        self.phases.append((name, ms))
+        metrics.observe("startup_phase_ms", ms, phase=name)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block; also usable around an await inside a coroutine"""
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.record(name, (self._clock() - start) * 1000)
+
+    async def timed(self, name: str, coro):
+        """Await `coro` as its own phase (for phases run concurrently with gather)"""
+        with self.phase(name):
+            return await coro
+
+    def total_ms(self) -> float:
+        return (self._clock() - self.started) * 1000
+
+    def report(self) -> str:
+        parts = ", ".join(f"{name}={ms:.1f}ms" for name, ms in self.phases)
+        line = f"Startup finished in {self.total_ms():.1f}ms ({parts})"
+        logger.info(line)
+        return line
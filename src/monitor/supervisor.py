@@ -0,0 +1,120 @@
+import asyncio
+import random
+import time
+import logging
+from config.settings import Settings
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+class ConnectionSupervisor:
+    """
+    Detect a dead quote stream and rebuild the connection.
+
+    Every push calls `beat()`. When no push has arrived for `stale_after`
+    seconds the supervisor probes the context with a cheap request: quiet
+    markets answer it and count as a heartbeat, a dead connection does not.
+    On failure it reconnects with full-jitter exponential backoff, and each
+    attempt runs `connect()` then `on_connected(ctx)`, which is expected to
+    re-register callbacks, gap-fill state from a snapshot and restore
+    subscriptions.
+    """
+
+    def __init__(self, connect, on_connected, probe, stale_after: float = None, check_interval: float = None,
+                 probe_timeout: float = None, backoff_base: float = None, backoff_max: float = None, rng=None):
+        """
+        :param connect: async () -> new quote context
+        :param on_connected: async (ctx) -> None, restores state on the new context
+        :param probe: async (ctx) -> None, raises if the connection is unusable
+        """
+        self.connect = connect
+        self.on_connected = on_connected
+        self.probe = probe
+        self.stale_after = stale_after or Settings.HEARTBEAT_TIMEOUT
+        self.check_interval = check_interval or min(1.0, self.stale_after / 4)
+        self.probe_timeout = probe_timeout or Settings.HEARTBEAT_PROBE_TIMEOUT
+        self.backoff_base = backoff_base or Settings.RECONNECT_BACKOFF_BASE
+        self.backoff_max = backoff_max or Settings.RECONNECT_BACKOFF_MAX
+        self._rng = rng or random.Random()
+        self.ctx = None
+        self.last_beat = time.monotonic()
+        self.reconnects = 0
+        self._task = None
+
+    def beat(self):
+        """Record stream activity (called from SDK callback threads, O(1))"""
+        self.last_beat = time.monotonic()
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: uniform in [0, min(max, base * 2^attempt)]"""
+        return self._rng.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def start(self, ctx):
+        self.ctx = ctx
+        self.beat()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="connection-supervisor")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def check(self) -> bool:
+        """
+        One supervision step.
+        :return: True if a reconnect was performed
+        """
+        if time.monotonic() - self.last_beat < self.stale_after:
+            return False
+        try:
+            await asyncio.wait_for(self.probe(self.ctx), self.probe_timeout)
+            # Connection answers; the market is just quiet
+            self.beat()
+            return False
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Quote stream stale for {time.monotonic() - self.last_beat:.1f}s and probe failed: {e}")
+        await self.reconnect()
+        return True
+
+    async def reconnect(self):
+        """Recreate the context until it succeeds, backing off between attempts"""
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                ctx = await self.connect()
+                await self.on_connected(ctx)
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                delay = self.backoff(attempt)
+                attempt += 1
+                metrics.inc("reconnect_failures_total")
+                logger.error(f"Reconnect attempt {attempt} failed: {e}; retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+        self.ctx = ctx
+        self.reconnects += 1
+        self.beat()
+        elapsed = time.monotonic() - start
+        metrics.inc("reconnects_total")
+        metrics.observe("reconnect_duration_ms", elapsed * 1000)
+        logger.info(f"Quote connection restored in {elapsed:.2f}s after {attempt + 1} attempt(s)")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.check()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Connection supervisor error: {e}")
@@ -1,3 +1,8 @@
-from .logger import setup_logger
-
 __all__ = ['setup_logger']
+
+def __getattr__(name):
+    # Resolved lazily: importing src.utils.columnar & co. must not set up logging before Settings.load()
+    if name == 'setup_logger':
+        from .logger import setup_logger
+        return setup_logger
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
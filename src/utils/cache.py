@@ -0,0 +1,71 @@
+import threading
+import time
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    Small thread-safe key/value cache whose entries expire `ttl` seconds after
+    they were stored. Expired entries are dropped lazily on read; when
+    `max_size` is reached the oldest entries are evicted first.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 100000, clock=None):
+        """
+        :param ttl: Seconds an entry stays valid
+        :param max_size: Max number of entries kept
+        :param clock: Monotonic time source (tests inject a fake one)
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._clock = clock or time.monotonic
+        self._data = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key, default=None):
+        found, _ = self.get_many([key])
+        return found.get(key, default)
+
+    def get_many(self, keys) -> tuple[dict, list]:
+        """
+        Look up several keys under one lock acquisition.
+        :return: (dict of fresh hits, list of missing or expired keys in input order)
+        """
+        now = self._clock()
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key, _MISSING)
+                if entry is not _MISSING and entry[1] > now:
+                    found[key] = entry[0]
+                else:
+                    if entry is not _MISSING:
+                        del self._data[key]
+                    missing.append(key)
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def set(self, key, value):
+        self.set_many({key: value})
+
+    def set_many(self, items: dict):
+        expires_at = self._clock() + self.ttl
+        with self._lock:
+            for key, value in items.items():
+                # Re-insert so dict order stays oldest-first for eviction
+                self._data.pop(key, None)
+                self._data[key] = (value, expires_at)
+            overflow = len(self._data) - self.max_size
+            if overflow > 0:
+                for key in list(self._data)[:overflow]:
+                    del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
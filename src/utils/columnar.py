@@ -0,0 +1,86 @@
+import glob
+import os
+import numpy as np
+
+# OHLCV bar columns shared by live bars, the candlestick cache and the backtester
+BAR_COLUMNS = ("start", "open", "high", "low", "close", "volume", "turnover")
+_DTYPES = {"start": np.int64, "volume": np.int64}
+
+def empty_bars() -> dict:
+    return {name: np.empty(0, dtype=_DTYPES.get(name, np.float64)) for name in BAR_COLUMNS}
+
+def write_columns(path: str, columns: dict):
+    """
+    Write named arrays to one uncompressed .npz file.
+    Written to a temp file first and renamed, so readers never see a partial file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, **columns)
+    os.replace(tmp, path)
+
+def read_columns(path: str) -> dict:
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+def _column_path(directory: str, name: str) -> str:
+    return os.path.join(directory, f"{name}.bin")
+
+def _dtype(name: str):
+    return np.dtype(_DTYPES.get(name, np.float64))
+
+def _complete_rows(directory: str) -> int:
+    """Rows present in every BAR_COLUMNS file of a column directory"""
+    rows = []
+    for name in BAR_COLUMNS:
+        path = _column_path(directory, name)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        rows.append(size // _dtype(name).itemsize)
+    return min(rows)
+
+def append_columns(directory: str, columns: dict):
+    """
+    Append bars to a column directory: one raw array file per BAR_COLUMNS name.
+    Every file is first cut back to the rows all columns hold, so a flush torn by
+    a crash never leaves the columns misaligned.
+    """
+    os.makedirs(directory, exist_ok=True)
+    rows = _complete_rows(directory)
+    for name in BAR_COLUMNS:
+        dtype = _dtype(name)
+        with open(_column_path(directory, name), "ab") as f:
+            f.truncate(rows * dtype.itemsize)
+            f.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+
+def read_column_dir(directory: str) -> dict:
+    """Bars of a column directory, trimmed to the rows every column holds"""
+    rows = _complete_rows(directory)
+    out = {}
+    for name in BAR_COLUMNS:
+        dtype = _dtype(name)
+        with open(_column_path(directory, name), "rb") as f:
+            out[name] = np.frombuffer(f.read(rows * dtype.itemsize), dtype=dtype).copy()
+    return out
+
+def read_bar_file(path: str) -> dict:
+    """Bars from either layout: a .npz file or a column directory"""
+    return read_column_dir(path) if os.path.isdir(path) else read_columns(path)
+
+def concat_bars(parts: list[dict]) -> dict:
+    """Concatenate bar column dicts, sorted by start; later parts win on duplicate starts"""
+    parts = [p for p in parts if len(p["start"])]
+    if not parts:
+        return empty_bars()
+    merged = {name: np.concatenate([p[name] for p in parts]) for name in BAR_COLUMNS}
+    # Stable sort, then keep the last row of each start
+    order = np.argsort(merged["start"], kind="stable")
+    merged = {name: col[order] for name, col in merged.items()}
+    start = merged["start"]
+    keep = np.ones(len(start), dtype=bool)
+    keep[:-1] = start[1:] != start[:-1]
+    return {name: col[keep] for name, col in merged.items()}
+
+def read_bars(pattern: str) -> dict:
+    """Read and merge every bar file matching a glob pattern"""
+    return concat_bars([read_bar_file(path) for path in sorted(glob.glob(pattern))])
@@ -1,40 +1,184 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import multiprocessing as mp
+import queue
 import sys
 import os
+import time
+from datetime import datetime, timedelta
+from config.settings import Settings
 
-def setup_logger(name: str, log_file: str = "monitor.log", level=logging.INFO):
+class RotatingLogHandler(logging.handlers.RotatingFileHandler):
     """
-    Setup a logger with console and file handlers
+    File handler that rolls over at local midnight and whenever the file exceeds max_bytes.
+
+    Archives are named `<file>.<YYYY-MM-DD>.<n>`; only the newest backup_count are kept.
+    """
+
+    def __init__(self, filename: str, max_bytes: int = 0, backup_count: int = 0, encoding: str = 'utf-8'):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding)
+        self._day, self._rollover_at = self._current_day(time.time())
+
+    @staticmethod
+    def _current_day(now: float) -> tuple[str, float]:
+        today = datetime.fromtimestamp(now).date()
+        midnight = datetime.combine(today + timedelta(days=1), datetime.min.time())
+        return today.isoformat(), midnight.timestamp()
+
+    def shouldRollover(self, record) -> bool:
+        if record.created >= self._rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            n = 1
+            while os.path.exists(f"{self.baseFilename}.{self._day}.{n}"):
+                n += 1
+            os.rename(self.baseFilename, f"{self.baseFilename}.{self._day}.{n}")
+            self._prune()
+        self._day, self._rollover_at = self._current_day(time.time())
+        self.stream = self._open()
+
+    def _prune(self):
+        if self.backupCount <= 0:
+            return
+        directory, base = os.path.split(self.baseFilename)
+        directory = directory or "."
+        archives = [os.path.join(directory, name) for name in os.listdir(directory)
+                    if name.startswith(base + ".")]
+        archives.sort(key=os.path.getmtime)
+        for path in archives[:-self.backupCount]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg (+ exc)"""
+
+    def format(self, record) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that only merges msg % args on the caller; formatting happens on the listener"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+def _formatter(json_lines: bool) -> logging.Formatter:
+    if json_lines:
+        return JsonFormatter()
+    return logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+def setup_logger(name: str, log_file: str = "monitor.log", level=logging.INFO,
+                 max_bytes: int = None, backup_count: int = None, json_lines: bool = None):
     """
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    
+    Setup a logger with console and (rotating) file handlers
+    :param max_bytes: Roll the file over beyond this size (also rolled daily)
+    :param json_lines: Write the file as JSON lines instead of text
+    """
+    max_bytes = Settings.LOG_MAX_BYTES if max_bytes is None else max_bytes
+    backup_count = Settings.LOG_BACKUP_COUNT if backup_count is None else backup_count
+    json_lines = Settings.LOG_JSON if json_lines is None else json_lines
+    formatter = _formatter(False)
+
     # Create logger
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
-    # Avoid duplicate handlers
-    if logger.hasHandlers():
+
+    # Avoid duplicate handlers (own handlers only; a handler on the root logger does not count)
+    if logger.handlers:
         return logger
 
     # Console Handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
-    
+
     # File Handler
+    # Only the main process writes the file: rollover in one process would rename
+    # the file under the others' open handles (child processes log to the console)
+    if mp.parent_process() is not None:
+        return logger
+
     # Ensure logs directory exists if path contains directories
     log_dir = os.path.dirname(log_file)
     if log_dir and not os.path.exists(log_dir):
         os.makedirs(log_dir)
-        
+
     try:
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setFormatter(formatter)
+        file_handler = RotatingLogHandler(log_file, max_bytes=max_bytes, backup_count=backup_count)
+        file_handler.setFormatter(_formatter(json_lines))
         logger.addHandler(file_handler)
     except Exception as e:
         print(f"Failed to setup file logging: {e}")
-    
+
     return logger
 
+def enable_queue_logging(logger: logging.Logger, max_queue: int = None) -> logging.handlers.QueueListener:
+    """
+    Move the logger's handlers behind a queue drained by a background thread,
+    so callers (SDK callbacks, the event loop) never block on console or file I/O.
+    When the queue is full, records are dropped rather than blocking the caller.
+    """
+    max_queue = Settings.LOG_QUEUE_SIZE if max_queue is None else max_queue
+    handlers = logger.handlers[:]
+    log_queue = queue.Queue(max_queue)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(_LazyQueueHandler(log_queue))
+    listener.start()
+    # Drain what is queued before the interpreter exits
+    atexit.register(stop_queue_logging, listener)
+    return listener
+
+def share_handlers(logger: logging.Logger, *names: str):
+    """
+    Attach logger's handlers (and level) to the named loggers, so module loggers
+    below them (`logging.getLogger(__name__)`) propagate into the same console,
+    file and queue instead of falling through to logging.lastResort.
+    """
+    for name in names:
+        target = logging.getLogger(name)
+        target.setLevel(logger.level)
+        for handler in logger.handlers:
+            if handler not in target.handlers:
+                target.addHandler(handler)
+
+def stop_queue_logging(listener: logging.handlers.QueueListener):
+    """Flush pending records and stop the listener thread (safe to call twice)"""
+    if listener._thread is not None:
+        listener.stop()
+
 # Create a default global logger
-logger = setup_logger("LongBridgeMonitor")
+logger = setup_logger("LongBridgeMonitor", Settings.LOG_FILE, Settings.LOG_LEVEL)
+log_listener = enable_queue_logging(logger) if Settings.LOG_ASYNC else None
+# Every src.* module logger propagates to the "src" package logger
+share_handlers(logger, "src")
@@ -0,0 +1,150 @@
+import bisect
+import threading
+import time
+
+# Upper bounds in milliseconds; chosen around the PRD targets (300ms push, 5s alert)
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 200, 300, 500, 1000, 2000, 3000, 5000, 10000, 30000)
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted(labels.items()))) if labels else (name, ())
+
+def _render_labels(labels: tuple, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; observe() is O(log buckets) with no allocation"""
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, ms: float):
+        idx = bisect.bisect_left(self.buckets, ms)
+        with self._lock:
+            self._counts[idx] += 1
+            self._sum += ms
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket containing the q-quantile (inf if it overflowed)"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+        if total == 0:
+            return 0.0
+        rank = q * total
+        cumulative = 0
+        for i, c in enumerate(counts):
+            cumulative += c
+            if cumulative >= rank:
+                return float(self.buckets[i]) if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            count, total = self._count, self._sum
+        return {
+            "count": count,
+            "avg_ms": round(total / count, 3) if count else 0.0,
+            "p50_ms": self.quantile(0.50),
+            "p90_ms": self.quantile(0.90),
+            "p99_ms": self.quantile(0.99),
+        }
+
+    def render(self, name: str, labels: tuple) -> list[str]:
+        with self._lock:
+            counts = list(self._counts)
+            count, total = self._count, self._sum
+        lines = []
+        cumulative = 0
+        for bound, c in zip(self.buckets, counts):
+            cumulative += c
+            le = 'le="%s"' % bound
+            lines.append(f"{name}_bucket{_render_labels(labels, le)} {cumulative}")
+        le = 'le="+Inf"'
+        lines.append(f"{name}_bucket{_render_labels(labels, le)} {count}")
+        lines.append(f"{name}_sum{_render_labels(labels)} {total}")
+        lines.append(f"{name}_count{_render_labels(labels)} {count}")
+        return lines
+
+class MetricsRegistry:
+    """Process-wide counters and latency histograms, rendered for /metrics"""
+
+    def __init__(self):
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def inc(self, name: str, value: int = 1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, ms: float, **labels):
+        key = _key(name, labels)
+        hist = self._histograms.get(key)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(key, LatencyHistogram())
+        hist.observe(ms)
+
+    def counter(self, name: str, **labels) -> int:
+        return self._counters.get(_key(name, labels), 0)
+
+    def histogram(self, name: str, **labels) -> LatencyHistogram:
+        return self._histograms.get(_key(name, labels))
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started_at = time.time()
+
+    def snapshot(self) -> dict:
+        """JSON-friendly view with per-second rates and histogram quantiles"""
+        uptime = max(time.time() - self.started_at, 1e-9)
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = dict(self._histograms)
+
+        result = {"uptime_seconds": round(uptime, 1), "counters": {}, "rates_per_second": {}, "latency": {}}
+        for (name, labels), value in sorted(counters.items()):
+            label = name + _render_labels(labels)
+            result["counters"][label] = value
+            result["rates_per_second"][label] = round(value / uptime, 3)
+        for (name, labels), hist in sorted(histograms.items()):
+            result["latency"][name + _render_labels(labels)] = hist.snapshot()
+        return result
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = dict(self._histograms)
+
+        lines = []
+        seen = set()
+        for (name, labels), value in sorted(counters.items()):
+            if name not in seen:
+                lines.append(f"# TYPE {name} counter")
+                seen.add(name)
+            lines.append(f"{name}{_render_labels(labels)} {value}")
+        for (name, labels), hist in sorted(histograms.items()):
+            if name not in seen:
+                lines.append(f"# TYPE {name} histogram")
+                seen.add(name)
+            lines.extend(hist.render(name, labels))
+        return "\n".join(lines) + "\n"
+
+# Global metrics registry
+metrics = MetricsRegistry()
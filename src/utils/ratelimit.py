@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+class AsyncRateLimiter:
+    """
+    Token bucket for async callers: at most `rate` acquisitions per second on
+    average, with bursts of up to `burst`. Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int = None, clock=None, sleep=None):
+        """
+        :param rate: Tokens added per second
+        :param burst: Bucket size (defaults to max(1, rate))
+        :param clock: Monotonic time source; `sleep` must advance it (tests inject both)
+        """
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._clock = clock or time.monotonic
+        self._sleep = sleep or asyncio.sleep
+        self._tokens = float(self.burst)
+        self._updated = self._clock()
+        self._lock = None
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await self._sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
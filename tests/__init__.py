@@ -0,0 +1,4 @@
+from config.settings import Settings
+
+# Test modules import src.*, whose singletons read settings at import
+Settings.load()
@@ -0,0 +1,182 @@
+import sys
+import shutil
+import tempfile
+from unittest.mock import MagicMock
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import os
+import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import numpy as np
+from src.analysis.backtest import (Backtester, frame_from_bars, load_bar_frames, load_recording_frames,
+                                   parse_grid, sweep)
+from src.monitor.recorder import QuoteRecorder
+from src.utils.columnar import append_columns, write_columns
+
+def quote_frame(prices, prev_close=100.0, step=60.0):
+    n = len(prices)
+    return {
+        "time": np.arange(n) * step,
+        "price": np.asarray(prices, dtype=float),
+        "prev_close": np.full(n, prev_close),
+        "bid": np.full(n, np.nan),
+        "ask": np.full(n, np.nan),
+        "is_quote": np.ones(n, dtype=bool),
+    }
+
+def book_frame(spreads, price=10.0, step=60.0):
+    n = len(spreads)
+    spreads = np.asarray(spreads, dtype=float)
+    return {
+        "time": np.arange(n) * step,
+        "price": np.full(n, price),
+        "prev_close": np.full(n, price),
+        "bid": np.full(n, price) - spreads / 2,
+        "ask": np.full(n, price) + spreads / 2,
+        "is_quote": np.zeros(n, dtype=bool),
+    }
+
+class TestPriceRule(unittest.TestCase):
+    def test_counts_runs_and_forward_returns(self):
+        # Up 3% for two ticks then keeps rising, later a 2.5% drop that recovers
+        frame = quote_frame([100, 103, 104, 105, 101, 97.5, 99, 100])
+        bt = Backtester({"AAPL.US": frame}, horizons=(60,))
+
+        row = bt.price_rule(2.0)
+        self.assertEqual(row["ticks"], 4)  # 103, 104, 105, 97.5
+        self.assertEqual(row["signals"], 2)
+        # Signal at 103 -> 104 went with the move, 97.5 -> 99 went against it
+        self.assertAlmostEqual(row["hit_60s"], 0.5)
+        expected = ((104 / 103 - 1) - (99 / 97.5 - 1)) / 2 * 100
+        self.assertAlmostEqual(row["ret_60s"], expected)
+
+    def test_higher_threshold_fires_less(self):
+        frame = quote_frame([100, 101, 102, 103, 104, 105])
+        bt = Backtester({"A.US": frame}, horizons=(60,))
+        self.assertGreater(bt.price_rule(1.0)["ticks"], bt.price_rule(4.0)["ticks"])
+        self.assertEqual(bt.price_rule(10.0)["signals"], 0)
+        self.assertIsNone(bt.price_rule(10.0)["hit_60s"])
+
+    def test_last_signal_without_horizon_is_not_scored(self):
+        bt = Backtester({"A.US": quote_frame([100, 100, 110])}, horizons=(60,))
+        row = bt.price_rule(5.0)
+        self.assertEqual(row["signals"], 1)
+        self.assertIsNone(row["ret_60s"])
+
+class TestSpreadRule(unittest.TestCase):
+    def test_narrow_spread_runs(self):
+        frame = book_frame([0.2, 0.04, 0.03, 0.2, 0.045, 0.2])
+        bt = Backtester({"A.US": frame}, horizons=(60,))
+        row = bt.spread_rule(0.05)
+        self.assertEqual(row["ticks"], 3)
+        self.assertEqual(row["signals"], 2)
+        # Price never moves, so the spread is never covered
+        self.assertEqual(row["hit_60s"], 0.0)
+
+    def test_bars_never_fire_spread(self):
+        bt = Backtester({"A.US": quote_frame([100, 101])}, horizons=(60,))
+        self.assertEqual(bt.spread_rule(1.0)["ticks"], 0)
+
+class TestLoaders(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_bars_prev_close_is_previous_day(self):
+        # 2024-03-04 and 2024-03-05, 15:00 and 16:00 UTC (regular session in New York)
+        day1, day2 = 1709564400, 1709650800
+        bars = {
+            "start": np.array([day1, day1 + 3600, day2, day2 + 3600], dtype=np.int64),
+            "open": np.ones(4), "high": np.ones(4), "low": np.ones(4),
+            "close": np.array([10.0, 11.0, 12.0, 13.0]),
+            "volume": np.ones(4, dtype=np.int64), "turnover": np.ones(4),
+        }
+        frame = frame_from_bars(bars)
+        self.assertTrue(np.isnan(frame["prev_close"][:2]).all())
+        self.assertEqual(frame["prev_close"][2:].tolist(), [11.0, 11.0])
+
+    def test_load_bar_frames_groups_by_symbol_dir(self):
+        for symbol in ("AAPL.US", "TSLA.US"):
+            write_columns(os.path.join(self.dir, "1m", symbol, "2024-03-04.npz"), {
+                "start": np.array([1709564400], dtype=np.int64), "open": np.ones(1), "high": np.ones(1),
+                "low": np.ones(1), "close": np.ones(1), "volume": np.ones(1, dtype=np.int64),
+                "turnover": np.ones(1),
+            })
+        frames = load_bar_frames(os.path.join(self.dir, "1m", "*", "*.npz"))
+        self.assertEqual(sorted(frames), ["AAPL.US", "TSLA.US"])
+
+    def test_load_bar_frames_reads_recorder_column_dirs(self):
+        for day in ("2024-03-04", "2024-03-05"):
+            append_columns(os.path.join(self.dir, "1m", day, "AAPL.US"), {
+                "start": np.array([int(datetime.fromisoformat(f"{day}T15:00:00+00:00").timestamp())], dtype=np.int64),
+                "open": np.ones(1), "high": np.ones(1), "low": np.ones(1),
+                "close": np.array([float(day[-1])]), "volume": np.ones(1, dtype=np.int64), "turnover": np.ones(1),
+            })
+        frames = load_bar_frames(os.path.join(self.dir, "1m", "*", "*"))
+        self.assertEqual(list(frames), ["AAPL.US"])
+        self.assertEqual(frames["AAPL.US"]["price"].tolist(), [4.0, 5.0])
+        self.assertEqual(frames["AAPL.US"]["prev_close"][1], 4.0)
+
+    def test_recording_carries_state_forward(self):
+        recorder = QuoteRecorder(self.dir)
+        level = lambda price: SimpleNamespace(position=1, price=price, volume=10)
+        # A snapshot carries prev_close; pushes (like the SDK's) have no such field
+        recorder.record_quote("A.US", SimpleNamespace(last_done=10.0, prev_close=9.0, volume=1), received_at=1000.0)
+        recorder.record_depth("A.US", SimpleNamespace(bids=[level(9.99)], asks=[level(10.01)]), received_at=1001.0)
+        recorder.record_quote("A.US", SimpleNamespace(last_done=10.5, volume=1), received_at=1002.0)
+        recorder.close()
+
+        frame = load_recording_frames([recorder.path_for(recorder_day(self.dir))])["A.US"]
+        self.assertEqual(frame["is_quote"].tolist(), [True, False, True])
+        self.assertEqual(frame["price"].tolist(), [10.0, 10.0, 10.5])
+        self.assertEqual(frame["prev_close"].tolist(), [9.0, 9.0, 9.0])
+        self.assertAlmostEqual(frame["ask"][2] - frame["bid"][2], 0.02)
+
+    def test_push_only_recording_uses_previous_day_close(self):
+        recorder = QuoteRecorder(self.dir)
+        day1 = datetime(2024, 3, 4, 15, 0, tzinfo=timezone.utc).timestamp()
+        day2 = day1 + 86400
+        for ts, last in ((day1, 100.0), (day1 + 60, 101.0), (day2, 101.5), (day2 + 60, 104.0)):
+            recorder.record_quote("A.US", SimpleNamespace(last_done=last, volume=1), received_at=ts)
+        recorder.close()
+
+        paths = sorted(os.path.join(self.dir, name) for name in os.listdir(self.dir))
+        frame = load_recording_frames(paths)["A.US"]
+        self.assertTrue(np.isnan(frame["prev_close"][:2]).all())
+        self.assertEqual(frame["prev_close"][2:].tolist(), [101.0, 101.0])
+        # The +3% move on day two is visible to the price rule
+        self.assertEqual(Backtester({"A.US": frame}, horizons=(60,)).price_rule(2.0)["ticks"], 1)
+
+def recorder_day(directory):
+    name = os.listdir(directory)[0]
+    return name[len("quotes-"):-len(".lbr")]
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.frames = {
+            "A.US": quote_frame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, 500)))),
+            "B.US": book_frame(rng.uniform(0.01, 0.1, 500)),
+        }
+
+    def test_pool_matches_in_process(self):
+        grid = {"price_grid": [0.5, 1.0, 2.0], "spread_grid": [0.02, 0.05]}
+        serial = sweep(self.frames, horizons=(60, 300), workers=1, **grid)
+        parallel = sweep(self.frames, horizons=(60, 300), workers=2, **grid)
+        self.assertEqual(serial, parallel)
+        self.assertEqual([r["threshold"] for r in serial], [0.5, 1.0, 2.0, 0.02, 0.05])
+
+    def test_parse_grid(self):
+        self.assertEqual(parse_grid("1,2.5"), [1.0, 2.5])
+        self.assertEqual(parse_grid("0.5:2:0.5"), [0.5, 1.0, 1.5, 2.0])
+        self.assertEqual(parse_grid(""), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from src.analysis.bars import BarAggregator
+from src.monitor.bars import BarRecorder
+from src.utils.columnar import BAR_COLUMNS
+
+# 2024-03-01 15:00:00 UTC = 10:00 New York
+T0 = datetime(2024, 3, 1, 15, 0, tzinfo=timezone.utc).timestamp()
+
+def trades(*items):
+    return SimpleNamespace(trades=[
+        SimpleNamespace(price=str(price), volume=volume, timestamp=datetime.fromtimestamp(ts, timezone.utc))
+        for ts, price, volume in items
+    ])
+
+class TestBarAggregator(unittest.TestCase):
+    def test_ohlcv_and_completion_on_next_bucket(self):
+        agg = BarAggregator(60, capacity=1, buffer_size=1)
+        agg.update("AAPL.US", T0 + 1, 100.0, 10)
+        agg.update("AAPL.US", T0 + 20, 102.0, 5)
+        agg.update("AAPL.US", T0 + 30, 99.0, 5)
+        agg.update("AAPL.US", T0 + 59, 101.0, 20)
+        agg.update("NVDA.US", T0 + 5, 500.0, 1)  # grows the slot arrays
+        self.assertEqual(agg.drain()[0], [])
+
+        agg.update("AAPL.US", T0 + 61, 103.0, 1)
+        symbols, bars = agg.drain()
+        self.assertEqual(symbols, ["AAPL.US"])
+        self.assertEqual(bars["start"].tolist(), [int(T0)])
+        self.assertEqual([bars[k][0] for k in ("open", "high", "low", "close")], [100.0, 102.0, 99.0, 101.0])
+        self.assertEqual(bars["volume"][0], 40)
+        self.assertAlmostEqual(bars["turnover"][0], 1000 + 510 + 495 + 2020)
+
+    def test_late_trade_is_dropped(self):
+        agg = BarAggregator(1)
+        agg.update("AAPL.US", T0 + 5, 100.0, 10)
+        agg.update("AAPL.US", T0 + 4, 90.0, 10)
+        agg.close_all()
+        _, bars = agg.drain()
+        self.assertEqual((bars["low"][0], bars["close"][0], bars["volume"][0]), (100.0, 100.0, 10))
+        self.assertEqual(agg.late_trades, 1)
+
+    def test_late_print_after_close_does_not_reopen_bar(self):
+        agg = BarAggregator(1)
+        agg.update("AAPL.US", T0, 100.0, 10)
+        agg.close_due(T0 + 3, grace=2)
+        agg.update("AAPL.US", T0 + 0.5, 90.0, 5)
+        self.assertEqual(agg.close_all(), 0)
+        _, bars = agg.drain()
+        self.assertEqual((bars["start"].tolist(), bars["volume"].tolist()), ([int(T0)], [10]))
+
+        # Nor does it leak into the symbol's next bar
+        agg.update("AAPL.US", T0 + 4, 101.0, 1)
+        agg.close_all()
+        _, bars = agg.drain()
+        self.assertEqual((bars["open"][0], bars["volume"][0], bars["turnover"][0]), (101.0, 1, 101.0))
+        self.assertEqual(agg.late_trades, 1)
+
+    def test_quiet_symbols_close_after_grace(self):
+        agg = BarAggregator(1)
+        agg.update("AAPL.US", T0, 100.0, 1)
+        self.assertEqual(agg.close_due(T0 + 2.5, grace=2), 0)
+        self.assertEqual(agg.close_due(T0 + 3, grace=2), 1)
+
+    def test_buffer_grows_between_drains(self):
+        agg = BarAggregator(1, buffer_size=2)
+        for i in range(10):
+            agg.update("AAPL.US", T0 + i, 100.0 + i, 1)
+        symbols, bars = agg.drain()
+        self.assertEqual(len(symbols), 9)
+        self.assertEqual(bars["close"].tolist(), [100.0 + i for i in range(9)])
+
+class TestBarRecorder(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.now = T0
+        self.recorder = BarRecorder(self.tmp.name, flush_interval=60, grace=2, clock=lambda: self.now)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_flush_partitions_by_date_and_symbol(self):
+        self.recorder.on_trades("AAPL.US", trades((T0, 100, 1), (T0 + 1.5, 101, 2), (T0 + 65, 102, 3)))
+        self.recorder.on_trades("NVDA.US", trades((T0, 500, 1)))
+        self.now = T0 + 10
+        # 1s: two AAPL bars and the quiet NVDA bar; 1m: the first AAPL minute
+        self.assertEqual(self.recorder.flush(), 4)
+
+        second = self.recorder.load("AAPL.US", 1, "2024-03-01")
+        self.assertEqual(second["start"].tolist(), [int(T0), int(T0) + 1])
+        minute = self.recorder.load("AAPL.US", 60, "2024-03-01")
+        self.assertEqual(minute["volume"].tolist(), [3])
+
+        # Remaining open bars are appended on close to the same column files
+        self.recorder.close()
+        second = self.recorder.load("AAPL.US", 1, "2024-03-01")
+        self.assertEqual(second["close"].tolist(), [100.0, 101.0, 102.0])
+        self.assertEqual(sorted(os.listdir(os.path.join(self.tmp.name, "1s", "2024-03-01", "AAPL.US"))),
+                         sorted(f"{name}.bin" for name in BAR_COLUMNS))
+        self.assertEqual(self.recorder.load("NVDA.US", 60, "2024-03-01")["open"].tolist(), [500.0])
+        self.assertEqual(self.recorder.load("TSLA.US", 1, "2024-03-01")["start"].tolist(), [])
+
+    def test_partial_record_is_dropped(self):
+        self.recorder.on_trades("AAPL.US", trades((T0, 100, 1), (T0 + 1, 101, 1)))
+        self.now = T0 + 10
+        self.recorder.flush()
+        path = os.path.join(self.tmp.name, "1s", "2024-03-01", "AAPL.US", "close.bin")
+        with open(path, "ab") as f:
+            f.write(b"\0" * 13)  # torn flush: a row and a half in one column only
+        self.assertEqual(self.recorder.load("AAPL.US", 1, "2024-03-01")["close"].tolist(), [100.0, 101.0])
+        self.recorder.on_trades("AAPL.US", trades((T0 + 20, 102, 1)))
+        self.recorder.close()
+        self.assertEqual(self.recorder.load("AAPL.US", 1, "2024-03-01")["close"].tolist(), [100.0, 101.0, 102.0])
+
+    def test_malformed_trade_is_skipped(self):
+        event = trades((T0, 100, 1))
+        event.trades.append(SimpleNamespace(price=None, volume=1, timestamp=None))
+        self.recorder.on_trades("AAPL.US", event)
+        self.assertEqual(self.recorder.trades, 1)
+
+if __name__ == '__main__':
+    unittest.main()
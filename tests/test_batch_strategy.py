@@ -0,0 +1,89 @@
+import sys
+import random
+from unittest.mock import MagicMock
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from config.settings import Settings
+from src.analysis.strategy import Strategy
+from src.analysis.batch import BatchStrategy
+
+def make_quote(symbol, last_done, prev_close, bid=None, ask=None):
+    quote = MagicMock()
+    quote.symbol = symbol
+    quote.last_done = last_done
+    quote.prev_close = prev_close
+    quote.bid_price = [bid] if bid is not None else []
+    quote.ask_price = [ask] if ask is not None else []
+    return quote
+
+def comparable(signals):
+    return [(s.symbol, s.signal_type, s.price, s.details, s.value) for s in signals]
+
+class TestBatchStrategyParity(unittest.TestCase):
+    def setUp(self):
+        Settings.PRICE_CHANGE_THRESHOLD = 2.0
+        Settings.SPREAD_THRESHOLD = 0.05
+        self.scalar = Strategy()
+        self.batch = BatchStrategy(capacity=4)
+
+    def assertParity(self, quotes):
+        expected = []
+        for quote in quotes:
+            expected.extend(self.scalar.analyze(quote))
+        actual = self.batch.analyze_batch(quotes)
+        self.assertEqual(comparable(actual), comparable(expected))
+
+    def test_parity_handpicked(self):
+        """Edge cases: thresholds, missing data, zero/negative spreads"""
+        self.assertParity([
+            make_quote("AAPL.US", "105.0", "100.0", "104.9", "105.1"),
+            make_quote("AAPL.US", "100.0", "100.0", "100.0", "100.04"),
+            make_quote("NVDA.US", "98.0", "100.0"),
+            make_quote("TSLA.US", "101.0", "100.0", "100.0", "100.2"),
+            make_quote("MSFT.US", None, "100.0"),
+            make_quote("AMD.US", "100.0", "0"),
+            make_quote("META.US", "100.0", "100.0", "100.05", "100.05"),
+            make_quote("AMZN.US", "100.0", "100.0", "100.10", "100.05"),
+            make_quote("GOOG.US", "97.0", "100.0", "96.99", "97.02"),
+        ])
+
+    def test_parity_random(self):
+        """Randomized batches across many symbols (grows the slot arrays)"""
+        rng = random.Random(42)
+        quotes = []
+        for _ in range(2000):
+            prev = round(rng.uniform(1, 500), 2)
+            last = round(prev * (1 + rng.gauss(0, 0.02)), 2)
+            bid = round(last - rng.choice([0.01, 0.03, 0.05, 0.08, 0.2]), 2)
+            ask = round(bid + rng.choice([0.01, 0.04, 0.05, 0.06, 0.5]), 2)
+            with_book = rng.random() < 0.7
+            quotes.append(make_quote(
+                f"SYM{rng.randrange(300)}.US", str(last), str(prev),
+                str(bid) if with_book else None, str(ask) if with_book else None,
+            ))
+        self.assertParity(quotes)
+        self.assertGreater(self.batch.capacity, 4)
+
+    def test_symbols_argument_overrides_quote_symbol(self):
+        """Push callbacks pass the symbol separately from the event"""
+        quote = make_quote("IGNORED", "105.0", "100.0")
+        signals = self.batch.analyze_batch([quote], ["AAPL.US"])
+        self.assertEqual(signals[0].symbol, "AAPL.US")
+
+    def test_seeded_prev_close_used_for_push_quotes(self):
+        """Quotes without prev_close use the slot's stored reference close"""
+        self.batch.seed("AAPL.US", 100.0)
+        signals = self.batch.analyze_batch([make_quote("AAPL.US", "103.0", None)])
+        self.assertEqual(len(signals), 1)
+        self.assertEqual(signals[0].signal_type, "PRICE_FLUCTUATION")
+
+    def test_empty_batch(self):
+        self.assertEqual(self.batch.analyze_batch([]), [])
+
+if __name__ == '__main__':
+    unittest.main()
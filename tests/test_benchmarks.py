@@ -0,0 +1,67 @@
+import sys
+import copy
+from collections import Counter
+from unittest.mock import MagicMock
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from benchmarks.generator import SyntheticQuoteStream
+from benchmarks.bench_hotpath import run_benchmarks, compare
+
+class TestSyntheticQuoteStream(unittest.TestCase):
+    def test_deterministic_for_seed(self):
+        a = SyntheticQuoteStream(underlyings=3, options_per_underlying=4, seed=7).ticks(200)
+        b = SyntheticQuoteStream(underlyings=3, options_per_underlying=4, seed=7).ticks(200)
+        self.assertEqual([(s, q.last_done, q.timestamp) for s, q in a],
+                         [(s, q.last_done, q.timestamp) for s, q in b])
+
+    def test_universe_and_skew(self):
+        stream = SyntheticQuoteStream(underlyings=5, options_per_underlying=10)
+        self.assertEqual(len(stream.symbols), 55)
+        self.assertTrue(all(s.endswith(".US") for s in stream.symbols))
+
+        ticks = stream.ticks(20000)
+        counts = Counter(symbol for symbol, _ in ticks)
+        # Zipf activity: the busiest symbol far outpaces the median one
+        busiest = counts.most_common(1)[0][1]
+        median = sorted(counts.values())[len(counts) // 2]
+        self.assertGreater(busiest, 10 * median)
+
+    def test_quotes_are_consistent(self):
+        for _, quote in SyntheticQuoteStream(underlyings=2, options_per_underlying=2).ticks(1000):
+            self.assertGreater(quote.last_done, 0)
+            self.assertLess(quote.bid_price[0], quote.ask_price[0])
+            self.assertLessEqual(quote.low, quote.last_done)
+            self.assertGreaterEqual(quote.high, quote.last_done)
+
+class TestBenchHotpath(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.report = run_benchmarks(ticks=500, underlyings=2, options_per_underlying=4, warmup=50, batch_size=16)
+
+    def test_report_shape(self):
+        self.assertEqual(set(self.report["results"]), {
+            "strategy.analyze", "push_handler.on_quote", "push_handler.on_quote_batch", "signal.construct",
+        })
+        for result in self.report["results"].values():
+            self.assertEqual(result["ticks"], 500)
+            self.assertGreater(result["ticks_per_sec"], 0)
+            lat = result["latency_ns"]
+            self.assertLessEqual(lat["p50"], lat["p99"])
+            self.assertLessEqual(lat["p99"], lat["max"])
+
+    def test_compare_flags_regression(self):
+        slower = copy.deepcopy(self.report)
+        slower["results"]["strategy.analyze"]["ticks_per_sec"] /= 2
+        _, regressed = compare(self.report, self.report)
+        self.assertFalse(regressed)
+        lines, regressed = compare(self.report, slower)
+        self.assertTrue(regressed)
+        self.assertTrue(any("REGRESSION" in line and "strategy.analyze" in line for line in lines))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import sys
+from datetime import datetime
+from unittest.mock import MagicMock
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from src.analysis.coalescer import AlertCoalescer
+from src.analysis.strategy import StrategySignal
+
+def make_signal(symbol="AAPL.US", signal_type="PRICE_FLUCTUATION", value=2.5):
+    return StrategySignal(
+        symbol=symbol,
+        signal_type=signal_type,
+        price=100.0,
+        timestamp=datetime(2024, 1, 2, 9, 30),
+        details=f"Change: {value:.2f}%",
+        value=value,
+    )
+
+class TestAlertCoalescer(unittest.TestCase):
+    def setUp(self):
+        self.sink = MagicMock()
+        self.config = {
+            'cooldown': 60,
+            'escalation_step': 1.0,
+            'digest_window': 0,
+            'signal_types': {'SPREAD_NARROW': {'cooldown': 300, 'escalation_step': 0.01}},
+            'symbols': {'NVDA.US': {'cooldown': 10}},
+        }
+        self.coalescer = AlertCoalescer(self.sink, self.config)
+
+    def test_repeat_within_cooldown_is_suppressed(self):
+        """Same symbol at the same level only alerts once per cooldown"""
+        self.assertTrue(self.coalescer.offer(make_signal(value=2.5), now=0))
+        for t in range(1, 50):
+            self.assertFalse(self.coalescer.offer(make_signal(value=2.6), now=t))
+
+        self.assertEqual(self.sink.call_count, 1)
+        self.assertEqual(self.coalescer.stats()["suppressed"], 49)
+
+    def test_alert_again_after_cooldown(self):
+        """Cooldown expiry re-arms the pair and reports suppressed repeats"""
+        self.coalescer.offer(make_signal(value=2.5), now=0)
+        self.coalescer.offer(make_signal(value=2.5), now=30)
+        self.assertTrue(self.coalescer.offer(make_signal(value=2.5), now=61))
+
+        self.assertEqual(self.sink.call_count, 2)
+        self.assertIn("Suppressed repeats: 1", self.sink.call_args[0][1])
+
+    def test_escalation_breaks_cooldown(self):
+        """A move that grows past the step re-alerts inside the cooldown"""
+        self.coalescer.offer(make_signal(value=2.5), now=0)
+        self.assertFalse(self.coalescer.offer(make_signal(value=-3.0), now=1))
+        self.assertTrue(self.coalescer.offer(make_signal(value=-3.6), now=2))
+        self.assertEqual(self.coalescer.stats()["escalated"], 1)
+
+    def test_spread_escalates_when_narrowing(self):
+        """For SPREAD_NARROW a smaller spread is the stronger signal"""
+        sig = lambda v: make_signal(signal_type="SPREAD_NARROW", value=v)
+        self.coalescer.offer(sig(0.05), now=0)
+        self.assertFalse(self.coalescer.offer(sig(0.06), now=100))
+        self.assertTrue(self.coalescer.offer(sig(0.03), now=200))
+
+    def test_overrides_resolved_per_symbol(self):
+        """Per-symbol cooldown overrides the default"""
+        self.coalescer.offer(make_signal(symbol="NVDA.US"), now=0)
+        self.assertTrue(self.coalescer.offer(make_signal(symbol="NVDA.US"), now=11))
+
+    def test_digest_batches_signals(self):
+        """Signals admitted in one window are sent as a single digest"""
+        self.config['digest_window'] = 5
+        coalescer = AlertCoalescer(self.sink, self.config)
+        coalescer.offer(make_signal(symbol="AAPL.US"), now=0)
+        coalescer.offer(make_signal(symbol="NVDA.US"), now=0)
+        coalescer.offer(make_signal(symbol="TSLA.US", signal_type="SPREAD_NARROW", value=0.02), now=0)
+        coalescer.stop()
+
+        self.sink.assert_called_once()
+        title, content = self.sink.call_args[0]
+        self.assertIn("3 signals", title)
+        self.assertIn("TSLA.US", content)
+
+    def test_state_bounded_by_pairs(self):
+        """Tick count does not grow the tracked state"""
+        for t in range(1000):
+            self.coalescer.offer(make_signal(symbol=f"S{t % 10}.US"), now=t * 0.01)
+        self.assertEqual(self.coalescer.stats()["tracked_pairs"], 10)
+
+if __name__ == '__main__':
+    unittest.main()
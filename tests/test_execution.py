@@ -0,0 +1,103 @@
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from src.analysis.orderbook import OrderBookStore
+from src.api import execution as execution_module
+from src.api.execution import ExecutionEngine, PriceProtectionError
+from src.utils.metrics import metrics
+
+def depth(bid, ask):
+    return SimpleNamespace(
+        bids=[SimpleNamespace(position=1, price=bid, volume=10)],
+        asks=[SimpleNamespace(position=1, price=ask, volume=10)],
+    )
+
+class TestPriceProtection(unittest.TestCase):
+    def setUp(self):
+        self.books = OrderBookStore(levels=5)
+        self.books.apply("AAPL.US", depth(100.0, 100.2))
+        self.engine = ExecutionEngine(books=self.books, tolerance=0, max_age=10)
+
+    def test_inside_band(self):
+        for price in (100.0, 100.1, 100.2):
+            self.engine.check_price("AAPL.US", "Buy", price)
+
+    def test_outside_band(self):
+        with self.assertRaises(PriceProtectionError):
+            self.engine.check_price("AAPL.US", "Buy", 100.5)
+        with self.assertRaises(PriceProtectionError):
+            self.engine.check_price("AAPL.US", "Sell", 99.0)
+
+    def test_tolerance_widens_band(self):
+        engine = ExecutionEngine(books=self.books, tolerance=0.5, max_age=10)
+        engine.check_price("AAPL.US", "Buy", 100.5)
+        with self.assertRaises(PriceProtectionError):
+            engine.check_price("AAPL.US", "Buy", 101.0)
+
+    def test_unknown_or_stale_book(self):
+        with self.assertRaises(PriceProtectionError):
+            self.engine.check_price("NVDA.US", "Buy", 100.0)
+        self.books.updated_at[self.books.index("AAPL.US")] = time.monotonic() - 60
+        with self.assertRaises(PriceProtectionError):
+            self.engine.check_price("AAPL.US", "Buy", 100.1)
+
+    def test_market_order_needs_two_sided_book(self):
+        self.engine.check_price("AAPL.US", "Buy", None)
+        self.books.apply("AAPL.US", SimpleNamespace(bids=[], asks=[SimpleNamespace(position=1, price=100.2, volume=1)]))
+        with self.assertRaises(PriceProtectionError):
+            self.engine.check_price("AAPL.US", "Buy", None)
+
+class TestSubmitOrder(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        metrics.reset()
+        self.books = OrderBookStore(levels=5)
+        self.books.apply("AAPL.US", depth(100.0, 100.2))
+        self.tracker = MagicMock()
+        self.engine = ExecutionEngine(books=self.books, tolerance=0, max_age=10, tracker=self.tracker)
+
+        self.ctx = AsyncMock()
+        self.ctx.submit_order.return_value = SimpleNamespace(order_id="123")
+        client_patcher = patch.object(execution_module, "longport_client")
+        client = client_patcher.start()
+        client.get_trade_context = AsyncMock(return_value=self.ctx)
+        self.addCleanup(client_patcher.stop)
+        settings_patcher = patch.object(execution_module.Settings, "ENABLE_TRADING", True)
+        settings_patcher.start()
+        self.addCleanup(settings_patcher.stop)
+
+    async def test_submit_records_ack_latency(self):
+        ack = await self.engine.submit_order("AAPL.US", "Buy", 10, price=100.1)
+        self.assertEqual(ack.order_id, "123")
+        self.assertGreaterEqual(ack.latency_ms, 0)
+        self.ctx.submit_order.assert_awaited_once()
+        self.assertEqual(metrics.histogram("order_ack_latency_ms", side="buy").count, 1)
+        self.tracker.register.assert_called_once_with("123", "AAPL.US", "Buy", 10, 100.1)
+
+    async def test_orders_carry_the_tracker_tag(self):
+        with patch.object(execution_module.Settings, "ORDER_REMARK_TAG", "lbad"):
+            await self.engine.submit_order("AAPL.US", "Buy", 10, price=100.1)
+            await self.engine.submit_order("AAPL.US", "Buy", 10, price=100.1, remark="breakout")
+        remarks = [c.kwargs["remark"] for c in self.ctx.submit_order.await_args_list]
+        self.assertEqual(remarks, ["lbad", "lbad breakout"])
+
+    async def test_blocked_order_is_never_sent(self):
+        with self.assertRaises(PriceProtectionError):
+            await self.engine.submit_order("AAPL.US", "Buy", 10, price=105.0)
+        self.ctx.submit_order.assert_not_awaited()
+        self.assertEqual(metrics.counter("orders_rejected_total", reason="price_protection"), 1)
+
+    async def test_disabled_trading(self):
+        with patch.object(execution_module.Settings, "ENABLE_TRADING", False):
+            self.assertIsNone(await self.engine.submit_order("AAPL.US", "Buy", 10, price=100.1))
+        self.ctx.submit_order.assert_not_awaited()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import sys
+import asyncio
+import shutil
+import tempfile
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from types import SimpleNamespace
+from src.api.longport.pull import history as history_module
+from src.api.longport.pull.history import HistoryCache, _ranges
+from src.utils.ratelimit import AsyncRateLimiter
+
+def make_candles(symbol, start, end, **kwargs):
+    """One 60m candle at 14:30 UTC per weekday of [start, end]"""
+    candles = []
+    for day in history_module._weekdays(start, end):
+        ts = datetime(day.year, day.month, day.day, 14, 30, tzinfo=timezone.utc)
+        candles.append(SimpleNamespace(timestamp=ts, open="1", high="2", low="0.5", close="1.5",
+                                       volume=100, turnover="150"))
+    return candles
+
+class TestRateLimiter(unittest.TestCase):
+    def test_limits_rate_after_burst(self):
+        now = [0.0]
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        limiter = AsyncRateLimiter(2, burst=2, clock=lambda: now[0], sleep=fake_sleep)
+
+        async def run():
+            for _ in range(4):
+                await limiter.acquire()
+
+        asyncio.run(run())
+        # Two tokens from the burst, then one every 0.5s
+        self.assertEqual(len(sleeps), 2)
+        self.assertAlmostEqual(now[0], 1.0)
+
+class TestRanges(unittest.TestCase):
+    def test_groups_consecutive_weekdays_across_weekend(self):
+        days = [date(2024, 3, 7), date(2024, 3, 8), date(2024, 3, 11), date(2024, 3, 13)]
+        self.assertEqual(_ranges(days, 10), [(date(2024, 3, 7), date(2024, 3, 11)),
+                                             (date(2024, 3, 13), date(2024, 3, 13))])
+
+    def test_splits_at_max_days(self):
+        days = [date(2024, 3, 4), date(2024, 3, 5), date(2024, 3, 6)]
+        self.assertEqual(_ranges(days, 2), [(date(2024, 3, 4), date(2024, 3, 5)),
+                                            (date(2024, 3, 6), date(2024, 3, 6))])
+
+class TestHistoryCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache = HistoryCache(self.dir, concurrency=2, rate=1000, today=lambda: date(2024, 3, 15))
+        self.ctx = MagicMock()
+        self.ctx.history_candlesticks_by_date = AsyncMock(
+            side_effect=lambda symbol, period, adjust, start, end: make_candles(symbol, start, end))
+        patcher = patch.object(history_module.longport_client, "get_quote_context",
+                               AsyncMock(return_value=self.ctx))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_backfill_then_reuse_disk(self):
+        stats = asyncio.run(self.cache.backfill(["AAPL.US", "TSLA.US"], "60m", date(2024, 3, 4), date(2024, 3, 8)))
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["days_fetched"], 10)
+
+        stats = asyncio.run(self.cache.backfill(["AAPL.US", "TSLA.US"], "60m", date(2024, 3, 4), date(2024, 3, 8)))
+        self.assertEqual(stats["requests"], 0)
+        self.assertEqual(stats["days_cached"], 10)
+        self.assertEqual(self.ctx.history_candlesticks_by_date.await_count, 2)
+
+        bars = self.cache.load("AAPL.US", "60m", date(2024, 3, 4), date(2024, 3, 8))
+        self.assertEqual(len(bars["start"]), 5)
+        self.assertEqual(bars["close"].tolist(), [1.5] * 5)
+
+    def test_fetches_only_missing_range(self):
+        asyncio.run(self.cache.backfill(["AAPL.US"], "60m", date(2024, 3, 6), date(2024, 3, 7)))
+        self.ctx.history_candlesticks_by_date.reset_mock()
+
+        asyncio.run(self.cache.backfill(["AAPL.US"], "60m", date(2024, 3, 4), date(2024, 3, 8)))
+        calls = [(c.kwargs["start"], c.kwargs["end"]) for c in self.ctx.history_candlesticks_by_date.await_args_list]
+        self.assertEqual(sorted(calls), [(date(2024, 3, 4), date(2024, 3, 5)), (date(2024, 3, 8), date(2024, 3, 8))])
+
+    def test_chunks_under_row_limit(self):
+        # 1m: 1000 // 390 = 2 days per request
+        stats = asyncio.run(self.cache.backfill(["AAPL.US"], "1m", date(2024, 3, 4), date(2024, 3, 8)))
+        self.assertEqual(stats["requests"], 3)
+
+    def test_truncated_response_is_split_not_marked_empty(self):
+        # The API returns at most 2 rows; a 5-day request is cut off after two days
+        self.ctx.history_candlesticks_by_date = AsyncMock(
+            side_effect=lambda symbol, period, adjust, start, end: make_candles(symbol, start, end)[:2])
+        with patch.object(history_module, "MAX_CANDLESTICKS", 2):
+            stats = asyncio.run(self.cache.backfill(["AAPL.US"], "60m", date(2024, 3, 4), date(2024, 3, 8)))
+        self.assertEqual(stats["failed"], 0)
+        # Ranges are halved until each response fits, so every day is stored with its bar
+        bars = self.cache.load("AAPL.US", "60m", date(2024, 3, 4), date(2024, 3, 8))
+        self.assertEqual(len(bars["start"]), 5)
+
+    def test_truncated_single_day_is_not_cached(self):
+        with patch.object(history_module, "MAX_CANDLESTICKS", 1):
+            asyncio.run(self.cache.backfill(["AAPL.US"], "1d", date(2024, 3, 4), date(2024, 3, 4)))
+        self.assertEqual(self.cache.cached_days("AAPL.US", "1d"), set())
+
+    def test_empty_day_is_stored(self):
+        self.ctx.history_candlesticks_by_date = AsyncMock(return_value=[])
+        asyncio.run(self.cache.backfill(["AAPL.US"], "1d", date(2024, 3, 4), date(2024, 3, 4)))
+        self.assertEqual(self.cache.missing_days("AAPL.US", "1d", date(2024, 3, 4), date(2024, 3, 4)), [])
+
+    def test_today_not_cached(self):
+        asyncio.run(self.cache.backfill(["AAPL.US"], "60m", date(2024, 3, 14), date(2024, 3, 15)))
+        self.assertEqual(self.cache.missing_days("AAPL.US", "60m", date(2024, 3, 14), date(2024, 3, 15)),
+                         [date(2024, 3, 15)])
+
+    def test_failed_request_counted(self):
+        self.ctx.history_candlesticks_by_date = AsyncMock(side_effect=RuntimeError("throttled"))
+        stats = asyncio.run(self.cache.backfill(["AAPL.US"], "60m", date(2024, 3, 4), date(2024, 3, 4)))
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual(self.cache.cached_days("AAPL.US", "60m"), set())
+
+    def test_unknown_period(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(self.cache.backfill(["AAPL.US"], "2h", date(2024, 3, 4), date(2024, 3, 4)))
+
+if __name__ == "__main__":
+    unittest.main()
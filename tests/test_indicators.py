@@ -0,0 +1,92 @@
+import sys
+import math
+import random
+from datetime import datetime
+from unittest.mock import MagicMock
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from config.settings import Settings
+from src.analysis.indicators import RollingWindow, IndicatorStore
+from src.analysis.strategy import Strategy
+
+class TestRollingWindow(unittest.TestCase):
+    def brute_force(self, ticks, now, window_seconds, capacity):
+        inside = [t for t in ticks if t[0] >= now - window_seconds][-capacity:]
+        if not inside:
+            inside = ticks[-1:]
+        prices = [p for _, p, _ in inside]
+        vols = [v for _, _, v in inside]
+        r2 = sum(math.log(b / a) ** 2 for a, b in zip(prices, prices[1:]))
+        vwap = sum(p * v for p, v in zip(prices, vols)) / sum(vols) if sum(vols) > 0 else math.nan
+        ret = (prices[-1] - prices[0]) / prices[0] * 100 if len(prices) > 1 else 0.0
+        return ret, max(prices), min(prices), vwap, math.sqrt(r2)
+
+    def test_matches_brute_force(self):
+        """Incremental aggregates equal a full rescan of the window"""
+        rng = random.Random(7)
+        window = RollingWindow(capacity=32, window_seconds=10)
+        ticks, ts, price = [], 0.0, 100.0
+        for _ in range(2000):
+            ts += rng.expovariate(5)
+            price *= 1 + rng.gauss(0, 0.002)
+            volume = rng.choice([0, 100, 200, 500])
+            ticks.append((ts, price, volume))
+            window.update(ts, price, volume)
+
+            ret, high, low, vwap, rvol = self.brute_force(ticks, ts, 10, 32)
+            self.assertAlmostEqual(window.window_return(), ret, places=9)
+            self.assertEqual(window.high(), high)
+            self.assertEqual(window.low(), low)
+            if not math.isnan(vwap):
+                self.assertAlmostEqual(window.vwap(), vwap, places=6)
+            self.assertAlmostEqual(window.realized_volatility(), rvol, places=9)
+        self.assertLessEqual(len(window), 32)
+
+    def test_cumulative_volume_delta(self):
+        """SDK pushes carry session volume; the window stores per-tick deltas"""
+        window = RollingWindow(capacity=8, window_seconds=60)
+        window.update_cumulative(0, 10.0, 1000)
+        window.update_cumulative(1, 12.0, 1100)
+        window.update_cumulative(2, 11.0, 1400)
+        self.assertAlmostEqual(window.vwap(), (12.0 * 100 + 11.0 * 300) / 400)
+
+    def test_stale_ticks_leave_window(self):
+        window = RollingWindow(capacity=8, window_seconds=30)
+        window.update(0, 100.0)
+        window.update(100, 103.0)
+        self.assertEqual(len(window), 1)
+        self.assertEqual(window.window_return(), 0.0)
+
+class TestInstantMoveRule(unittest.TestCase):
+    def setUp(self):
+        Settings.INSTANT_MOVE_THRESHOLD = 2.0
+        self.strategy = Strategy(indicators=IndicatorStore(window_seconds=30, capacity=16))
+
+    def push(self, second, price):
+        quote = MagicMock()
+        quote.last_done = str(price)
+        quote.prev_close = None  # push quotes carry no prev_close
+        quote.volume = 1000 + second
+        quote.timestamp = datetime.fromtimestamp(1_700_000_000 + second)
+        return self.strategy.analyze(quote, "AAPL.US")
+
+    def test_fast_move_fires(self):
+        self.assertEqual(self.push(0, 100.0), [])
+        self.assertEqual(self.push(10, 101.0), [])
+        signals = self.push(20, 102.5)
+        self.assertEqual(len(signals), 1)
+        self.assertEqual(signals[0].signal_type, "INSTANT_MOVE")
+        self.assertEqual(signals[0].symbol, "AAPL.US")
+
+    def test_slow_move_does_not_fire(self):
+        self.push(0, 100.0)
+        self.push(40, 101.5)
+        self.assertEqual(self.push(80, 103.0), [])
+
+if __name__ == '__main__':
+    unittest.main()
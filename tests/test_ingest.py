@@ -0,0 +1,64 @@
+import sys
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from src.monitor.ingest import ConflatingIngestor
+
+class TestConflatingIngestor(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.batches = []
+        self.ingestor = ConflatingIngestor(self.batches.append, max_pending=3)
+
+    async def asyncTearDown(self):
+        await self.ingestor.stop()
+
+    async def drain(self):
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+    async def test_newer_tick_overwrites_pending(self):
+        """Only the latest tick per symbol reaches the handler"""
+        self.ingestor.start()
+        self.ingestor.on_push("AAPL.US", 1)
+        self.ingestor.on_push("NVDA.US", 1)
+        self.ingestor.on_push("AAPL.US", 2)
+        await self.drain()
+
+        self.assertEqual(self.batches, [[("AAPL.US", 2), ("NVDA.US", 1)]])
+        stats = self.ingestor.stats()
+        self.assertEqual(stats["conflated"], 1)
+        self.assertEqual(stats["processed"], 2)
+
+    async def test_pushes_from_foreign_thread(self):
+        """Callbacks on SDK threads wake the loop thread-safely"""
+        self.ingestor.start()
+        worker = threading.Thread(target=lambda: [self.ingestor.on_push("AAPL.US", i) for i in range(1000)])
+        worker.start()
+        worker.join()
+        await self.drain()
+
+        received = [item for batch in self.batches for item in batch]
+        self.assertEqual(received[-1], ("AAPL.US", 999))
+        stats = self.ingestor.stats()
+        self.assertEqual(stats["received"], 1000)
+        self.assertEqual(stats["processed"] + stats["conflated"], 1000)
+
+    async def test_pending_bounded_by_symbols(self):
+        """New symbols beyond max_pending are dropped while the loop is busy"""
+        for i in range(5):
+            self.ingestor.on_push(f"S{i}.US", i)
+        self.ingestor.start()
+        await self.drain()
+
+        self.assertEqual(len(self.batches[0]), 3)
+        self.assertEqual(self.ingestor.stats()["dropped"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import sys
+import os
+import tempfile
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from zoneinfo import ZoneInfo
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from src.api.longport.symbol import metadata as metadata_module
+from src.api.longport.symbol.metadata import MetadataStore, SecurityMeta, trading_date
+
+def make_info(symbol, name="name", lot_size=100):
+    return SimpleNamespace(symbol=symbol, name_cn=f"{name}-{symbol}", name_en="", name_hk="",
+                           exchange="NASD", currency="USD", lot_size=lot_size, board="USMain",
+                           stock_derivatives=["Option"])
+
+class TestMetadataStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "meta.db")
+        self.store = MetadataStore(self.path, max_age_days=7)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_bulk_upsert_and_restart(self):
+        """A new process reads what the previous one stored"""
+        self.store.upsert_static_infos([make_info(f"S{i}.US") for i in range(1200)], day="2024-06-03")
+        self.store.close()
+
+        restarted = MetadataStore(self.path)
+        meta = restarted.get("S1100.US")
+        self.assertEqual(meta.name, "name-S1100.US")
+        self.assertEqual(meta.lot_size, 100)
+        self.assertEqual(meta.stock_derivatives, ["Option"])
+        self.assertEqual(restarted.missing([f"S{i}.US" for i in range(1200)], today="2024-06-04"), [])
+        restarted.close()
+
+    def test_latest_version_wins(self):
+        self.store.upsert_static_infos([make_info("AAPL.US", name="new")], day="2024-06-04")
+        self.store.upsert_static_infos([make_info("AAPL.US", name="old")], day="2024-06-03")
+        self.assertEqual(self.store.get("AAPL.US").name_cn, "new-AAPL.US")
+
+        fresh = MetadataStore(self.path)
+        self.assertEqual(fresh.get("AAPL.US").trading_date, "2024-06-04")
+        fresh.close()
+
+    def test_same_day_upsert_replaces(self):
+        self.store.upsert_static_infos([make_info("AAPL.US", lot_size=1)], day="2024-06-03")
+        self.store.upsert_static_infos([make_info("AAPL.US", lot_size=100)], day="2024-06-03")
+        self.assertEqual(self.store.prune(keep=1), 0)
+        self.assertEqual(self.store.get("AAPL.US").lot_size, 100)
+
+    def test_lazy_loading(self):
+        self.store.upsert_static_infos([make_info("AAPL.US"), make_info("NVDA.US")], day="2024-06-03")
+        self.store.close()
+
+        fresh = MetadataStore(self.path)
+        fresh.get("AAPL.US")
+        self.assertEqual(set(fresh._memo), {"AAPL.US"})
+        self.assertIsNone(fresh.get("UNKNOWN.US"))
+        fresh.close()
+
+    def test_missing_and_stale(self):
+        self.store.upsert_static_infos([make_info("OLD.US")], day="2024-05-01")
+        self.store.upsert_static_infos([make_info("NEW.US")], day="2024-06-03")
+        self.assertEqual(self.store.missing(["OLD.US", "NEW.US", "NONE.US"], today="2024-06-04"),
+                         ["OLD.US", "NONE.US"])
+
+    def test_prune_keeps_newest(self):
+        for day in ("2024-06-03", "2024-06-04", "2024-06-05"):
+            self.store.upsert_static_infos([make_info("AAPL.US")], day=day)
+        self.assertEqual(self.store.prune(keep=1), 2)
+        self.assertEqual(MetadataStore(self.path).get("AAPL.US").trading_date, "2024-06-05")
+
+class TestEnsure(unittest.IsolatedAsyncioTestCase):
+    async def test_fetches_only_unknown(self):
+        store = MetadataStore(":memory:")
+        store.upsert_static_infos([make_info("AAPL.US")])
+        ctx = AsyncMock()
+        ctx.static_info.side_effect = lambda chunk: [make_info(s) for s in chunk]
+
+        metas = await store.ensure(ctx, ["AAPL.US", "NVDA.US"])
+        self.assertEqual(set(metas), {"AAPL.US", "NVDA.US"})
+        ctx.static_info.assert_awaited_once_with(["NVDA.US"])
+
+        await store.ensure(ctx, ["AAPL.US", "NVDA.US"])
+        self.assertEqual(ctx.static_info.await_count, 1)
+
+    async def test_unknown_symbols_are_asked_once_per_day(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, "meta.db")
+        store = MetadataStore(path)
+        ctx = AsyncMock()
+        ctx.static_info.side_effect = lambda chunk: [make_info(s) for s in chunk if s != "GONE.US"]
+
+        with patch.object(metadata_module, "trading_date", return_value="2024-06-03"):
+            self.assertEqual(set(await store.ensure(ctx, ["AAPL.US", "GONE.US"])), {"AAPL.US"})
+            await store.ensure(ctx, ["AAPL.US", "GONE.US"])
+            self.assertEqual(ctx.static_info.await_count, 1)
+            # The negative row survives a restart
+            store.close()
+            store = MetadataStore(path)
+            await store.ensure(ctx, ["GONE.US"])
+            self.assertEqual(ctx.static_info.await_count, 1)
+
+        with patch.object(metadata_module, "trading_date", return_value="2024-06-04"):
+            await store.ensure(ctx, ["AAPL.US", "GONE.US"])
+        ctx.static_info.assert_awaited_with(["GONE.US"])
+        store.close()
+
+    async def test_failed_chunk_is_not_negative_cached(self):
+        store = MetadataStore(":memory:")
+        ctx = AsyncMock()
+        ctx.static_info.side_effect = RuntimeError("timeout")
+        await store.ensure(ctx, ["AAPL.US"])
+        ctx.static_info.side_effect = lambda chunk: [make_info(s) for s in chunk]
+        self.assertEqual(set(await store.ensure(ctx, ["AAPL.US"])), {"AAPL.US"})
+
+    async def test_ensure_prunes_once_per_day(self):
+        store = MetadataStore(":memory:")
+        for day in ("2024-05-01", "2024-05-02", "2024-05-03", "2024-06-03"):
+            store.upsert_static_infos([make_info("AAPL.US")], day=day)
+        ctx = AsyncMock()
+        with patch.object(store, "prune", wraps=store.prune) as prune:
+            await store.ensure(ctx, ["AAPL.US"])
+            await store.ensure(ctx, ["AAPL.US"])
+        prune.assert_called_once()
+        self.assertEqual(store.prune(keep=3), 0)
+
+class TestTradingDate(unittest.TestCase):
+    def test_new_york_calendar(self):
+        # 2024-06-04 02:00 UTC is still June 3rd in New York
+        self.assertEqual(trading_date(datetime(2024, 6, 4, 2, 0, tzinfo=ZoneInfo("UTC"))), "2024-06-03")
+
+    def test_weekend_rolls_back(self):
+        self.assertEqual(trading_date(datetime(2024, 6, 9, 12, 0, tzinfo=ZoneInfo("America/New_York"))), "2024-06-07")
+
+if __name__ == '__main__':
+    unittest.main()
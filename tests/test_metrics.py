@@ -0,0 +1,79 @@
+import sys
+import json
+import urllib.request
+from unittest.mock import MagicMock
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from src.utils.metrics import LatencyHistogram, MetricsRegistry
+from src.monitor.metrics_server import MetricsServer
+
+try:
+    import flask  # noqa: F401
+    HAS_FLASK = True
+except ImportError:
+    HAS_FLASK = False
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_quantiles_use_bucket_bounds(self):
+        hist = LatencyHistogram(buckets=(10, 100, 1000))
+        for _ in range(98):
+            hist.observe(5)
+        hist.observe(50)
+        hist.observe(5000)
+
+        self.assertEqual(hist.quantile(0.5), 10)
+        self.assertEqual(hist.quantile(0.99), 100)
+        self.assertEqual(hist.quantile(1.0), float("inf"))
+        self.assertEqual(hist.snapshot()["count"], 100)
+
+    def test_empty(self):
+        self.assertEqual(LatencyHistogram().quantile(0.99), 0.0)
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counters_with_labels(self):
+        self.registry.inc("signals_total", type="INSTANT_MOVE")
+        self.registry.inc("signals_total", type="INSTANT_MOVE")
+        self.registry.inc("signals_total", type="SPREAD_NARROW")
+        self.assertEqual(self.registry.counter("signals_total", type="INSTANT_MOVE"), 2)
+
+    def test_prometheus_rendering(self):
+        self.registry.inc("pushes_received_total", stream="quote")
+        self.registry.observe("push_latency_ms", 42, stream="quote")
+        text = self.registry.render_prometheus()
+
+        self.assertIn('pushes_received_total{stream="quote"} 1', text)
+        self.assertIn('push_latency_ms_bucket{stream="quote",le="50"} 1', text)
+        self.assertIn('push_latency_ms_bucket{stream="quote",le="25"} 0', text)
+        self.assertIn('push_latency_ms_count{stream="quote"} 1', text)
+
+    def test_snapshot_reports_p99(self):
+        self.registry.observe("webhook_ack_latency_ms", 250, channel="feishu")
+        snapshot = self.registry.snapshot()
+        self.assertEqual(snapshot["latency"]['webhook_ack_latency_ms{channel="feishu"}']["p99_ms"], 300)
+
+@unittest.skipUnless(HAS_FLASK, "Flask not installed")
+class TestMetricsServer(unittest.TestCase):
+    def test_serves_metrics(self):
+        registry = MetricsRegistry()
+        registry.inc("quotes_total")
+        server = MetricsServer(host="127.0.0.1", port=0, registry=registry)
+        self.assertTrue(server.start())
+        try:
+            base = f"http://127.0.0.1:{server.port}"
+            text = urllib.request.urlopen(f"{base}/metrics", timeout=5).read().decode()
+            data = json.loads(urllib.request.urlopen(f"{base}/metrics.json", timeout=5).read())
+        finally:
+            server.stop()
+        self.assertIn("quotes_total 1", text)
+        self.assertEqual(data["counters"]["quotes_total"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+# Mock longport modules BEFORE importing src.api
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from src.api.notifier import AlertNotifier
+
+class TestAlertNotifier(unittest.TestCase):
+    def setUp(self):
+        self.notifier = None
+
+    def tearDown(self):
+        if self.notifier:
+            self.notifier.stop(timeout=2.0)
+
+    def _wait_for(self, predicate, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_submit_fans_out_to_all_channels(self):
+        """Each configured channel gets its own delivery job"""
+        feishu = MagicMock(return_value=True)
+        dingtalk = MagicMock(return_value=True)
+        channels = [("feishu", feishu), ("dingtalk", dingtalk)]
+
+        with patch('src.api.notifier.AlertManager.channels', return_value=channels):
+            self.notifier = AlertNotifier(max_queue=10, workers=2)
+            self.assertTrue(self.notifier.submit("Title", "Content"))
+            self.assertTrue(self._wait_for(lambda: self.notifier.stats()["sent"] == 2))
+
+        feishu.assert_called_once()
+        dingtalk.assert_called_once()
+        self.assertIn("Title", feishu.call_args[0][0])
+        self.assertIn("session", feishu.call_args[1])
+
+    def test_submit_does_not_block_on_slow_webhook(self):
+        """A stuck webhook must not delay the caller"""
+        release = threading.Event()
+        slow = MagicMock(side_effect=lambda message, session=None: release.wait(5) or True)
+
+        with patch('src.api.notifier.AlertManager.channels', return_value=[("feishu", slow)]):
+            self.notifier = AlertNotifier(max_queue=10, workers=1)
+            start = time.monotonic()
+            for _ in range(5):
+                self.notifier.submit("Title", "Content")
+            self.assertLess(time.monotonic() - start, 0.5)
+            release.set()
+
+    def test_queue_full_drops_and_counts(self):
+        """Jobs beyond the queue bound are dropped, not blocked on"""
+        release = threading.Event()
+        blocking = MagicMock(side_effect=lambda message, session=None: release.wait(5) or True)
+
+        with patch('src.api.notifier.AlertManager.channels', return_value=[("feishu", blocking)]):
+            self.notifier = AlertNotifier(max_queue=1, workers=1)
+            self.notifier.submit("First", "picked up by the worker")
+            self.assertTrue(self._wait_for(lambda: self.notifier.stats()["queue_depth"] == 0))
+            self.notifier.submit("Second", "fills the queue")
+            accepted = self.notifier.submit("Third", "overflows")
+            release.set()
+
+        self.assertFalse(accepted)
+        stats = self.notifier.stats()
+        self.assertEqual(stats["submitted"], 3)
+        self.assertEqual(stats["dropped"], 1)
+
+    def test_failed_delivery_is_counted(self):
+        """Sender errors are counted as failures"""
+        failing = MagicMock(side_effect=Exception("boom"))
+
+        with patch('src.api.notifier.AlertManager.channels', return_value=[("dingtalk", failing)]):
+            self.notifier = AlertNotifier(max_queue=10, workers=1)
+            self.notifier.submit("Title", "Content")
+            self.assertTrue(self._wait_for(lambda: self.notifier.stats()["failed"] == 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import sys
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from src.api.longport.subscribe.manager import SubscriptionManager
+from src.api.longport.symbol import option_chain as chain_module
+from src.api.longport.symbol.option_chain import ChainSpec, OptionChainExpander
+
+DAY = "2024-06-03"
+EXPIRIES = [date(2024, 5, 31), date(2024, 6, 7), date(2024, 6, 14), date(2024, 6, 21)]
+
+def strikes_for(underlying, expiry):
+    tag = expiry.strftime("%y%m%d")
+    return [SimpleNamespace(price=str(p), call_symbol=f"AAPL{tag}C{p * 1000}.US",
+                            put_symbol=f"AAPL{tag}P{p * 1000}.US", standard=True)
+            for p in range(80, 121)]
+
+class TestOptionChainExpander(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.ctx = AsyncMock()
+        self.ctx.option_chain_expiry_date_list.return_value = EXPIRIES
+        self.ctx.option_chain_info_by_date.side_effect = strikes_for
+        patcher = patch.object(chain_module, "longport_client")
+        client = patcher.start()
+        client.get_quote_context = AsyncMock(return_value=self.ctx)
+        self.addCleanup(patcher.stop)
+
+        self.sub_ctx = AsyncMock()
+        self.manager = SubscriptionManager(self.sub_ctx, sub_types=["Quote"])
+        self.expander = OptionChainExpander(
+            self.manager, [ChainSpec("AAPL.US", expiries=2, window_pct=5)], recenter_pct=0.5)
+
+    def contracts(self):
+        return self.manager.source("options:AAPL.US")
+
+    async def test_window_around_price(self):
+        self.expander.prices["AAPL.US"] = 100.0
+        await self.expander.rebalance(DAY)
+
+        # Expired 05-31 is skipped; 2 expiries x strikes 95..105 x call/put
+        self.assertEqual(len(self.contracts()), 2 * 11 * 2)
+        self.assertIn("AAPL240607C95000.US", self.contracts())
+        self.assertIn("AAPL240614P105000.US", self.contracts())
+        self.assertNotIn("AAPL240621C100000.US", self.contracts())
+
+    async def test_chain_is_cached_per_trading_day(self):
+        self.expander.prices["AAPL.US"] = 100.0
+        await self.expander.rebalance(DAY)
+        self.expander.prices["AAPL.US"] = 110.0
+        await self.expander.rebalance(DAY)
+        self.assertEqual(self.ctx.option_chain_expiry_date_list.await_count, 1)
+        self.assertEqual(self.ctx.option_chain_info_by_date.await_count, 2)
+
+        await self.expander.rebalance("2024-06-04")
+        self.assertEqual(self.ctx.option_chain_expiry_date_list.await_count, 2)
+
+    async def test_incremental_shift(self):
+        self.expander.prices["AAPL.US"] = 100.0
+        await self.expander.rebalance(DAY)
+        self.sub_ctx.reset_mock()
+
+        # Small move: below the re-centre threshold, nothing happens
+        self.expander.prices["AAPL.US"] = 100.3
+        self.assertEqual(await self.expander.rebalance(DAY), 0)
+        self.sub_ctx.subscribe.assert_not_awaited()
+
+        # +2%: window 96.9..107.1 -> strikes 97..107; only the edges change
+        self.expander.prices["AAPL.US"] = 102.0
+        self.assertEqual(await self.expander.rebalance(DAY), 1)
+        added = self.sub_ctx.subscribe.await_args.args[0]
+        removed = self.sub_ctx.unsubscribe.await_args.args[0]
+        self.assertEqual(len(added), 2 * 2 * 2)
+        self.assertEqual(len(removed), 2 * 2 * 2)
+        self.assertTrue(all("C106000" in s or "P106000" in s or "C107000" in s or "P107000" in s for s in added))
+
+    async def test_failed_shift_is_retried(self):
+        self.expander.prices["AAPL.US"] = 100.0
+        await self.expander.rebalance(DAY)
+
+        self.expander.prices["AAPL.US"] = 102.0
+        self.sub_ctx.subscribe.side_effect = RuntimeError("subscribe rejected")
+        self.assertEqual(await self.expander.rebalance(DAY), 0)
+
+        # Same price next pass: the window has not moved yet, so it tries again
+        self.sub_ctx.subscribe.side_effect = None
+        self.sub_ctx.subscribe.reset_mock()
+        self.assertEqual(await self.expander.rebalance(DAY), 1)
+        self.sub_ctx.subscribe.assert_awaited_once()
+        self.assertIn("AAPL240607C107000.US", self.manager.subscribed)
+
+    async def test_start_survives_failed_seed(self):
+        self.ctx.quote.side_effect = RuntimeError("quote timeout")
+        await self.expander.start()
+        self.addAsyncCleanup(self.expander.stop)
+        self.assertIsNotNone(self.expander._task)
+        self.assertEqual(self.contracts(), set())
+
+        # The first underlying push fills the window on the next pass
+        self.expander.observe("AAPL.US", SimpleNamespace(last_done="100"))
+        self.assertEqual(await self.expander.rebalance(DAY), 1)
+        self.assertEqual(len(self.contracts()), 2 * 11 * 2)
+
+    async def test_observe_only_tracks_underlyings(self):
+        self.expander.observe("AAPL.US", SimpleNamespace(last_done="101.5"))
+        self.expander.observe("NVDA.US", SimpleNamespace(last_done="900"))
+        self.assertEqual(self.expander.prices, {"AAPL.US": 101.5})
+
+    async def test_sides_filter(self):
+        expander = OptionChainExpander(self.manager, [ChainSpec("AAPL.US", expiries=1, window_pct=1, sides="put")])
+        expander.prices["AAPL.US"] = 100.0
+        await expander.rebalance(DAY)
+        self.assertEqual(self.contracts(), {"AAPL240607P99000.US", "AAPL240607P100000.US", "AAPL240607P101000.US"})
+
+    def test_specs_from_config(self):
+        specs = ChainSpec.from_config({"option_chains": [{"underlying": "TSLA.US", "window_pct": 10, "sides": "call"}]})
+        self.assertEqual([(s.underlying, s.window_pct, s.sides) for s in specs], [("TSLA.US", 10.0, "call")])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from src.api.order_tracker import OrderTracker
+
+def push(order_id, status, executed=0, symbol="AAPL.US", side="OrderSide.Buy", quantity=100, msg="",
+         remark="lbad"):
+    return SimpleNamespace(order_id=order_id, symbol=symbol, side=side, status=f"OrderStatus.{status}",
+                           submitted_quantity=quantity, submitted_price=100.0, executed_quantity=executed,
+                           executed_price=100.0 if executed else 0, updated_at=None, msg=msg, remark=remark)
+
+class TestOrderTracker(unittest.TestCase):
+    def setUp(self):
+        self.notifier = MagicMock()
+        self.now = 1000.0
+        self.tracker = OrderTracker(notifier=self.notifier, tag="lbad", retention=60, clock=lambda: self.now)
+
+    def titles(self):
+        return [c.args[0] for c in self.notifier.submit.call_args_list]
+
+    def test_lifecycle_and_alerts(self):
+        self.tracker.register("1", "AAPL.US", "Buy", 100, 100.0)
+        self.assertEqual([o.order_id for o in self.tracker.open_orders("AAPL.US")], ["1"])
+
+        self.tracker.on_order_changed(push("1", "New"))
+        self.tracker.on_order_changed(push("1", "PartialFilled", executed=40))
+        self.assertEqual(self.tracker.position("AAPL.US"), 40)
+        self.assertTrue(self.tracker.has_open_orders("AAPL.US"))
+
+        self.tracker.on_order_changed(push("1", "Filled", executed=100))
+        self.assertEqual(self.tracker.position("AAPL.US"), 100)
+        self.assertEqual(self.tracker.open_orders("AAPL.US"), [])
+        self.assertFalse(self.tracker.has_open_orders("AAPL.US"))
+        self.assertEqual(self.tracker.get("1").status, "Filled")
+
+        # New is not alert-worthy; the partial fill and the fill are
+        self.assertEqual(self.titles(), ["Order PartialFilled: Buy AAPL.US", "Order Filled: Buy AAPL.US"])
+
+    def test_duplicate_push_is_idempotent(self):
+        self.tracker.on_order_changed(push("1", "Filled", executed=100))
+        self.tracker.on_order_changed(push("1", "Filled", executed=100))
+        self.assertEqual(self.tracker.position("AAPL.US"), 100)
+        self.assertEqual(self.notifier.submit.call_count, 1)
+
+    def test_sell_reduces_position(self):
+        self.tracker.on_order_changed(push("1", "Filled", executed=100))
+        self.tracker.on_order_changed(push("2", "Filled", executed=30, side="OrderSide.Sell"))
+        self.assertEqual(self.tracker.positions(), {"AAPL.US": 70})
+
+    def test_reject_and_cancel_close_order(self):
+        self.tracker.on_order_changed(push("1", "New"))
+        self.tracker.on_order_changed(push("2", "New", symbol="NVDA.US"))
+        self.assertEqual(len(self.tracker.open_orders()), 2)
+
+        self.tracker.on_order_changed(push("1", "Rejected", msg="insufficient buying power"))
+        self.tracker.on_order_changed(push("2", "Canceled", symbol="NVDA.US"))
+        self.assertEqual(self.tracker.open_orders(), [])
+        self.assertIn("insufficient buying power", self.notifier.submit.call_args_list[0].args[1])
+        self.assertEqual(self.titles(), ["Order Rejected: Buy AAPL.US", "Order Canceled: Buy NVDA.US"])
+
+    def test_orders_placed_elsewhere_are_ignored(self):
+        self.tracker.on_order_changed(push("1", "Filled", executed=100, remark="manual"))
+        self.tracker.on_order_changed(push("2", "Filled", executed=100, remark=None))
+        self.assertIsNone(self.tracker.get("1"))
+        self.assertEqual(self.tracker.positions(), {})
+        self.notifier.submit.assert_not_called()
+
+        # Registered by the engine: tracked whatever the remark says
+        self.tracker.register("3", "AAPL.US", "Buy", 100, 100.0)
+        self.tracker.on_order_changed(push("3", "Filled", executed=100, remark=""))
+        self.assertEqual(self.tracker.position("AAPL.US"), 100)
+
+    def test_finished_orders_are_evicted(self):
+        self.tracker.on_order_changed(push("1", "Filled", executed=100))
+        self.tracker.on_order_changed(push("2", "New"))
+        self.now += 61
+        self.tracker.on_order_changed(push("2", "PartialFilled", executed=10))
+        self.assertIsNone(self.tracker.get("1"))
+        self.assertEqual(self.tracker.get("2").status, "PartialFilled")
+        self.assertEqual(self.tracker.position("AAPL.US"), 110)
+
+    def test_seed_positions(self):
+        response = SimpleNamespace(channels=[SimpleNamespace(positions=[
+            SimpleNamespace(symbol="AAPL.US", quantity="200"),
+        ])])
+        self.tracker.seed_positions(response)
+        self.tracker.on_order_changed(push("1", "Filled", executed=100, side="OrderSide.Sell"))
+        self.assertEqual(self.tracker.position("AAPL.US"), 100)
+
+class TestOrderTrackerStart(unittest.IsolatedAsyncioTestCase):
+    async def test_subscribes_private_topic_without_polling(self):
+        tracker = OrderTracker(notifier=MagicMock())
+        ctx = AsyncMock()
+        ctx.set_on_order_changed = MagicMock()
+
+        calls = []
+        ctx.stock_positions.side_effect = lambda: calls.append("seed") or SimpleNamespace(channels=[])
+        ctx.subscribe.side_effect = lambda topics: calls.append("subscribe")
+
+        await tracker.start(ctx)
+        ctx.set_on_order_changed.assert_called_once_with(tracker.on_order_changed)
+        ctx.subscribe.assert_awaited_once()
+        ctx.today_orders.assert_not_awaited()
+        # Positions are seeded before any fill can be pushed
+        self.assertEqual(calls, ["seed", "subscribe"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from config.settings import Settings
+from src.analysis.orderbook import OrderBookStore
+from src.analysis.strategy import Strategy
+
+def level(position, price, volume):
+    return SimpleNamespace(position=position, price=price, volume=volume, order_num=1)
+
+def depth(bids, asks):
+    return SimpleNamespace(
+        bids=[level(i + 1, p, v) for i, (p, v) in enumerate(bids)],
+        asks=[level(i + 1, p, v) for i, (p, v) in enumerate(asks)],
+    )
+
+class TestOrderBookStore(unittest.TestCase):
+    def setUp(self):
+        self.books = OrderBookStore(levels=5, capacity=2)
+
+    def test_apply_in_place(self):
+        """Updates overwrite the preallocated rows and clear vanished levels"""
+        idx = self.books.apply("AAPL.US", depth([(100.0, 300), (99.9, 200)], [(100.1, 100), (100.2, 100)]))
+        row = self.books.bid_price[idx]
+        self.books.apply("AAPL.US", depth([(100.05, 50)], [(100.1, 400)]))
+
+        self.assertIs(self.books.bid_price[idx].base, row.base)
+        self.assertEqual(self.books.best_bid(idx), 100.05)
+        self.assertEqual(self.books.bid_price[idx, 1], 0.0)
+        self.assertEqual(self.books.ask_volume[idx, 0], 400)
+
+    def test_spread_and_imbalance(self):
+        idx = self.books.apply("AAPL.US", depth([(99.0, 300), (98.0, 500)], [(101.0, 100), (102.0, 100)]))
+        self.assertAlmostEqual(self.books.spread_pct(idx), 2.0)
+        self.assertAlmostEqual(self.books.imbalance(idx), (800 - 200) / 1000)
+        self.assertAlmostEqual(self.books.imbalance(idx, levels=1), (300 - 100) / 400)
+
+    def test_grows_past_capacity(self):
+        for i in range(5):
+            self.books.apply(f"S{i}.US", depth([(10.0 + i, 1)], [(11.0 + i, 1)]))
+        self.assertGreaterEqual(self.books.capacity, 5)
+        self.assertEqual(self.books.best_bid(self.books.slot("S0.US")), 10.0)
+        self.assertEqual(self.books.best_bid(self.books.slot("S4.US")), 14.0)
+
+class TestDepthRules(unittest.TestCase):
+    def setUp(self):
+        Settings.SPREAD_THRESHOLD = 0.05
+        Settings.SPREAD_PCT_THRESHOLD = 1.0
+        Settings.IMBALANCE_THRESHOLD = 0.6
+        Settings.IMBALANCE_LEVELS = 5
+        self.strategy = Strategy()
+        self.books = OrderBookStore(levels=5)
+
+    def analyze(self, bids, asks):
+        idx = self.books.apply("AAPL.US", depth(bids, asks))
+        return self.strategy.analyze_depth("AAPL.US", self.books, idx)
+
+    def test_spread_narrow_from_book(self):
+        signals = self.analyze([(100.0, 100)], [(100.04, 100)])
+        self.assertEqual([s.signal_type for s in signals], ["SPREAD_NARROW"])
+
+    def test_imbalance_fires(self):
+        signals = self.analyze([(100.0, 900), (99.9, 500)], [(100.1, 100), (100.2, 100)])
+        self.assertEqual([s.signal_type for s in signals], ["ORDER_IMBALANCE"])
+        self.assertGreater(signals[0].value, 0)
+        self.assertIn("Bid-heavy", signals[0].details)
+
+    def test_imbalance_ignored_on_wide_spread(self):
+        self.assertEqual(self.analyze([(90.0, 900)], [(100.0, 100)]), [])
+
+    def test_empty_side(self):
+        self.assertEqual(self.analyze([(100.0, 900)], []), [])
+
+if __name__ == '__main__':
+    unittest.main()
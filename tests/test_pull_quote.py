@@ -0,0 +1,206 @@
+import sys
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from src.analysis.quotes import QuoteStore
+from src.utils.cache import TTLCache
+from src.api.longport.pull import quote as quote_module
+from src.api.longport.pull.quote import get_quote
+from src.api.longport.symbol.metadata import MetadataStore
+
+def make_quote(symbol, last=10.0, prev=9.0):
+    q = MagicMock()
+    q.symbol = symbol
+    q.last_done = str(last)
+    q.prev_close = str(prev)
+    return q
+
+def make_info(symbol):
+    info = MagicMock()
+    info.symbol = symbol
+    info.name_cn = f"name-{symbol}"
+    return info
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.cache = TTLCache(ttl=10, max_size=3, clock=lambda: self.now)
+
+    def test_expiry(self):
+        self.cache.set("a", 1)
+        self.now = 9.9
+        self.assertEqual(self.cache.get("a"), 1)
+        self.now = 10.0
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_get_many_splits_hits_and_misses(self):
+        self.cache.set_many({"a": 1, "b": None})
+        found, missing = self.cache.get_many(["a", "b", "c"])
+        self.assertEqual(found, {"a": 1, "b": None})
+        self.assertEqual(missing, ["c"])
+
+    def test_evicts_oldest(self):
+        self.cache.set_many({"a": 1, "b": 2, "c": 3})
+        self.cache.set("a", 10)  # refreshed, now newest
+        self.cache.set("d", 4)
+        found, missing = self.cache.get_many(["a", "b", "c", "d"])
+        self.assertEqual(missing, ["b"])
+
+class TestGetQuote(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        quote_module._static_names.clear()
+        store_patcher = patch.object(quote_module, "metadata_store", MetadataStore(":memory:"))
+        self.store = store_patcher.start()
+        self.addCleanup(store_patcher.stop)
+        self.ctx = AsyncMock()
+        self.ctx.quote.side_effect = lambda chunk: [make_quote(s) for s in chunk]
+        self.ctx.static_info.side_effect = lambda chunk: [make_info(s) for s in chunk]
+        patcher = patch.object(quote_module, "longport_client")
+        self.client = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client.get_quote_context = AsyncMock(return_value=self.ctx)
+        # Latest-quote cache off by default so each call below reaches ctx.quote
+        self.now = 100.0
+        self.quotes = QuoteStore(clock=lambda: self.now)
+        for patcher in (patch.object(quote_module, "quote_store", self.quotes),
+                        patch.object(quote_module.Settings, "QUOTE_MAX_AGE", 0)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @patch.object(quote_module.Settings, "QUOTE_BATCH_SIZE", 2)
+    async def test_chunks_to_batch_limit(self):
+        symbols = [f"S{i}.US" for i in range(5)]
+        result = await get_quote(symbols + ["S0.US"])
+
+        self.assertEqual(set(result), set(symbols))
+        self.assertEqual([len(c.args[0]) for c in self.ctx.quote.await_args_list], [2, 2, 1])
+        self.assertEqual(self.ctx.static_info.await_count, 3)
+        self.assertEqual(result["S4.US"]["name"], "name-S4.US")
+
+    async def test_static_info_is_cached(self):
+        await get_quote(["AAPL.US", "NVDA.US"])
+        result = await get_quote(["AAPL.US", "NVDA.US"])
+
+        self.assertEqual(self.ctx.quote.await_count, 2)
+        self.assertEqual(self.ctx.static_info.await_count, 1)
+        self.assertEqual(result["NVDA.US"]["name"], "name-NVDA.US")
+
+        # Only names not cached yet are looked up
+        await get_quote(["AAPL.US", "TSLA.US"])
+        self.assertEqual(self.ctx.static_info.await_args.args[0], ["TSLA.US"])
+
+    async def test_known_symbols_need_no_static_info_after_restart(self):
+        self.store.upsert_static_infos([make_info("AAPL.US")])
+        result = await get_quote(["AAPL.US"])
+        self.ctx.static_info.assert_not_awaited()
+        self.assertEqual(result["AAPL.US"]["name"], "name-AAPL.US")
+
+    async def test_quote_and_static_info_run_concurrently(self):
+        in_flight = 0
+        peak = 0
+
+        async def slow(chunk, factory):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [factory(s) for s in chunk]
+
+        async def quote(chunk):
+            return await slow(chunk, make_quote)
+
+        async def static_info(chunk):
+            return await slow(chunk, make_info)
+
+        self.ctx.quote.side_effect = quote
+        self.ctx.static_info.side_effect = static_info
+        await get_quote(["AAPL.US"])
+        self.assertEqual(peak, 2)
+
+    @patch.object(quote_module.Settings, "QUOTE_BATCH_SIZE", 1)
+    async def test_failed_chunk_loses_only_its_symbols(self):
+        def quote(chunk):
+            if chunk == ["BAD.US"]:
+                raise RuntimeError("rate limited")
+            return [make_quote(s) for s in chunk]
+        self.ctx.quote.side_effect = quote
+
+        result = await get_quote(["AAPL.US", "BAD.US"])
+        self.assertEqual(list(result), ["AAPL.US"])
+
+    @patch.object(quote_module.Settings, "QUOTE_BATCH_SIZE", 1)
+    async def test_failed_static_info_chunk_is_retried(self):
+        def static_info(chunk):
+            if chunk == ["BAD.US"]:
+                raise RuntimeError("rate limited")
+            return [make_info(s) for s in chunk if s != "GONE.US"]
+        self.ctx.static_info.side_effect = static_info
+
+        result = await get_quote(["AAPL.US", "BAD.US", "GONE.US"])
+        self.assertEqual(result["BAD.US"]["name"], "BAD.US")
+        self.assertEqual(result["GONE.US"]["name"], "GONE.US")
+
+        # GONE.US is cached as unknown, BAD.US is looked up again
+        self.ctx.static_info.side_effect = lambda chunk: [make_info(s) for s in chunk]
+        self.ctx.static_info.reset_mock()
+        result = await get_quote(["AAPL.US", "BAD.US", "GONE.US"])
+        self.assertEqual([c.args[0] for c in self.ctx.static_info.await_args_list], [["BAD.US"]])
+        self.assertEqual(result["BAD.US"]["name"], "name-BAD.US")
+
+class TestGetQuoteFromStore(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        TestGetQuote.setUp(self)
+        patcher = patch.object(quote_module.Settings, "QUOTE_MAX_AGE", 5)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.store.upsert_static_infos([make_info("AAPL.US"), make_info("NVDA.US")])
+
+    async def test_fresh_push_skips_the_api(self):
+        self.quotes.update("AAPL.US", make_quote("AAPL.US", last=11.0, prev=10.0))
+        result = await get_quote(["AAPL.US"])
+        self.ctx.quote.assert_not_awaited()
+        self.assertEqual(result["AAPL.US"]["last_price"], 11.0)
+        self.assertEqual(result["AAPL.US"]["change_rate"], "+10.00%")
+
+    async def test_cached_quote_reports_its_push_time(self):
+        self.quotes.update("AAPL.US", make_quote("AAPL.US"))
+        self.now += 4
+        with patch.object(quote_module, "datetime") as clock:
+            clock.now.return_value = datetime(2024, 3, 4, 10, 0, 0)
+            result = await get_quote(["AAPL.US"])
+        self.assertEqual(result["AAPL.US"]["updated_at"], "2024-03-04 09:59:56")
+
+    async def test_only_stale_and_unknown_symbols_are_fetched(self):
+        self.quotes.update("AAPL.US", make_quote("AAPL.US"))
+        self.now += 10
+        self.quotes.update("NVDA.US", make_quote("NVDA.US"))
+        result = await get_quote(["AAPL.US", "NVDA.US", "TSLA.US"])
+        self.assertEqual(self.ctx.quote.await_args.args[0], ["AAPL.US", "TSLA.US"])
+        self.assertEqual(set(result), {"AAPL.US", "NVDA.US", "TSLA.US"})
+
+        # The snapshots refreshed the store
+        await get_quote(["AAPL.US", "TSLA.US"])
+        self.assertEqual(self.ctx.quote.await_count, 1)
+
+    async def test_push_without_prev_close_keeps_snapshot_value(self):
+        self.quotes.update("AAPL.US", SimpleNamespace(last_done=12.0))
+        await get_quote(["AAPL.US"])
+        self.assertEqual(self.ctx.quote.await_count, 1)  # no prev_close yet
+
+        self.quotes.update("AAPL.US", SimpleNamespace(last_done=12.0))
+        result = await get_quote(["AAPL.US"])
+        self.assertEqual(self.ctx.quote.await_count, 1)
+        self.assertEqual(result["AAPL.US"]["pre_close_price"], 9.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import sys
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from decimal import Decimal
+from src.analysis.quotes import QuoteStore
+
+class TestQuoteStore(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.store = QuoteStore(clock=lambda: self.now)
+
+    def test_update_converts_and_timestamps(self):
+        rec = self.store.update("AAPL.US", SimpleNamespace(last_done=Decimal("101.5"), prev_close=Decimal("100"),
+                                                           volume=1200, turnover=Decimal("121800")))
+        self.assertEqual((rec.last_done, rec.prev_close, rec.volume), (101.5, 100.0, 1200))
+        self.assertIs(self.store.get("AAPL.US"), rec)
+        self.now = 2.5
+        self.assertEqual(self.store.age("AAPL.US"), 2.5)
+        self.assertEqual(self.store.age("NVDA.US"), float("inf"))
+
+    def test_updates_publish_new_records(self):
+        """Readers holding a record never see it change"""
+        first = self.store.update("AAPL.US", SimpleNamespace(last_done=100.0, prev_close=99.0))
+        second = self.store.update("AAPL.US", SimpleNamespace(last_done=101.0))
+        self.assertEqual(first.last_done, 100.0)
+        self.assertEqual(second.prev_close, 99.0)  # carried over from the snapshot
+
+    def test_fresh_split(self):
+        self.store.update("OLD.US", SimpleNamespace(last_done=1.0, prev_close=1.0))
+        self.now = 10.0
+        self.store.update("NEW.US", SimpleNamespace(last_done=1.0, prev_close=1.0))
+        self.store.update("NOPREV.US", SimpleNamespace(last_done=1.0))
+        found, missing = self.store.fresh(["OLD.US", "NEW.US", "NOPREV.US", "UNKNOWN.US"], max_age=5)
+        self.assertEqual(list(found), ["NEW.US"])
+        self.assertEqual(missing, ["OLD.US", "NOPREV.US", "UNKNOWN.US"])
+
+    def test_concurrent_writer(self):
+        store = QuoteStore()
+        done = threading.Event()
+
+        def writer():
+            for i in range(1, 20001):
+                store.update("AAPL.US", SimpleNamespace(last_done=float(i), prev_close=float(i)))
+            done.set()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        while not done.is_set():
+            rec = store.get("AAPL.US")
+            if rec is not None:
+                self.assertEqual(rec.last_done, rec.prev_close)
+        thread.join()
+        self.assertEqual(store.get("AAPL.US").last_done, 20000.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import sys
+import os
+import tempfile
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from src.monitor.recorder import (
+    QuoteRecorder, QuoteReplayer, ReplayClock, CollectingSink, build_replay_handler,
+)
+
+def make_quote(last, prev_close=100.0, ts=1700000000.0, volume=1000):
+    return SimpleNamespace(
+        last_done=last, open=100.0, high=max(last, 100.0), low=min(last, 100.0),
+        prev_close=prev_close, volume=volume, turnover=last * volume,
+        timestamp=datetime.fromtimestamp(ts),
+    )
+
+def make_depth(bids, asks):
+    return SimpleNamespace(
+        bids=[SimpleNamespace(position=i + 1, price=p, volume=v) for i, (p, v) in enumerate(bids)],
+        asks=[SimpleNamespace(position=i + 1, price=p, volume=v) for i, (p, v) in enumerate(asks)],
+    )
+
+class TestRecorder(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.recorder = QuoteRecorder(self.tmp.name)
+        self.now = datetime(2024, 3, 1, 10, 0).timestamp()
+
+    def tearDown(self):
+        self.recorder.close()
+        self.tmp.cleanup()
+
+    def recorded_files(self):
+        return sorted(os.listdir(self.tmp.name))
+
+    def test_round_trip(self):
+        """Quotes and depth come back with the same fields and order"""
+        self.recorder.record_quote("AAPL.US", make_quote(101.5), received_at=self.now)
+        self.recorder.record_depth("AAPL.US", make_depth([(101.4, 300)], [(101.6, 200), (101.7, 50)]),
+                                   received_at=self.now + 0.1)
+        self.recorder.record_quote("NVDA.US", make_quote(480.0, prev_close=470.0), received_at=self.now + 0.2)
+        self.recorder.close()
+
+        path = os.path.join(self.tmp.name, self.recorded_files()[0])
+        events = list(QuoteReplayer(path).events())
+        self.assertEqual([(k, s) for k, s, _, _ in events],
+                         [("quote", "AAPL.US"), ("depth", "AAPL.US"), ("quote", "NVDA.US")])
+
+        _, _, quote, received_at = events[0]
+        self.assertAlmostEqual(received_at, self.now)
+        self.assertEqual(quote.last_done, 101.5)
+        self.assertEqual(quote.prev_close, 100.0)
+        self.assertEqual(quote.volume, 1000)
+        self.assertEqual(quote.timestamp, datetime.fromtimestamp(1700000000.0))
+
+        _, _, depth, _ = events[1]
+        self.assertEqual([(l.price, l.volume) for l in depth.bids], [(101.4, 300)])
+        self.assertEqual([(l.position, l.price) for l in depth.asks], [(1, 101.6), (2, 101.7)])
+
+    def test_missing_fields_become_none(self):
+        """Push quotes carry no prev_close; replay must not invent one"""
+        quote = make_quote(101.5)
+        del quote.prev_close
+        self.recorder.record_quote("AAPL.US", quote, received_at=self.now)
+        self.recorder.close()
+
+        path = os.path.join(self.tmp.name, self.recorded_files()[0])
+        _, _, replayed, _ = next(QuoteReplayer(path).events())
+        self.assertIsNone(replayed.prev_close)
+
+    def test_daily_rotation(self):
+        """A new file is started when the receive date changes"""
+        self.recorder.record_quote("AAPL.US", make_quote(101.0), received_at=self.now)
+        self.recorder.record_quote("AAPL.US", make_quote(102.0), received_at=self.now + 86400)
+        self.recorder.close()
+        self.assertEqual(self.recorded_files(), ["quotes-20240301.lbr", "quotes-20240302.lbr"])
+
+        # Each file is self-contained (symbol table re-declared)
+        for name in self.recorded_files():
+            events = list(QuoteReplayer(os.path.join(self.tmp.name, name)).events())
+            self.assertEqual(len(events), 1)
+            self.assertEqual(events[0][1], "AAPL.US")
+
+    def test_truncated_tail_is_ignored(self):
+        self.recorder.record_quote("AAPL.US", make_quote(101.0), received_at=self.now)
+        self.recorder.record_quote("AAPL.US", make_quote(102.0), received_at=self.now + 1)
+        self.recorder.close()
+        path = os.path.join(self.tmp.name, self.recorded_files()[0])
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 10)
+        self.assertEqual(len(list(QuoteReplayer(path).events())), 1)
+
+    def test_replay_through_strategy_suppresses_webhooks(self):
+        """Replayed signals reach a collecting sink, and cooldowns follow recorded time"""
+        for i in range(3):
+            self.recorder.record_quote("AAPL.US", make_quote(103.0, ts=1700000000.0 + i),
+                                       received_at=self.now + i)
+        self.recorder.close()
+        path = os.path.join(self.tmp.name, self.recorded_files()[0])
+
+        clock = ReplayClock()
+        handler = build_replay_handler(clock=clock)
+        self.assertIsInstance(handler.notifier, CollectingSink)
+
+        count = QuoteReplayer(path).replay(handler, clock=clock)
+        self.assertEqual(count, 3)
+        self.assertEqual(clock(), self.now + 2)
+
+        titles = [title for title, _ in handler.notifier.alerts]
+        # Same move three times within the cooldown: one alert, the rest suppressed
+        self.assertEqual(sum("PRICE_FLUCTUATION" in t for t in titles), 1)
+
+    def test_replay_measures_pushes_against_recorded_snapshot(self):
+        """A snapshot seeds prev_close; the pushes after it carry none, as live ones do"""
+        self.recorder.record_quote("AAPL.US", make_quote(100.0), received_at=self.now)
+        for i, last in enumerate((101.0, 103.0, 106.0)):
+            push = make_quote(last, ts=1700000001.0 + i)
+            del push.prev_close
+            self.recorder.record_quote("AAPL.US", push, received_at=self.now + 1 + i)
+        self.recorder.close()
+        path = os.path.join(self.tmp.name, self.recorded_files()[0])
+
+        clock = ReplayClock()
+        handler = build_replay_handler(clock=clock)
+        QuoteReplayer(path).replay(handler, clock=clock)
+        self.assertTrue(any("PRICE_FLUCTUATION" in title for title, _ in handler.notifier.alerts))
+
+if __name__ == '__main__':
+    unittest.main()
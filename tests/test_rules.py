@@ -0,0 +1,129 @@
+import sys
+import os
+import tempfile
+from unittest.mock import MagicMock
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from config.settings import Settings
+from src.analysis.rules import RuleTable, RuleBook
+from src.analysis.strategy import Strategy
+from src.analysis.batch import BatchStrategy
+
+OPTION = "AAPL240119C190000.US"
+
+CONFIG = {
+    "rules": {
+        "default": {"spread": 0.05},
+        "classes": {
+            "option": {"pattern": r"^[A-Z]+\d{6}[CP]\d+\.US$", "price_change": 20, "disabled": ["INSTANT_MOVE"]},
+            "mega_cap": {"symbols": ["AAPL.US", "MSFT.US"], "price_change": 1.5},
+        },
+        "symbols": {"MSFT.US": {"price_change": 1.0, "enabled": ["PRICE_FLUCTUATION"]}},
+    },
+    "custom_thresholds": {"TSLA.US": {"price_change": 5}},
+}
+
+def make_quote(symbol, last_done, prev_close):
+    quote = MagicMock()
+    quote.symbol = symbol
+    quote.last_done = last_done
+    quote.prev_close = prev_close
+    quote.bid_price = []
+    quote.ask_price = []
+    return quote
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestRuleTable(unittest.TestCase):
+    def setUp(self):
+        Settings.PRICE_CHANGE_THRESHOLD = 2.0
+        self.table = RuleTable(CONFIG, symbols=["AAPL.US"])
+
+    def test_layers(self):
+        self.assertEqual(self.table.get("NVDA.US").price_change, 2.0)
+        self.assertEqual(self.table.get("NVDA.US").spread, 0.05)
+        self.assertEqual(self.table.get("AAPL.US").price_change, 1.5)
+        self.assertEqual(self.table.get(OPTION).price_change, 20)
+        self.assertEqual(self.table.get("MSFT.US").price_change, 1.0)
+        self.assertEqual(self.table.get("TSLA.US").price_change, 5)
+
+    def test_enabled_rules(self):
+        option = self.table.get(OPTION)
+        self.assertFalse(option.instant_on)
+        self.assertTrue(option.price_on and option.spread_on and option.imbalance_on)
+        msft = self.table.get("MSFT.US")
+        self.assertEqual((msft.price_on, msft.spread_on, msft.instant_on), (True, False, False))
+
+    def test_known_symbols_precompiled_and_others_memoized(self):
+        self.assertEqual(len(self.table), 3)  # AAPL, MSFT, TSLA
+        first = self.table.get("NVDA.US")
+        self.assertIs(self.table.get("NVDA.US"), first)
+
+    def test_invalid_config_rejected(self):
+        with self.assertRaises(ValueError):
+            RuleTable({"rules": {"symbols": {"AAPL.US": {"price_chnage": 1}}}})
+        with self.assertRaises(ValueError):
+            RuleTable({"rules": {"default": {"disabled": ["NOT_A_RULE"]}}})
+
+class TestRuleBookReload(unittest.TestCase):
+    def setUp(self):
+        Settings.PRICE_CHANGE_THRESHOLD = 2.0
+        Settings.SPREAD_THRESHOLD = 0.05
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "symbols.yaml")
+        self.write("rules: {}\n")
+        self.clock = FakeClock()
+        self.book = RuleBook(config={}, path=self.path, interval=5, clock=self.clock)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, text):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(text)
+        # Distinct mtime even on coarse filesystem clocks
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def test_poll_swaps_table_after_interval(self):
+        strategy = Strategy(rules=self.book)
+        batch = BatchStrategy(rules=self.book)
+        quote = make_quote("NVDA.US", "103.0", "100.0")
+        self.assertEqual(len(strategy.analyze(quote)), 1)
+        self.assertEqual(len(batch.analyze_batch([quote])), 1)
+
+        old = self.book.table
+        self.write("rules:\n  symbols:\n    NVDA.US:\n      price_change: 5\n")
+        self.assertFalse(self.book.poll())  # interval not elapsed yet
+        self.clock.now += 5
+        self.assertTrue(self.book.poll())
+        self.assertIsNot(self.book.table, old)
+        self.assertEqual(self.book.version, 2)
+
+        # Both engines see the new threshold on the next tick
+        self.assertEqual(strategy.analyze(quote), [])
+        self.assertEqual(batch.analyze_batch([quote]), [])
+
+    def test_bad_file_keeps_current_table(self):
+        old = self.book.table
+        self.write("rules:\n  symbols:\n    NVDA.US:\n      bogus: 1\n")
+        self.clock.now += 5
+        self.assertFalse(self.book.poll())
+        self.assertIs(self.book.table, old)
+
+        # Unchanged file: no reload attempt
+        self.clock.now += 5
+        self.assertFalse(self.book.poll())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from src.api.longport.subscribe.manager import SubscriptionManager
+from src.api.longport.subscribe.scheduler import SubscriptionScheduler
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def quote(symbol, last):
+    return SimpleNamespace(symbol=symbol, last_done=last, prev_close=100.0)
+
+class TestSubscriptionScheduler(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.ctx = AsyncMock()
+        self.clock = FakeClock()
+        self.polled = []
+        self.manager = SubscriptionManager(self.ctx, sub_types=["Quote"], budget=2)
+        self.scheduler = SubscriptionScheduler(
+            self.manager, sink=self.polled.extend, pinned=["PIN.US"], interval=10,
+            min_poll=2, max_poll=16, half_life=60, hysteresis=0.2, clock=self.clock,
+        )
+
+    async def test_budget_keeps_pinned_and_ranks_the_rest(self):
+        self.scheduler.observe("B.US", quote("B.US", 100))
+        self.clock.now += 10
+        self.scheduler.observe("B.US", quote("B.US", 103))
+        await self.manager.set_source("config", ["A.US", "B.US", "C.US", "PIN.US"])
+        self.assertEqual(self.manager.subscribed, {"PIN.US", "B.US"})
+        self.assertEqual(self.manager.overflow(), {"A.US", "C.US"})
+
+    async def test_no_budget_subscribes_everything(self):
+        manager = SubscriptionManager(self.ctx, sub_types=["Quote"])
+        await manager.set_source("config", ["A.US", "B.US", "C.US"])
+        self.assertEqual(manager.overflow(), set())
+
+    async def test_signals_promote_and_hysteresis_holds(self):
+        await self.manager.set_source("config", ["A.US", "B.US", "C.US", "PIN.US"])
+        self.assertEqual(self.manager.subscribed, {"PIN.US", "A.US"})
+
+        for _ in range(3):
+            self.scheduler.note_signal(SimpleNamespace(symbol="C.US"))
+        promoted, demoted = await self.scheduler.reschedule()
+        self.assertEqual((promoted, demoted), (["C.US"], ["A.US"]))
+
+        # An equally busy challenger does not beat the incumbent's bonus
+        for _ in range(3):
+            self.scheduler.note_signal(SimpleNamespace(symbol="B.US"))
+        self.assertEqual(await self.scheduler.reschedule(), ([], []))
+        self.scheduler.note_signal(SimpleNamespace(symbol="B.US"))
+        self.assertEqual(await self.scheduler.reschedule(), (["B.US"], ["C.US"]))
+
+    def test_pushed_and_polled_paths_score_alike(self):
+        # Same 2% rise over 20s: A pushed every second, B polled every 10s
+        for i in range(21):
+            self.scheduler.observe("A.US", quote("A.US", 100 + i * 0.1))
+            if i % 10 == 0:
+                self.scheduler.observe("B.US", quote("B.US", 100 + i * 0.1))
+            self.clock.now += 1
+        self.assertAlmostEqual(self.scheduler.score("A.US"), self.scheduler.score("B.US"), places=6)
+
+    def test_scores_decay(self):
+        self.scheduler.note_signal(SimpleNamespace(symbol="A.US"))
+        self.clock.now += 60
+        self.scheduler.decay()
+        self.assertAlmostEqual(self.scheduler.score("A.US"), 0.5)
+
+    async def test_reschedule_evicts_unwanted_symbols(self):
+        await self.manager.set_source("options:AAPL.US", ["A.US", "B.US"])
+        for symbol in ("A.US", "B.US", "PIN.US"):
+            self.scheduler.note_signal(SimpleNamespace(symbol=symbol))
+
+        # The option window moved past B; pinned symbols stay whether wanted or not
+        await self.manager.set_source("options:AAPL.US", ["A.US"])
+        await self.scheduler.reschedule()
+        self.assertEqual(set(self.scheduler._activity), {"A.US", "PIN.US"})
+
+    async def test_poll_interval_adapts_to_activity(self):
+        await self.manager.set_source("config", ["A.US", "B.US", "C.US", "PIN.US"])
+        self.assertEqual(self.scheduler.due(), ["B.US", "C.US"])
+
+        ctx = AsyncMock()
+        prices = {"B.US": 10.0, "C.US": 20.0}
+
+        async def fetch(symbols):
+            return [quote(s, prices[s]) for s in symbols]
+        ctx.quote.side_effect = fetch
+
+        with patch("src.api.longport.subscribe.scheduler.longport_client.get_quote_context",
+                   AsyncMock(return_value=ctx)):
+            self.assertEqual(await self.scheduler.poll(), 2)
+            self.assertEqual([s for s, _ in self.polled], ["B.US", "C.US"])
+            ctx.quote.assert_awaited_once_with(["B.US", "C.US"])
+
+            # Nothing due until the per-symbol interval elapses
+            self.assertEqual(await self.scheduler.poll(), 0)
+
+            # B moves (interval stays at the floor), C is flat (interval doubles)
+            prices["B.US"] = 10.5
+            self.clock.now += 4
+            await self.scheduler.poll()
+            self.assertEqual(self.scheduler._activity["B.US"].interval, 2)
+            self.assertEqual(self.scheduler._activity["C.US"].interval, 4)
+            self.clock.now += 2
+            self.assertEqual(self.scheduler.due(), ["B.US"])
+
+    async def test_failed_poll_retries_slowly(self):
+        await self.manager.set_source("config", ["A.US", "B.US", "PIN.US"])
+        ctx = AsyncMock()
+        ctx.quote.side_effect = RuntimeError("rate limited")
+        with patch("src.api.longport.subscribe.scheduler.longport_client.get_quote_context",
+                   AsyncMock(return_value=ctx)):
+            self.assertEqual(await self.scheduler.poll(), 0)
+        self.assertEqual(self.scheduler.due(), [])
+        self.clock.now += 16
+        self.assertEqual(self.scheduler.due(), ["B.US"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from config.settings import Settings
+from src.monitor.sharding import ShmRing, ShardQuote, ShardedAnalyzer
+
+class TestShmRing(unittest.TestCase):
+    def setUp(self):
+        self.ring = ShmRing(capacity=4)
+
+    def tearDown(self):
+        self.ring.close()
+
+    def test_fifo_and_wraparound(self):
+        """Records come out in order across several laps of the ring"""
+        seen = []
+        for i in range(10):
+            self.assertTrue(self.ring.push(b"AAPL.US", i, 100.0 + i, 99.0, float("nan"), float("nan"), i))
+            seen.extend(r[1] for r in self.ring.pop_many())
+        self.assertEqual(seen, list(range(10)))
+
+    def test_full_ring_rejects(self):
+        for i in range(4):
+            self.assertTrue(self.ring.push(b"AAPL.US", i, 1.0, 1.0, 1.0, 1.0, 0))
+        self.assertFalse(self.ring.push(b"AAPL.US", 4, 1.0, 1.0, 1.0, 1.0, 0))
+        self.assertEqual(len(self.ring.pop_many(2)), 2)
+        self.assertEqual(len(self.ring), 2)
+
+    def test_attach_by_name(self):
+        other = ShmRing(capacity=4, name=self.ring.name)
+        self.ring.push(b"NVDA.US", 1.5, 10.0, 9.0, 9.9, 10.1, 500)
+        quote = ShardQuote(other.pop_many()[0])
+        other.close()
+        self.assertEqual(quote.symbol, "NVDA.US")
+        self.assertEqual(quote.bid_price, [9.9])
+        self.assertEqual(len(self.ring), 0)
+
+class TestShardedAnalyzer(unittest.TestCase):
+    def test_signals_come_back_from_workers(self):
+        """Quotes routed through worker processes produce signals in the parent"""
+        Settings.PRICE_CHANGE_THRESHOLD = 2.0
+        received = []
+        analyzer = ShardedAnalyzer(sink=received.append, workers=2, capacity=64, context="fork")
+        analyzer.start()
+        try:
+            symbols = ["AAPL.US", "NVDA.US", "TSLA.US", "MSFT.US"]
+            for symbol in symbols:
+                analyzer.on_quote(symbol, SimpleNamespace(last_done=105.0, prev_close=100.0, volume=0))
+                analyzer.on_quote(symbol, SimpleNamespace(last_done=100.5, prev_close=100.0, volume=0))
+
+            deadline = time.monotonic() + 10
+            fluctuations = lambda: [s for s in received if s.signal_type == "PRICE_FLUCTUATION"]
+            while len(fluctuations()) < len(symbols) and time.monotonic() < deadline:
+                time.sleep(0.05)
+        finally:
+            analyzer.stop()
+
+        self.assertEqual(sorted(s.symbol for s in fluctuations()), sorted(symbols))
+        self.assertEqual(analyzer.forwarded, 8)
+        self.assertEqual(analyzer.dropped, 0)
+
+    def test_push_without_prev_close_uses_snapshot(self):
+        """Pushes carry no prev_close; the worker keeps the one from the snapshot"""
+        Settings.PRICE_CHANGE_THRESHOLD = 2.0
+        received = []
+        analyzer = ShardedAnalyzer(sink=received.append, workers=1, capacity=64, context="fork")
+        analyzer.start()
+        try:
+            analyzer.on_quote("AAPL.US", SimpleNamespace(last_done=100.5, prev_close=100.0, volume=0))
+            analyzer.on_quote("AAPL.US", SimpleNamespace(last_done=105.0, volume=0))
+            deadline = time.monotonic() + 10
+            while not any(s.signal_type == "PRICE_FLUCTUATION" for s in received) and time.monotonic() < deadline:
+                time.sleep(0.05)
+        finally:
+            analyzer.stop()
+
+        fluctuations = [s for s in received if s.signal_type == "PRICE_FLUCTUATION"]
+        self.assertEqual([s.price for s in fluctuations], [105.0])
+
+    def test_shard_assignment_is_stable(self):
+        analyzer = ShardedAnalyzer(sink=None, workers=4)
+        self.assertEqual(analyzer.shard_of("AAPL.US"), analyzer.shard_of("AAPL.US"))
+        self.assertTrue(0 <= analyzer.shard_of("NVDA.US") < 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import sys
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from config.settings import Settings, _Settings
+from src.api.longport.client import LongPortClient
+from src.monitor.startup import StartupTimer
+
+class TestSettingsLoad(unittest.TestCase):
+    def test_load_runs_once(self):
+        Settings.load()
+        with patch("config.settings._read_settings") as read:
+            Settings.load()
+            read.assert_not_called()
+
+    @patch.dict("os.environ", {"QUOTE_BATCH_SIZE": "123"})
+    def test_reload_rereads_environment(self):
+        previous = Settings.QUOTE_BATCH_SIZE
+        try:
+            Settings.load(reload=True)
+            self.assertEqual(Settings.QUOTE_BATCH_SIZE, 123)
+        finally:
+            Settings.QUOTE_BATCH_SIZE = previous
+
+    def test_unknown_setting_raises(self):
+        with self.assertRaises(AttributeError):
+            Settings.NOT_A_SETTING
+
+    def test_use_before_load_raises(self):
+        settings = _Settings()
+        with self.assertRaises(AttributeError):
+            settings.QUOTE_BATCH_SIZE
+        # A write now would be lost to the load below
+        with self.assertRaises(RuntimeError):
+            settings.QUOTE_BATCH_SIZE = 1
+        settings.load()
+        settings.QUOTE_BATCH_SIZE = 1
+        self.assertEqual(settings.QUOTE_BATCH_SIZE, 1)
+
+class TestStartupTimer(unittest.IsolatedAsyncioTestCase):
+    async def test_phases_are_reported(self):
+        now = [0.0]
+        timer = StartupTimer(clock=lambda: now[0])
+        timer.record("settings", 5.0)
+        with timer.phase("subscribe"):
+            now[0] += 0.02
+
+        async def connect():
+            now[0] += 0.1
+            return "ctx"
+        self.assertEqual(await timer.timed("quote_context", connect()), "ctx")
+
+        self.assertEqual([name for name, _ in timer.phases], ["settings", "subscribe", "quote_context"])
+        self.assertEqual(timer.report(),
+                         "Startup finished in 120.0ms (settings=5.0ms, subscribe=20.0ms, quote_context=100.0ms)")
+
+class TestClientContexts(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_callers_share_one_context(self):
+        client = object.__new__(LongPortClient)
+        created = []
+
+        async def create(config):
+            await asyncio.sleep(0)
+            created.append(config)
+            return MagicMock()
+
+        openapi = sys.modules["longport.openapi"]
+        with patch.object(openapi.AsyncQuoteContext, "create", side_effect=create):
+            first, second = await asyncio.gather(client.get_quote_context(), client.get_quote_context())
+        self.assertIs(first, second)
+        self.assertEqual(len(created), 1)
+
+if __name__ == '__main__':
+    unittest.main()
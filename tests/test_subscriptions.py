@@ -0,0 +1,145 @@
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from src.api.longport.subscribe.manager import SubscriptionManager
+from src.api.longport.personalized import watchlist as watchlist_module
+from src.api.longport.personalized.watchlist import WatchlistSync
+
+def symbols_of(mock_method):
+    return [s for call in mock_method.await_args_list for s in call.args[0]]
+
+class TestSubscriptionManager(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.ctx = AsyncMock()
+        self.manager = SubscriptionManager(self.ctx, sub_types=["Quote"])
+
+    async def test_only_diff_is_sent(self):
+        await self.manager.set_source("config", ["AAPL.US", "NVDA.US"])
+        self.ctx.subscribe.assert_awaited_once_with(["AAPL.US", "NVDA.US"], ["Quote"], is_first_push=True)
+
+        self.ctx.subscribe.reset_mock()
+        added, removed = await self.manager.set_source("config", ["AAPL.US", "TSLA.US"])
+        self.assertEqual((added, removed), (["TSLA.US"], ["NVDA.US"]))
+        self.ctx.subscribe.assert_awaited_once_with(["TSLA.US"], ["Quote"], is_first_push=True)
+        self.ctx.unsubscribe.assert_awaited_once_with(["NVDA.US"], ["Quote"])
+
+    async def test_unchanged_source_makes_no_calls(self):
+        await self.manager.set_source("config", ["AAPL.US"])
+        self.ctx.reset_mock()
+        await self.manager.set_source("config", ["AAPL.US"])
+        self.ctx.subscribe.assert_not_awaited()
+        self.ctx.unsubscribe.assert_not_awaited()
+
+    async def test_union_of_sources(self):
+        """A symbol stays subscribed while any source still wants it"""
+        await self.manager.set_source("config", ["AAPL.US"])
+        await self.manager.set_source("watchlist", ["AAPL.US", "NVDA.US"])
+        await self.manager.set_source("watchlist", [])
+        self.assertEqual(self.manager.subscribed, {"AAPL.US"})
+        self.assertEqual(symbols_of(self.ctx.unsubscribe), ["NVDA.US"])
+
+        await self.manager.remove_source("config")
+        self.assertEqual(self.manager.subscribed, set())
+
+    @patch("src.api.longport.subscribe.manager.Settings.QUOTE_BATCH_SIZE", 2)
+    async def test_chunks_large_diffs(self):
+        await self.manager.set_source("config", [f"S{i}.US" for i in range(5)])
+        self.assertEqual([len(c.args[0]) for c in self.ctx.subscribe.await_args_list], [2, 2, 1])
+
+    async def test_failed_subscribe_is_retried_next_apply(self):
+        self.ctx.subscribe.side_effect = [RuntimeError("timeout"), None]
+        with self.assertRaises(RuntimeError):
+            await self.manager.set_source("config", ["AAPL.US"])
+        self.assertEqual(self.manager.subscribed, set())
+        await self.manager.apply()
+        self.assertEqual(self.manager.subscribed, {"AAPL.US"})
+
+    @patch("src.api.longport.subscribe.manager.Settings.QUOTE_BATCH_SIZE", 1)
+    async def test_failed_chunk_is_not_recorded(self):
+        async def subscribe(chunk, sub_types, **kwargs):
+            if chunk == ["BAD.US"]:
+                raise RuntimeError("limit")
+        self.ctx.subscribe.side_effect = subscribe
+        changes = []
+        self.manager.add_listener(lambda added, removed: changes.append(added))
+        with self.assertRaises(RuntimeError):
+            await self.manager.set_source("config", ["AAPL.US", "BAD.US", "NVDA.US"])
+        self.assertEqual(self.manager.subscribed, {"AAPL.US", "NVDA.US"})
+        self.assertEqual(changes, [["AAPL.US", "NVDA.US"]])
+
+        self.ctx.subscribe.reset_mock(side_effect=True)
+        await self.manager.apply()
+        self.assertEqual(symbols_of(self.ctx.subscribe), ["BAD.US"])
+
+    async def test_restore_on_new_context(self):
+        await self.manager.set_source("config", ["AAPL.US", "NVDA.US"])
+        new_ctx = AsyncMock()
+        await self.manager.restore(new_ctx)
+        new_ctx.subscribe.assert_awaited_once_with(["AAPL.US", "NVDA.US"], ["Quote"], is_first_push=True)
+
+    async def test_listeners_receive_diff(self):
+        changes = []
+        self.manager.add_listener(lambda added, removed: changes.append((added, removed)))
+        await self.manager.set_source("config", ["AAPL.US"])
+        await self.manager.set_source("config", ["AAPL.US"])
+        await self.manager.set_source("config", [])
+        self.assertEqual(changes, [(["AAPL.US"], []), ([], ["AAPL.US"])])
+
+class TestWatchlistSync(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.manager = MagicMock()
+        self.manager.set_source = AsyncMock(return_value=([], []))
+        patcher = patch.object(watchlist_module, "fetch_watchlist", new_callable=AsyncMock)
+        self.fetch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def watchlist(self, *entries):
+        self.fetch.return_value = [{"symbol": s, "name": s, "watchlist_name": g} for g, s in entries]
+
+    async def test_applies_only_on_change(self):
+        sync = WatchlistSync(self.manager, groups=[])
+        self.watchlist(("Tech", "AAPL.US"), ("Tech", "NVDA.US"))
+        self.assertTrue(await sync.sync_once())
+        self.assertFalse(await sync.sync_once())
+        self.manager.set_source.assert_awaited_once_with("watchlist", frozenset({"AAPL.US", "NVDA.US"}))
+
+        self.watchlist(("Tech", "AAPL.US"))
+        self.assertTrue(await sync.sync_once())
+        self.assertEqual(self.manager.set_source.await_args.args[1], frozenset({"AAPL.US"}))
+
+    async def test_failed_poll_keeps_snapshot(self):
+        sync = WatchlistSync(self.manager, groups=[])
+        self.watchlist(("Tech", "AAPL.US"))
+        await sync.sync_once()
+        self.fetch.side_effect = RuntimeError("API Error")
+        self.assertFalse(await sync.sync_once())
+        self.assertEqual(sync.snapshot, frozenset({"AAPL.US"}))
+        self.assertEqual(self.manager.set_source.await_count, 1)
+
+    async def test_failed_subscribe_is_retried_next_poll(self):
+        sync = WatchlistSync(self.manager, groups=[])
+        self.watchlist(("Tech", "AAPL.US"))
+        self.manager.set_source.side_effect = RuntimeError("subscribe failed")
+        with self.assertRaises(RuntimeError):
+            await sync.sync_once()
+        self.assertIsNone(sync.snapshot)
+
+        self.manager.set_source.side_effect = None
+        self.assertTrue(await sync.sync_once())
+        self.assertEqual(sync.snapshot, frozenset({"AAPL.US"}))
+
+    async def test_group_filter(self):
+        sync = WatchlistSync(self.manager, groups=["Options"])
+        self.watchlist(("Tech", "AAPL.US"), ("Options", "AAPL240621C190000.US"))
+        await sync.sync_once()
+        self.assertEqual(sync.snapshot, frozenset({"AAPL240621C190000.US"}))
+
+if __name__ == '__main__':
+    unittest.main()
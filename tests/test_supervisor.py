@@ -0,0 +1,167 @@
+import sys
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Mock longport modules BEFORE importing src
+sys.modules["longport"] = MagicMock()
+sys.modules["longport.quote"] = MagicMock()
+sys.modules["longport.openapi"] = MagicMock()
+
+import unittest
+from src.monitor.supervisor import ConnectionSupervisor
+from src.monitor import core as core_module
+
+class TestConnectionSupervisor(unittest.IsolatedAsyncioTestCase):
+    def make(self, **kwargs):
+        self.connect = AsyncMock(return_value="new-ctx")
+        self.on_connected = AsyncMock()
+        self.probe = AsyncMock()
+        options = dict(stale_after=10, probe_timeout=0.1, backoff_base=0.001, backoff_max=0.004)
+        options.update(kwargs)
+        sup = ConnectionSupervisor(self.connect, self.on_connected, self.probe, **options)
+        sup.ctx = "old-ctx"
+        return sup
+
+    def test_backoff_is_jittered_and_capped(self):
+        sup = ConnectionSupervisor(None, None, None, backoff_base=0.5, backoff_max=30, rng=random.Random(1))
+        delays = [sup.backoff(attempt) for attempt in range(12)]
+        for attempt, delay in enumerate(delays):
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(30, 0.5 * 2 ** attempt))
+        self.assertEqual(len(set(delays)), len(delays))
+
+    async def test_fresh_stream_is_not_probed(self):
+        sup = self.make()
+        sup.beat()
+        self.assertFalse(await sup.check())
+        self.probe.assert_not_awaited()
+
+    async def test_quiet_market_counts_as_alive(self):
+        sup = self.make()
+        sup.last_beat = time.monotonic() - 60
+        self.assertFalse(await sup.check())
+        self.probe.assert_awaited_once_with("old-ctx")
+        self.connect.assert_not_awaited()
+        self.assertLess(time.monotonic() - sup.last_beat, 1)
+
+    async def test_dead_stream_reconnects_with_backoff(self):
+        sup = self.make()
+        sup.last_beat = time.monotonic() - 60
+        self.probe.side_effect = RuntimeError("closed")
+        self.connect.side_effect = [RuntimeError("refused"), RuntimeError("refused"), "new-ctx"]
+
+        self.assertTrue(await sup.check())
+        self.assertEqual(self.connect.await_count, 3)
+        self.on_connected.assert_awaited_once_with("new-ctx")
+        self.assertEqual(sup.ctx, "new-ctx")
+        self.assertEqual(sup.reconnects, 1)
+
+    async def test_failed_restore_is_retried(self):
+        sup = self.make()
+        self.on_connected.side_effect = [RuntimeError("subscribe failed"), None]
+        await sup.reconnect()
+        self.assertEqual(self.connect.await_count, 2)
+
+    async def test_hung_probe_times_out(self):
+        sup = self.make()
+        sup.last_beat = time.monotonic() - 60
+
+        async def hang(ctx):
+            await asyncio.sleep(10)
+        self.probe.side_effect = hang
+        self.assertTrue(await sup.check())
+
+class TestMonitorReconnect(unittest.IsolatedAsyncioTestCase):
+    async def test_on_connected_gap_fills_before_resubscribing(self):
+        calls = []
+        handler = MagicMock()
+        handler.on_quote_batch.side_effect = lambda items: calls.append(("gap_fill", [s for s, _ in items]))
+
+        with patch.object(core_module, "push_handler", handler):
+            monitor = core_module.Monitor()
+            old_ctx = AsyncMock()
+            monitor.subscriptions.bind(old_ctx)
+            await monitor.subscriptions.set_source("config", ["AAPL.US", "NVDA.US"])
+
+            ctx = AsyncMock()
+            ctx.set_on_quote = MagicMock()
+            ctx.set_on_depth = MagicMock()
+            ctx.set_on_trades = MagicMock()
+            ctx.quote.side_effect = lambda symbols: [SimpleNamespace(symbol=s, last_done=1.0, prev_close=1.0)
+                                                     for s in symbols]
+            ctx.subscribe.side_effect = lambda symbols, *a, **k: calls.append(("subscribe", symbols))
+
+            await monitor._on_connected(ctx)
+
+        ctx.set_on_quote.assert_called_once_with(monitor._on_quote)
+        ctx.set_on_depth.assert_called_once_with(monitor._on_depth)
+        if monitor.bars:
+            ctx.set_on_trades.assert_called_once_with(monitor._on_trades)
+        self.assertEqual(calls, [("gap_fill", ["AAPL.US", "NVDA.US"]), ("subscribe", ["AAPL.US", "NVDA.US"])])
+        self.assertIs(monitor.ctx, ctx)
+
+    async def test_gap_fill_snapshots_are_recorded(self):
+        with patch.object(core_module, "push_handler", MagicMock()):
+            monitor = core_module.Monitor()
+            monitor.recorder = MagicMock()
+            monitor.subscriptions.bind(AsyncMock())
+            await monitor.subscriptions.set_source("config", ["AAPL.US"])
+            ctx = AsyncMock()
+            snapshot = SimpleNamespace(symbol="AAPL.US", last_done=1.0, prev_close=1.0)
+            ctx.quote.return_value = [snapshot]
+            await monitor._gap_fill(ctx)
+
+        # Replays measure pushes against the prev_close only snapshots carry
+        monitor.recorder.record_quote.assert_called_once_with("AAPL.US", snapshot)
+
+class TestMonitorStartup(unittest.IsolatedAsyncioTestCase):
+    async def test_push_only_stream_fires_price_fluctuation(self):
+        from src.api.longport.push.handler import PushHandler
+        from src.analysis.quotes import QuoteStore
+        handler = PushHandler(notifier=MagicMock(), coalescer=MagicMock())
+        signals = []
+        handler.add_signal_listener(signals.append)
+
+        ctx = AsyncMock()
+        ctx.set_on_quote = MagicMock()
+        ctx.set_on_depth = MagicMock()
+        ctx.set_on_trades = MagicMock()
+        calls = []
+        ctx.subscribe.side_effect = lambda *args, **kwargs: calls.append("subscribe")
+        def quote(symbols):
+            calls.append("quote")
+            return [SimpleNamespace(symbol=s, last_done=100.0, prev_close=100.0) for s in symbols]
+        ctx.quote.side_effect = quote
+        client = MagicMock()
+        client.get_quote_context = AsyncMock(return_value=ctx)
+        settings = dict(MONITOR_SYMBOLS=["AAPL.US"], METRICS_ENABLED=False, BARS_ENABLED=False,
+                        SUBSCRIPTION_BUDGET=0, SHARD_WORKERS=0, PRICE_CHANGE_THRESHOLD=2.0)
+        with patch.object(core_module, "push_handler", handler), \
+             patch.object(core_module, "longport_client", client), \
+             patch.object(core_module, "alert_notifier", MagicMock()), \
+             patch.object(core_module, "metadata_store", MagicMock(ensure=AsyncMock())), \
+             patch.object(core_module, "quote_store", QuoteStore()), \
+             patch.multiple(core_module.Settings, **settings):
+            monitor = core_module.Monitor()
+            await monitor.start()
+            try:
+                # The prev_close snapshot runs in the background after the first subscription
+                await asyncio.gather(*monitor._background_tasks)
+                self.assertEqual(calls[0], "subscribe")
+                self.assertIn("quote", calls)
+                # Pushes carry no prev_close; that snapshot supplied it
+                monitor._on_quote("AAPL.US", SimpleNamespace(last_done=103.0))
+                for _ in range(50):
+                    if any(s.signal_type == "PRICE_FLUCTUATION" for s in signals):
+                        break
+                    await asyncio.sleep(0.01)
+            finally:
+                await monitor.stop()
+
+        self.assertIn(("AAPL.US", "PRICE_FLUCTUATION"), [(s.symbol, s.signal_type) for s in signals])
+
+if __name__ == '__main__':
+    unittest.main()
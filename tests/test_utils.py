@@ -1,8 +1,13 @@
 import unittest
 import os
 import shutil
+import json
 import logging
-from src.utils.logger import setup_logger
+import tempfile
+import time
+from unittest.mock import patch
+from src.utils import logger as logger_module
+from src.utils.logger import setup_logger, enable_queue_logging, share_handlers, stop_queue_logging, RotatingLogHandler
 
 class TestLogger(unittest.TestCase):
     def setUp(self):
@@ -45,6 +50,13 @@ class TestLogger(unittest.TestCase):
         # Should have 2 handlers (console + file)
         self.assertEqual(len(logger1.handlers), 2)
 
+    def test_child_process_skips_file_handler(self):
+        """Worker processes must not open and rotate the parent's log file"""
+        with patch.object(logger_module.mp, "parent_process", return_value=object()):
+            logger = setup_logger("test_logger", self.test_log_file)
+        self.assertEqual([type(h) for h in logger.handlers], [logging.StreamHandler])
+        self.assertFalse(os.path.exists(self.test_log_file))
+
     def test_logging_output(self):
         """Test if logs are written to file"""
         logger = setup_logger("test_logger", self.test_log_file)
@@ -58,5 +70,67 @@ class TestLogger(unittest.TestCase):
             content = f.read()
             self.assertIn("Test log message", content)
 
+class TestLogPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "monitor.log")
+
+    def tearDown(self):
+        for name in ("test_pipeline", "test_pkg"):
+            logger = logging.getLogger(name)
+            for handler in logger.handlers[:]:
+                handler.close()
+                logger.removeHandler(handler)
+        self.tmp.cleanup()
+
+    def record(self, msg, created=None):
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, msg, None, None)
+        if created is not None:
+            record.created = created
+        return record
+
+    def test_size_rollover_keeps_backup_count(self):
+        handler = RotatingLogHandler(self.path, max_bytes=100, backup_count=2)
+        for i in range(10):
+            handler.emit(self.record("x" * 60))
+        handler.close()
+        archives = [n for n in os.listdir(self.tmp.name) if n != "monitor.log"]
+        self.assertEqual(len(archives), 2)
+
+    def test_daily_rollover(self):
+        handler = RotatingLogHandler(self.path)
+        handler.emit(self.record("yesterday"))
+        day = handler._day
+        handler.emit(self.record("today", created=handler._rollover_at + 1))
+        handler.close()
+        self.assertTrue(os.path.exists(f"{self.path}.{day}.1"))
+        with open(self.path) as f:
+            self.assertEqual(f.read().strip(), "today")
+
+    def test_queue_logging_writes_json_lines(self):
+        logger = setup_logger("test_pipeline", self.path, json_lines=True)
+        listener = enable_queue_logging(logger)
+        logger.info("price %s moved %.1f%%", "AAPL.US", 2.5)
+        stop_queue_logging(listener)
+
+        with open(self.path, encoding="utf-8") as f:
+            entry = json.loads(f.readline())
+        self.assertEqual(entry["msg"], "price AAPL.US moved 2.5%")
+        self.assertEqual(entry["level"], "INFO")
+        self.assertLessEqual(entry["ts"], time.time())
+
+    def test_module_loggers_reach_shared_queue(self):
+        logger = setup_logger("test_pipeline", self.path, json_lines=True)
+        listener = enable_queue_logging(logger)
+        share_handlers(logger, "test_pkg")
+        logging.getLogger("test_pkg.notifier").info("alert dropped")
+        logging.getLogger("test_pkg.rules").error("reload failed")
+        stop_queue_logging(listener)
+
+        with open(self.path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual([(e["logger"], e["msg"]) for e in entries],
+                         [("test_pkg.notifier", "alert dropped"), ("test_pkg.rules", "reload failed")])
+
 if __name__ == '__main__':
     unittest.main()